@@ -6,14 +6,30 @@ This module contains all dialog classes for user interaction
 (Create Table, Add Attribute, Create Relationship, etc.)
 """
 
-from typing import Optional
+import csv
+from contextlib import contextmanager
+from typing import Iterable, List, Optional, Set, Tuple
 from PySide6.QtWidgets import (
-    QDialog, QFormLayout, QHBoxLayout, QLineEdit, QComboBox,
-    QCheckBox, QPushButton, QLabel
+    QDialog, QFormLayout, QHBoxLayout, QVBoxLayout, QLineEdit, QComboBox,
+    QCheckBox, QPushButton, QLabel, QTableView, QAbstractItemView,
+    QStyledItemDelegate, QApplication, QMessageBox, QHeaderView,
+    QSpinBox, QDoubleSpinBox, QFileDialog, QTableWidget, QTableWidgetItem
 )
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+from PySide6.QtGui import QFont, QKeySequence, QShortcut, QColor
 
-from models import Attribute, Relationship, RelationshipType
+from models import Table, Attribute, Relationship, RelationshipType
+from workload import (
+    WorkloadReport, DEFAULT_ROWS_PER_TABLE, DEFAULT_BATCH_SIZE, DEFAULT_SLOW_THRESHOLD_MS
+)
+
+
+DATA_TYPES = [
+    "INT", "VARCHAR(255)", "TEXT", "FLOAT", "BOOLEAN",
+    "DATE", "DATETIME", "DECIMAL(10,2)", "BIGINT", "SMALLINT"
+]
+
+TRUE_VALUES = {"1", "true", "yes", "y", "x", "pk", "\u2713"}
 
 
 class CreateTableDialog(QDialog):
@@ -61,10 +77,7 @@ class AttributeDialog(QDialog):
         self.attr_name.setPlaceholderText("e.g., user_id, email")
         
         self.data_type = QComboBox()
-        self.data_type.addItems([
-            "INT", "VARCHAR(255)", "TEXT", "FLOAT", "BOOLEAN",
-            "DATE", "DATETIME", "DECIMAL(10,2)", "BIGINT", "SMALLINT"
-        ])
+        self.data_type.addItems(DATA_TYPES)
         
         self.is_pk = QCheckBox("Primary Key")
         self.is_nullable = QCheckBox("Nullable")
@@ -155,3 +168,481 @@ class RelationshipDialog(QDialog):
             from_key=self.from_key.text().strip(),
             to_key=self.to_key.text().strip()
         )
+
+
+# =============================================================================
+# BULK ATTRIBUTE EDITING
+# =============================================================================
+
+def parse_clipboard_rows(text: str) -> List[Attribute]:
+    """Parse spreadsheet (tab separated) or CSV text into attributes
+
+    Columns are name, type, primary key, nullable; missing columns get
+    the AttributeDialog defaults and a leading "name" header row is skipped.
+    """
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return []
+    delimiter = "\t" if "\t" in lines[0] else ","
+    attributes = []
+    for cells in csv.reader(lines, delimiter=delimiter):
+        cells = [c.strip() for c in cells]
+        if not cells or not cells[0]:
+            continue
+        if not attributes and cells[0].lower() == "name":
+            continue
+        attributes.append(Attribute(
+            name=cells[0],
+            data_type=cells[1] if len(cells) > 1 and cells[1] else "INT",
+            is_primary_key=len(cells) > 2 and cells[2].lower() in TRUE_VALUES,
+            is_nullable=cells[3].lower() in TRUE_VALUES if len(cells) > 3 and cells[3] else True
+        ))
+    return attributes
+
+
+class AttributeTableModel(QAbstractTableModel):
+    """Editable grid of the attributes of one or more tables
+
+    Every edit goes straight to the model objects. Changes are reported
+    through tables_changed, once per user action: a bulk action (paste,
+    type change on many rows, removal) emits a single signal listing
+    every table it touched.
+    """
+    
+    COLUMNS = ["Table", "Name", "Type", "PK", "Nullable"]
+    TABLE, NAME, TYPE, PK, NULLABLE = range(5)
+    
+    tables_changed = Signal(set)
+    
+    def __init__(self, tables: Iterable[Table], parent=None):
+        super().__init__(parent)
+        self.tables = list(tables)
+        self.rows: List[Tuple[Table, Attribute]] = []
+        self._batch_depth = 0
+        self._touched: Set[str] = set()
+        self._load_rows()
+    
+    def _load_rows(self):
+        self.rows = [(table, attr) for table in self.tables for attr in table.attributes]
+    
+    # ----- Qt model interface -----
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() in (self.NAME, self.TYPE):
+            flags |= Qt.ItemIsEditable
+        elif index.column() in (self.PK, self.NULLABLE):
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        table, attr = self.rows[index.row()]
+        column = index.column()
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            if column == self.TABLE:
+                return table.name
+            if column == self.NAME:
+                return attr.name
+            if column == self.TYPE:
+                return attr.data_type
+        if role == Qt.CheckStateRole:
+            if column == self.PK:
+                return Qt.Checked if attr.is_primary_key else Qt.Unchecked
+            if column == self.NULLABLE:
+                return Qt.Checked if attr.is_nullable else Qt.Unchecked
+        return None
+    
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid():
+            return False
+        table, attr = self.rows[index.row()]
+        column = index.column()
+        
+        if role == Qt.EditRole and column == self.NAME:
+            name = str(value).strip()
+            if not name or any(a.name == name and a is not attr for a in table.attributes):
+                return False
+            attr.name = name
+        elif role == Qt.EditRole and column == self.TYPE:
+            data_type = str(value).strip()
+            if not data_type:
+                return False
+            attr.data_type = data_type
+        elif role == Qt.CheckStateRole and column in (self.PK, self.NULLABLE):
+            checked = Qt.CheckState(value) == Qt.Checked
+            if column == self.PK:
+                attr.is_primary_key = checked
+            else:
+                attr.is_nullable = checked
+        else:
+            return False
+        
+        self.dataChanged.emit(index, index, [role])
+        self._touch(table)
+        return True
+    
+    # ----- Batched edits -----
+    
+    @contextmanager
+    def batch(self):
+        """Group several edits so tables_changed is emitted once at the end"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._touched:
+                touched, self._touched = self._touched, set()
+                self.tables_changed.emit(touched)
+    
+    def _touch(self, table: Table):
+        with self.batch():
+            self._touched.add(table.name)
+    
+    def set_type(self, rows: Iterable[int], data_type: str):
+        """Change the data type of many rows at once"""
+        rows = sorted(set(rows))
+        if not rows:
+            return
+        with self.batch():
+            for row in rows:
+                table, attr = self.rows[row]
+                attr.data_type = data_type
+                self._touch(table)
+            self.dataChanged.emit(self.index(rows[0], self.TYPE), self.index(rows[-1], self.TYPE))
+    
+    def add_attributes(self, table: Table, attributes: Iterable[Attribute]) -> Tuple[int, int]:
+        """Insert new attributes and update existing ones with the same name
+
+        Returns the number of (added, updated) attributes.
+        """
+        added = updated = 0
+        with self.batch():
+            self.beginResetModel()
+            try:
+                for new_attr in attributes:
+                    existing = next((a for a in table.attributes if a.name == new_attr.name), None)
+                    if existing is None:
+                        table.add_attribute(new_attr)
+                        added += 1
+                    else:
+                        existing.data_type = new_attr.data_type
+                        existing.is_primary_key = new_attr.is_primary_key
+                        existing.is_nullable = new_attr.is_nullable
+                        updated += 1
+                    self._touch(table)
+                self._load_rows()
+            finally:
+                self.endResetModel()
+        return added, updated
+    
+    def remove_rows(self, rows: Iterable[int]):
+        """Remove the attributes of many rows at once"""
+        doomed = [self.rows[row] for row in sorted(set(rows))]
+        if not doomed:
+            return
+        with self.batch():
+            self.beginResetModel()
+            try:
+                for table, attr in doomed:
+                    table.attributes = [a for a in table.attributes if a is not attr]
+                    self._touch(table)
+                self._load_rows()
+            finally:
+                self.endResetModel()
+    
+    def table_at(self, row: int) -> Optional[Table]:
+        if 0 <= row < len(self.rows):
+            return self.rows[row][0]
+        return self.tables[0] if self.tables else None
+
+
+class DataTypeDelegate(QStyledItemDelegate):
+    """Editable combo box editor for the Type column"""
+    
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        editor.setEditable(True)
+        editor.addItems(DATA_TYPES)
+        return editor
+    
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.EditRole) or "")
+    
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+
+class AttributeGridDialog(QDialog):
+    """Dialog for editing the attributes of one or more tables in a grid"""
+    
+    def __init__(self, parent=None, tables: Optional[List[Table]] = None):
+        super().__init__(parent)
+        tables = tables or []
+        names = ", ".join(t.name for t in tables)
+        self.setWindowTitle(f"Edit Table: {names}" if len(tables) == 1 else f"Edit Tables: {names}")
+        self.setGeometry(100, 100, 650, 500)
+        
+        layout = QVBoxLayout()
+        
+        self.model = AttributeTableModel(tables, self)
+        self.grid = QTableView()
+        self.grid.setModel(self.model)
+        self.grid.setItemDelegateForColumn(AttributeTableModel.TYPE, DataTypeDelegate(self.grid))
+        self.grid.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.grid.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.grid.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        if len(tables) == 1:
+            self.grid.hideColumn(AttributeTableModel.TABLE)
+        layout.addWidget(self.grid)
+        
+        # Bulk type change
+        type_layout = QHBoxLayout()
+        type_layout.addWidget(QLabel("Type for selected rows:"))
+        self.bulk_type = QComboBox()
+        self.bulk_type.setEditable(True)
+        self.bulk_type.addItems(DATA_TYPES)
+        type_layout.addWidget(self.bulk_type)
+        apply_type_btn = QPushButton("Apply")
+        apply_type_btn.clicked.connect(self.apply_type)
+        type_layout.addWidget(apply_type_btn)
+        layout.addLayout(type_layout)
+        
+        # Buttons
+        btn_layout = QHBoxLayout()
+        
+        add_attr_btn = QPushButton("+ Add Attribute")
+        add_attr_btn.clicked.connect(self.add_attribute)
+        btn_layout.addWidget(add_attr_btn)
+        
+        paste_btn = QPushButton("Paste Rows")
+        paste_btn.setToolTip("Paste name, type, PK, nullable rows from a spreadsheet or CSV")
+        paste_btn.clicked.connect(self.paste_rows)
+        btn_layout.addWidget(paste_btn)
+        
+        remove_attr_btn = QPushButton("- Remove Selected")
+        remove_attr_btn.clicked.connect(self.remove_selected)
+        btn_layout.addWidget(remove_attr_btn)
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        
+        layout.addLayout(btn_layout)
+        self.setLayout(layout)
+        
+        QShortcut(QKeySequence.Paste, self.grid, self.paste_rows)
+        QShortcut(QKeySequence.Delete, self.grid, self.remove_selected)
+    
+    def selected_rows(self) -> List[int]:
+        return [index.row() for index in self.grid.selectionModel().selectedRows()]
+    
+    def current_table(self) -> Optional[Table]:
+        return self.model.table_at(self.grid.currentIndex().row())
+    
+    def apply_type(self):
+        rows = self.selected_rows()
+        data_type = self.bulk_type.currentText().strip()
+        if not rows:
+            QMessageBox.warning(self, "Error", "No attribute selected")
+            return
+        if not data_type:
+            QMessageBox.warning(self, "Error", "Data type cannot be empty")
+            return
+        self.model.set_type(rows, data_type)
+    
+    def add_attribute(self):
+        table = self.current_table()
+        if table is None:
+            return
+        dialog = AttributeDialog(self)
+        if dialog.exec() == QDialog.Accepted:
+            attr = dialog.get_attribute()
+            
+            if not attr.name:
+                QMessageBox.warning(self, "Error", "Attribute name cannot be empty")
+                return
+            
+            if any(a.name == attr.name for a in table.attributes):
+                QMessageBox.warning(self, "Error", f"Attribute '{attr.name}' already exists")
+                return
+            
+            self.model.add_attributes(table, [attr])
+    
+    def paste_rows(self):
+        """Add or update attributes of the current row's table from the clipboard"""
+        table = self.current_table()
+        if table is None:
+            return
+        attributes = parse_clipboard_rows(QApplication.clipboard().text())
+        if not attributes:
+            QMessageBox.warning(self, "Error", "Clipboard has no attribute rows")
+            return
+        added, updated = self.model.add_attributes(table, attributes)
+        QMessageBox.information(
+            self, "Paste", f"Table '{table.name}': {added} attribute(s) added, {updated} updated"
+        )
+    
+    def remove_selected(self):
+        rows = self.selected_rows()
+        if not rows:
+            QMessageBox.warning(self, "Error", "No attribute selected")
+            return
+        self.model.remove_rows(rows)
+
+
+# =============================================================================
+# WORKLOAD TEST DRIVE
+# =============================================================================
+
+class WorkloadDialog(QDialog):
+    """Dialog for the options of a workload test drive"""
+    
+    def __init__(self, parent=None, threshold_ms: float = DEFAULT_SLOW_THRESHOLD_MS):
+        super().__init__(parent)
+        self.setWindowTitle("Test Drive Schema")
+        self.setGeometry(100, 100, 450, 250)
+        
+        layout = QFormLayout()
+        
+        self.rows_per_table = QSpinBox()
+        self.rows_per_table.setRange(1, 10_000_000)
+        self.rows_per_table.setValue(DEFAULT_ROWS_PER_TABLE)
+        
+        self.batch_size = QSpinBox()
+        self.batch_size.setRange(1, 1_000_000)
+        self.batch_size.setValue(DEFAULT_BATCH_SIZE)
+        
+        self.threshold = QDoubleSpinBox()
+        self.threshold.setRange(0.01, 60_000)
+        self.threshold.setSuffix(" ms")
+        self.threshold.setValue(threshold_ms)
+        
+        self.database = QLineEdit()
+        self.database.setPlaceholderText("In memory")
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_database)
+        database_layout = QHBoxLayout()
+        database_layout.addWidget(self.database)
+        database_layout.addWidget(browse_btn)
+        
+        layout.addRow("Rows per Table:", self.rows_per_table)
+        layout.addRow("Insert Batch Size:", self.batch_size)
+        layout.addRow("Slow Join Threshold:", self.threshold)
+        layout.addRow("SQLite Database:", database_layout)
+        
+        buttons = QHBoxLayout()
+        ok_btn = QPushButton("Run")
+        cancel_btn = QPushButton("Cancel")
+        
+        ok_btn.clicked.connect(self.accept)
+        cancel_btn.clicked.connect(self.reject)
+        
+        buttons.addWidget(ok_btn)
+        buttons.addWidget(cancel_btn)
+        layout.addRow(buttons)
+        
+        self.setLayout(layout)
+    
+    def browse_database(self):
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "SQLite Database", "", "SQLite Files (*.db *.sqlite);;All Files (*)"
+        )
+        if file_path:
+            self.database.setText(file_path)
+    
+    def get_options(self) -> dict:
+        """Keyword arguments for WorkloadSimulator"""
+        return {
+            "database": self.database.text().strip() or ":memory:",
+            "rows_per_table": self.rows_per_table.value(),
+            "batch_size": self.batch_size.value()
+        }
+    
+    def get_threshold(self) -> float:
+        return self.threshold.value()
+
+
+class WorkloadReportDialog(QDialog):
+    """Dialog listing the join timings of a workload test drive"""
+    
+    COLUMNS = ["Relationship", "Join (ms)", "Rows", "Lookup (ms)", "Note"]
+    
+    def __init__(self, parent=None, report: Optional[WorkloadReport] = None,
+                 threshold_ms: float = DEFAULT_SLOW_THRESHOLD_MS):
+        super().__init__(parent)
+        report = report or WorkloadReport()
+        self.setWindowTitle("Test Drive Results")
+        self.setGeometry(100, 100, 850, 500)
+        
+        layout = QVBoxLayout()
+        
+        rows = sum(report.row_counts.values())
+        slow = report.slow_relationships(threshold_ms)
+        summary = QLabel(
+            f"{rows} rows in {len(report.row_counts)} tables loaded in {report.load_seconds:.2f} s - "
+            f"{len(slow)} of {len(report.timings)} relationship(s) slower than {threshold_ms:g} ms"
+        )
+        summary.setFont(QFont("Arial", 10, QFont.Bold))
+        layout.addWidget(summary)
+        
+        slow_ids = {id(t) for t in slow}
+        timings = slow + [t for t in report.timings if id(t) not in slow_ids]
+        self.timings_table = QTableWidget(len(timings), len(self.COLUMNS))
+        self.timings_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.timings_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.timings_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        for row, timing in enumerate(timings):
+            if timing.error:
+                note = timing.error
+            elif timing.full_scan:
+                note = f"Full scan - index {timing.relationship.to_table}.{timing.relationship.to_key}"
+            else:
+                note = ""
+            cells = [
+                timing.label,
+                "" if timing.error else f"{timing.join_ms:.2f}",
+                "" if timing.error else str(timing.rows),
+                "" if timing.error else f"{timing.lookup_ms:.3f}",
+                note
+            ]
+            for column, text in enumerate(cells):
+                item = QTableWidgetItem(text)
+                if id(timing) in slow_ids:
+                    item.setForeground(QColor("#C73E1D"))
+                self.timings_table.setItem(row, column, item)
+        layout.addWidget(self.timings_table)
+        
+        problems = report.errors[:10]
+        if len(report.errors) > 10:
+            problems.append(f"... {len(report.errors) - 10} more error(s)")
+        if report.skipped:
+            problems.append(
+                f"{len(report.skipped)} foreign key statement(s) skipped: SQLite cannot add "
+                f"constraints to existing tables, the generated rows respect them instead"
+            )
+        if problems:
+            details = QLabel("\n".join(problems))
+            details.setWordWrap(True)
+            layout.addWidget(details)
+        
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+        
+        self.setLayout(layout)
@@ -6,11 +6,26 @@ This module contains all QGraphics classes for visual representation
 of tables and relationships on the canvas.
 """
 
-from PySide6.QtWidgets import QGraphicsRectItem, QGraphicsLineItem, QGraphicsTextItem
-from PySide6.QtCore import Qt, QPointF
+import math
+from typing import Optional
+
+from PySide6.QtWidgets import (
+    QGraphicsItem, QGraphicsRectItem, QGraphicsLineItem, QGraphicsTextItem,
+    QGraphicsScene, QGraphicsView
+)
+from PySide6.QtCore import Qt, QPointF, Signal
 from PySide6.QtGui import QColor, QPen, QBrush, QFont
 
-from models import Table, Relationship, RelationshipType
+from models import Schema, Table, Relationship, RelationshipType, SubjectArea
+from profiling import PROFILER
+
+
+class SchemaScene(QGraphicsScene):
+    """Canvas scene that notifies the controller when blocks move or are activated"""
+    
+    table_moved = Signal(str)
+    group_moved = Signal(str)
+    group_activated = Signal(str)
 
 
 class TableBlockItem(QGraphicsRectItem):
@@ -18,6 +33,8 @@ class TableBlockItem(QGraphicsRectItem):
     
     BLOCK_WIDTH = 200
     BLOCK_HEIGHT = 150
+    BASE_COLOR = QColor("#E8F4F8")
+    HOT_COLOR = QColor("#C73E1D")
     
     def __init__(self, table: Table, parent=None):
         super().__init__(0, 0, self.BLOCK_WIDTH, self.BLOCK_HEIGHT, parent)
@@ -26,11 +43,12 @@ class TableBlockItem(QGraphicsRectItem):
         
         # Styling
         self.setPen(QPen(QColor("#2E86AB"), 2))
-        self.setBrush(QBrush(QColor("#E8F4F8")))
+        self.setBrush(QBrush(self.BASE_COLOR))
         self.setCursor(Qt.OpenHandCursor)
         self.setPos(QPointF(table.x, table.y))
         self.setFlag(self.ItemIsMovable, True)
         self.setFlag(self.ItemIsSelectable, True)
+        self.setFlag(self.ItemSendsGeometryChanges, True)
         
         # Table name
         title_item = QGraphicsTextItem(table.name, self)
@@ -49,11 +67,28 @@ class TableBlockItem(QGraphicsRectItem):
             attr_item.setPos(10, y_offset)
             y_offset += 15
     
-    def mouseMoveEvent(self, event):
+    def set_heat(self, heat: Optional[float]):
+        """Colour the block from cold (0) to hot (1), or restore it with None"""
+        if heat is None:
+            self.setBrush(QBrush(self.BASE_COLOR))
+            return
+        heat = min(max(heat, 0.0), 1.0)
+        base, hot = self.BASE_COLOR, self.HOT_COLOR
+        self.setBrush(QBrush(QColor(
+            round(base.red() + (hot.red() - base.red()) * heat),
+            round(base.green() + (hot.green() - base.green()) * heat),
+            round(base.blue() + (hot.blue() - base.blue()) * heat)
+        )))
+    
+    def itemChange(self, change, value):
         """Update table position when dragged"""
-        super().mouseMoveEvent(event)
-        self.table.x = self.pos().x()
-        self.table.y = self.pos().y()
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            self.table.x = value.x()
+            self.table.y = value.y()
+            scene = self.scene()
+            if isinstance(scene, SchemaScene):
+                scene.table_moved.emit(self.table.name)
+        return super().itemChange(change, value)
     
     def mousePressEvent(self, event):
         """Handle selection"""
@@ -69,6 +104,54 @@ class TableBlockItem(QGraphicsRectItem):
             self.setPen(QPen(QColor("#2E86AB"), 2))
 
 
+class GroupNodeItem(QGraphicsRectItem):
+    """Summary node standing for a collapsed subject area"""
+    
+    BLOCK_WIDTH = 220
+    BLOCK_HEIGHT = 70
+    
+    def __init__(self, area: SubjectArea, parent=None):
+        super().__init__(0, 0, self.BLOCK_WIDTH, self.BLOCK_HEIGHT, parent)
+        self.area = area
+        
+        # Styling
+        self.setPen(QPen(QColor("#2E86AB"), 2, Qt.DashLine))
+        self.setBrush(QBrush(QColor("#D6EAF2")))
+        self.setCursor(Qt.OpenHandCursor)
+        self.setPos(QPointF(area.x, area.y))
+        self.setFlag(self.ItemIsMovable, True)
+        self.setFlag(self.ItemIsSelectable, True)
+        self.setFlag(self.ItemSendsGeometryChanges, True)
+        self.setToolTip("\n".join(area.tables))
+        
+        title_item = QGraphicsTextItem(area.name, self)
+        title_font = QFont("Arial", 10)
+        title_font.setBold(True)
+        title_item.setFont(title_font)
+        title_item.setPos(5, 5)
+        
+        count_item = QGraphicsTextItem(f"{len(area.tables)} tables (double-click to expand)", self)
+        count_item.setFont(QFont("Arial", 8))
+        count_item.setPos(5, 35)
+    
+    def itemChange(self, change, value):
+        """Update subject area position when dragged"""
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            self.area.x = value.x()
+            self.area.y = value.y()
+            scene = self.scene()
+            if isinstance(scene, SchemaScene):
+                scene.group_moved.emit(self.area.name)
+        return super().itemChange(change, value)
+    
+    def mouseDoubleClickEvent(self, event):
+        """Ask the controller to expand the subject area"""
+        super().mouseDoubleClickEvent(event)
+        scene = self.scene()
+        if isinstance(scene, SchemaScene):
+            scene.group_activated.emit(self.area.name)
+
+
 class RelationshipLineItem(QGraphicsLineItem):
     """Visual representation of a relationship between tables"""
     
@@ -87,7 +170,18 @@ class RelationshipLineItem(QGraphicsLineItem):
             RelationshipType.MANY_TO_MANY: QColor("#6A994E")     # Green
         }
         
-        self.setPen(QPen(color_map[rel.relationship_type], 2))
+        self.base_pen = QPen(color_map[rel.relationship_type], 2)
+        self.setPen(self.base_pen)
+    
+    def set_highlight(self, highlighted: bool, tooltip: str = ""):
+        """Emphasise the line, e.g. for a slow join found by a test drive"""
+        if highlighted:
+            self.setPen(QPen(QColor("#D00000"), 5, Qt.DashLine))
+            self.setZValue(1)
+        else:
+            self.setPen(self.base_pen)
+            self.setZValue(0)
+        self.setToolTip(tooltip)
     
     def update_line(self):
         """Update line position based on table positions"""
@@ -100,3 +194,74 @@ class RelationshipLineItem(QGraphicsLineItem):
             self.to_item.pos().y() + self.to_item.BLOCK_HEIGHT / 2
         )
         self.setLine(from_pos.x(), from_pos.y(), to_pos.x(), to_pos.y())
+
+
+class BundleLineItem(QGraphicsLineItem):
+    """Aggregated relationships between a collapsed subject area and another node
+
+    from_name/to_name are the table or subject area names of the two
+    endpoints; the pen gets thicker with the number of relationships.
+    """
+    
+    def __init__(self, from_name: str, to_name: str, from_item, to_item, weight: int, parent=None):
+        super().__init__(parent)
+        self.from_name = from_name
+        self.to_name = to_name
+        self.from_item = from_item
+        self.to_item = to_item
+        self.weight = weight
+        
+        self.setPen(QPen(QColor("#5C5C5C"), 1 + 2 * math.log2(weight)))
+        self.setToolTip(f"{weight} relationship(s) between {from_name} and {to_name}")
+        
+        self.label = QGraphicsTextItem(f"\u00d7{weight}", self)
+        self.label.setFont(QFont("Arial", 8))
+        
+        self.update_line()
+    
+    def update_line(self):
+        """Update line and label position based on endpoint positions"""
+        from_pos = QPointF(
+            self.from_item.pos().x() + self.from_item.BLOCK_WIDTH,
+            self.from_item.pos().y() + self.from_item.BLOCK_HEIGHT / 2
+        )
+        to_pos = QPointF(
+            self.to_item.pos().x(),
+            self.to_item.pos().y() + self.to_item.BLOCK_HEIGHT / 2
+        )
+        self.setLine(from_pos.x(), from_pos.y(), to_pos.x(), to_pos.y())
+        self.label.setPos((from_pos + to_pos) / 2)
+
+
+class SchemaView(QGraphicsView):
+    """Canvas view that reports its paint time to the profiler"""
+    
+    def paintEvent(self, event):
+        if not PROFILER.enabled:
+            super().paintEvent(event)
+            return
+        with PROFILER.measure("scene.paint"):
+            super().paintEvent(event)
+
+
+def build_scene(schema: Schema, scene: Optional[QGraphicsScene] = None):
+    """Fill a scene with one block per table and one line per relationship
+
+    Subject areas are ignored (everything is drawn expanded). Used where
+    no main window exists, e.g. benchmarks and command-line export.
+    """
+    scene = scene if scene is not None else SchemaScene()
+    table_items = {}
+    for table in schema.tables.values():
+        item = TableBlockItem(table)
+        scene.addItem(item)
+        table_items[table.name] = item
+    relationship_items = []
+    for rel in schema.relationships:
+        from_item = table_items.get(rel.from_table)
+        to_item = table_items.get(rel.to_table)
+        if from_item and to_item:
+            rel_item = RelationshipLineItem(rel, from_item, to_item)
+            scene.addItem(rel_item)
+            relationship_items.append(rel_item)
+    return scene, table_items, relationship_items
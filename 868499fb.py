@@ -4,11 +4,42 @@ University of Jijel - IHM Module
 
 This module handles SQL code generation from the database schema,
 including CREATE TABLE statements and foreign key constraints.
+SQLFragments keeps the statements of an open schema so that only the
+tables an edit touched are generated again, and looks those up in the
+persistent fragment cache (fragment_cache.py) when given one.
 """
 
+import hashlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
 from models import Schema, Table, Relationship, RelationshipType
 
 
+# Part of every fragment key: bump it whenever the generated SQL changes
+FRAGMENT_VERSION = "1"
+
+# Separators of the key text and of the statements of a cached fragment
+_FIELD, _RECORD = "\x1f", "\x1e"
+_STATEMENT = "\x00"
+
+
+def table_fragment_key(table: Table, incoming: Sequence[Relationship]) -> str:
+    """Digest of what the statements of a table depend on
+
+    That is its columns plus the relationships whose constraint is added
+    to it; positions and unrelated tables are left out.
+    """
+    # A flat string hashes much faster than the repr() of nested tuples
+    text = FRAGMENT_VERSION + _RECORD + table.name + "".join([
+        f"{_RECORD}{a.name}{_FIELD}{a.data_type}{_FIELD}{a.is_primary_key}{_FIELD}{a.is_nullable}"
+        for a in table.attributes
+    ]) + "".join([
+        f"{_RECORD}{r.from_table}{_FIELD}{r.relationship_type.value}{_FIELD}{r.from_key}{_FIELD}{r.to_key}"
+        for r in incoming
+    ])
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
 class SQLGenerator:
     """Generates SQL CREATE TABLE statements from schema"""
     
@@ -69,3 +100,88 @@ class SQLGenerator:
             )
         
         return ""
+
+
+class SQLFragments:
+    """Statements of one schema, regenerated only for invalidated tables
+
+    The owner calls invalidate() with the names of tables whose name or
+    attributes changed (or with no argument when the whole schema was
+    replaced). Relationships are never edited in place, so their
+    statements are kept for as long as the same object is in the schema.
+    The result is always equal to SQLGenerator.generate_sql(schema).
+    
+    With a FragmentCache, tables that are not kept are first looked up
+    there by table_fragment_key(), and generated ones are stored, so a
+    schema opened again (in any session or CLI run) is not regenerated.
+    """
+    
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.tables: Dict[str, str] = {}
+        self.relationships: Dict[int, Tuple[Relationship, str]] = {}
+    
+    def invalidate(self, table_names: Optional[Iterable[str]] = None):
+        if table_names is None:
+            self.tables.clear()
+            self.relationships.clear()
+            return
+        for table_name in table_names:
+            self.tables.pop(table_name, None)
+    
+    def generate_sql(self, schema: Schema) -> str:
+        """Same output as SQLGenerator.generate_sql(), reusing kept statements"""
+        if self.cache is not None:
+            missing = [table for name, table in schema.tables.items() if name not in self.tables]
+            if missing:
+                self._load(schema, missing)
+        
+        tables = {}
+        for table_name, table in schema.tables.items():
+            sql = self.tables.get(table_name)
+            if sql is None:
+                sql = SQLGenerator._generate_table_sql(table)
+            tables[table_name] = sql
+        
+        relationships = {}
+        for rel in schema.relationships:
+            kept = self.relationships.get(id(rel))
+            if kept is not None and kept[0] is rel:
+                relationships[id(rel)] = kept
+            else:
+                relationships[id(rel)] = (rel, SQLGenerator._generate_relationship_sql(rel))
+        
+        # Rebuilt each time so that removed tables and relationships are dropped
+        self.tables = tables
+        self.relationships = relationships
+        
+        sql_statements = list(tables.values())
+        sql_statements.extend(sql for _, sql in relationships.values() if sql)
+        return "\n\n".join(sql_statements)
+    
+    def _load(self, schema: Schema, missing: List[Table]):
+        """Keep the statements of missing tables, from the cache or generated into it"""
+        names = {table.name for table in missing}
+        incoming: Dict[str, List[Relationship]] = {}
+        for rel in schema.relationships:
+            if rel.to_table in names:
+                incoming.setdefault(rel.to_table, []).append(rel)
+        
+        keys = {table.name: table_fragment_key(table, incoming.get(table.name, ())) for table in missing}
+        cached = self.cache.get_many(keys.values())
+        generated = {}
+        for table in missing:
+            rels = incoming.get(table.name, [])
+            value = cached.get(keys[table.name])
+            statements = value.split(_STATEMENT) if value is not None else None
+            if statements is None or len(statements) != len(rels) + 1:
+                statements = [SQLGenerator._generate_table_sql(table)]
+                statements += [SQLGenerator._generate_relationship_sql(rel) for rel in rels]
+                generated[keys[table.name]] = _STATEMENT.join(statements)
+            
+            self.tables[table.name] = statements[0]
+            for rel, sql in zip(rels, statements[1:]):
+                kept = self.relationships.get(id(rel))
+                if kept is None or kept[0] is not rel:
+                    self.relationships[id(rel)] = (rel, sql)
+        self.cache.put_many(generated)
@@ -7,23 +7,43 @@ Main application window with MVC pattern implementation.
 Features: Table management, relationship creation, SQL generation, file I/O
 """
 
+import os
 import sys
 import json
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QGraphicsView, QGraphicsScene, QDialog, QTableWidget, QTableWidgetItem,
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QDialog,
     QPushButton, QLabel, QMessageBox, QFileDialog, QListWidget,
-    QListWidgetItem, QTextEdit
+    QListWidgetItem, QTabBar, QInputDialog
 )
 from PySide6.QtCore import Qt, QPointF, Slot
 from PySide6.QtGui import QColor, QPen, QBrush, QFont, QAction, QKeySequence
 
-from models import Schema, Table, Attribute, Relationship, RelationshipType
-from graphics import TableBlockItem, RelationshipLineItem
-from dialogs import CreateTableDialog, AttributeDialog, RelationshipDialog
-from sql_generator import SQLGenerator
+from models import Schema, Table, Relationship
+from graphics import (
+    TableBlockItem, RelationshipLineItem, GroupNodeItem, BundleLineItem,
+    SchemaScene, SchemaView
+)
+from dialogs import (
+    CreateTableDialog, RelationshipDialog, AttributeGridDialog, WorkloadDialog,
+    WorkloadReportDialog
+)
+from validation import SchemaValidator, Severity
+from profiling import PROFILER, profiled
+from panels import ProfilerDock, SQLCodeView, MetricsDock, MinimapDock
+from refresh import RefreshScheduler, RefreshRequest
+from workspace import Workspace, SchemaDocument
+from grouping import detect_subject_areas
+from metrics import compute_metrics
+from export import export_scene, ExportError
+from codegen import GENERATORS, generate_code
+from workload import run_workload, DEFAULT_SLOW_THRESHOLD_MS
+from collaboration import (
+    CollaborationServer, ClientSession, OperationError, add_table_op, remove_table_op,
+    set_attributes_op, add_relationship_op, subject_areas_op, DEFAULT_HOST, DEFAULT_PORT
+)
+from collaboration_client import CollaborationClient
 
 
 class DatabaseSchemaDesigner(QMainWindow):
@@ -34,15 +54,74 @@ class DatabaseSchemaDesigner(QMainWindow):
         self.setWindowTitle("Database Schema Designer - University of Jijel")
         self.setGeometry(100, 100, 1400, 900)
         
-        # Model
-        self.schema = Schema()
+        # Model: one document per open schema, slots edit the active one
+        self.workspace = Workspace()
         
-        # View components
-        self.table_items: Dict[str, TableBlockItem] = {}
-        self.relationship_items: List[RelationshipLineItem] = []
+        # View refreshes are batched and applied once per idle tick
+        self.refresh = RefreshScheduler(self.apply_refresh, self)
+        
+        # Collaboration: one shared document, edited through operations
+        self.collab_client = CollaborationClient(self)
+        self.collab_client.connected.connect(self.on_collaboration_connected)
+        self.collab_client.disconnected.connect(self.on_collaboration_disconnected)
+        self.collab_client.message_received.connect(self.on_collaboration_message)
+        self.collab_client.error.connect(self.on_collaboration_error)
+        self.collab_server = None
+        self.collab_document = None
+        self.applying_remote = False  # block moves made by remote operations are not sent back
         
         self.setup_ui()
         self.setup_menu()
+        self.open_document(SchemaDocument())
+    
+    # =========================================================================
+    # ACTIVE DOCUMENT
+    # =========================================================================
+    
+    @property
+    def document(self) -> SchemaDocument:
+        return self.workspace.active
+    
+    @property
+    def schema(self) -> Schema:
+        return self.document.schema
+    
+    @schema.setter
+    def schema(self, schema: Schema):
+        self.document.schema = schema
+        self.document.validator.validate_all(schema)
+    
+    @property
+    def validator(self) -> SchemaValidator:
+        return self.document.validator
+    
+    @property
+    def scene(self) -> SchemaScene:
+        return self.document.scene
+    
+    @property
+    def table_items(self) -> Dict[str, TableBlockItem]:
+        return self.document.table_items
+    
+    @property
+    def relationship_items(self) -> List[RelationshipLineItem]:
+        return self.document.relationship_items
+    
+    @relationship_items.setter
+    def relationship_items(self, items: List[RelationshipLineItem]):
+        self.document.relationship_items = items
+    
+    @property
+    def group_items(self) -> Dict[str, GroupNodeItem]:
+        return self.document.group_items
+    
+    @property
+    def bundle_items(self) -> List[BundleLineItem]:
+        return self.document.bundle_items
+    
+    @bundle_items.setter
+    def bundle_items(self, items: List[BundleLineItem]):
+        self.document.bundle_items = items
     
     def setup_ui(self):
         """Setup user interface"""
@@ -51,15 +130,26 @@ class DatabaseSchemaDesigner(QMainWindow):
         
         main_layout = QHBoxLayout()
         
-        # ===== CANVAS/GRAPHICS VIEW =====
-        self.scene = QGraphicsScene()
-        self.scene.setSceneRect(0, 0, 1200, 800)
-        self.scene.setBackgroundBrush(QBrush(QColor("#F5F5F5")))
+        # ===== DOCUMENT TABS + CANVAS/GRAPHICS VIEW =====
+        canvas_layout = QVBoxLayout()
         
-        self.view = QGraphicsView(self.scene)
+        self.document_tabs = QTabBar()
+        self.document_tabs.setTabsClosable(True)
+        self.document_tabs.setExpanding(False)
+        self.document_tabs.currentChanged.connect(self.on_document_tab_changed)
+        self.document_tabs.tabCloseRequested.connect(self.close_document)
+        canvas_layout.addWidget(self.document_tabs)
+        
+        # Each document has its own scene, set on activation
+        self.view = SchemaView()
         self.view.setRenderHint(self.view.RenderHint.Antialiasing)
+        self.view.setDragMode(SchemaView.RubberBandDrag)
+        for scroll_bar in (self.view.horizontalScrollBar(), self.view.verticalScrollBar()):
+            scroll_bar.valueChanged.connect(self.update_minimap_viewport)
+            scroll_bar.rangeChanged.connect(self.update_minimap_viewport)
+        canvas_layout.addWidget(self.view)
         
-        main_layout.addWidget(self.view, 3)
+        main_layout.addLayout(canvas_layout, 3)
         
         # ===== RIGHT CONTROL PANEL =====
         right_panel = QWidget()
@@ -92,10 +182,9 @@ class DatabaseSchemaDesigner(QMainWindow):
         sql_label.setFont(QFont("Arial", 10, QFont.Bold))
         right_layout.addWidget(sql_label)
         
-        self.sql_display = QTextEdit()
-        self.sql_display.setReadOnly(True)
-        self.sql_display.setFont(QFont("Courier", 9))
+        self.sql_display = SQLCodeView()
         self.sql_display.setPlaceholderText("SQL code will appear here...")
+        self.sql_display.table_activated.connect(self.on_sql_table_activated)
         right_layout.addWidget(self.sql_display)
         
         # ===== TABLES LIST =====
@@ -104,14 +193,50 @@ class DatabaseSchemaDesigner(QMainWindow):
         right_layout.addWidget(tables_label)
         
         self.tables_list = QListWidget()
+        self.tables_list.setSelectionMode(QListWidget.ExtendedSelection)
         self.tables_list.itemClicked.connect(self.on_table_selected)
         right_layout.addWidget(self.tables_list)
         
+        # ===== VALIDATION ISSUES =====
+        self.issues_label = QLabel("Issues:")
+        self.issues_label.setFont(QFont("Arial", 10, QFont.Bold))
+        right_layout.addWidget(self.issues_label)
+        
+        self.issues_list = QListWidget()
+        self.issues_list.itemClicked.connect(self.on_issue_selected)
+        right_layout.addWidget(self.issues_list)
+        
+        # List items per validator key, errors are kept above warnings
+        self.issue_items: Dict[Tuple[str, object], List[QListWidgetItem]] = {}
+        self.issue_errors = 0
+        self.issues_document = None
+        
         right_panel.setLayout(right_layout)
         main_layout.addWidget(right_panel, 1)
         
         main_widget.setLayout(main_layout)
         
+        # ===== PROFILER DOCK =====
+        self.profiler_dock = ProfilerDock(self)
+        self.profiler_dock.export_requested.connect(self.export_trace)
+        self.addDockWidget(Qt.BottomDockWidgetArea, self.profiler_dock)
+        self.profiler_dock.setVisible(PROFILER.enabled)
+        
+        # ===== METRICS DOCK =====
+        self.metrics_dock = MetricsDock(self)
+        self.metrics_dock.heatmap_changed.connect(self.update_heatmap)
+        self.metrics_dock.table_activated.connect(self.on_sql_table_activated)
+        self.metrics_dock.visibilityChanged.connect(self.on_metrics_visibility_changed)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.metrics_dock)
+        self.metrics_dock.hide()
+        
+        # ===== MINIMAP DOCK =====
+        self.minimap_dock = MinimapDock(self)
+        self.minimap_dock.minimap.navigate.connect(self.on_minimap_navigate)
+        self.minimap_dock.visibilityChanged.connect(self.on_minimap_visibility_changed)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.minimap_dock)
+        self.minimap_dock.hide()
+        
         # Status bar
         self.statusBar().showMessage("Ready - Database Schema Designer")
     
@@ -141,6 +266,19 @@ class DatabaseSchemaDesigner(QMainWindow):
         export_sql_action.triggered.connect(self.export_sql)
         file_menu.addAction(export_sql_action)
         
+        export_diagram_action = QAction("Export Diagram...", self)
+        export_diagram_action.triggered.connect(lambda: self.export_diagram(False))
+        file_menu.addAction(export_diagram_action)
+        
+        export_selection_action = QAction("Export Selection...", self)
+        export_selection_action.triggered.connect(lambda: self.export_diagram(True))
+        file_menu.addAction(export_selection_action)
+        
+        close_action = QAction("Close Schema", self)
+        close_action.setShortcut(QKeySequence.Close)
+        close_action.triggered.connect(lambda: self.close_document(self.document_tabs.currentIndex()))
+        file_menu.addAction(close_action)
+        
         file_menu.addSeparator()
         
         exit_action = QAction("Exit", self)
@@ -154,6 +292,98 @@ class DatabaseSchemaDesigner(QMainWindow):
         clear_action.triggered.connect(self.clear_all)
         edit_menu.addAction(clear_action)
         
+        # ===== SUBJECT AREAS MENU =====
+        areas_menu = menubar.addMenu("Subject Areas")
+        
+        assign_area_action = QAction("Assign Selected Tables...", self)
+        assign_area_action.triggered.connect(self.assign_subject_area)
+        areas_menu.addAction(assign_area_action)
+        
+        unassign_area_action = QAction("Remove Selected Tables From Area", self)
+        unassign_area_action.triggered.connect(self.remove_from_subject_area)
+        areas_menu.addAction(unassign_area_action)
+        
+        areas_menu.addSeparator()
+        
+        toggle_area_action = QAction("Collapse/Expand Area...", self)
+        toggle_area_action.triggered.connect(lambda: self.toggle_subject_area())
+        areas_menu.addAction(toggle_area_action)
+        
+        collapse_all_action = QAction("Collapse All", self)
+        collapse_all_action.triggered.connect(lambda: self.set_all_subject_areas_collapsed(True))
+        areas_menu.addAction(collapse_all_action)
+        
+        expand_all_action = QAction("Expand All", self)
+        expand_all_action.triggered.connect(lambda: self.set_all_subject_areas_collapsed(False))
+        areas_menu.addAction(expand_all_action)
+        
+        areas_menu.addSeparator()
+        
+        detect_areas_action = QAction("Detect Subject Areas", self)
+        detect_areas_action.triggered.connect(self.detect_subject_areas)
+        areas_menu.addAction(detect_areas_action)
+        
+        # ===== VIEW MENU =====
+        view_menu = menubar.addMenu("View")
+        
+        self.profiler_action = QAction("Profiler", self)
+        self.profiler_action.setCheckable(True)
+        self.profiler_action.setChecked(PROFILER.enabled)
+        self.profiler_action.toggled.connect(self.toggle_profiler)
+        view_menu.addAction(self.profiler_action)
+        
+        export_trace_action = QAction("Export Profiler Trace", self)
+        export_trace_action.triggered.connect(self.export_trace)
+        view_menu.addAction(export_trace_action)
+        
+        view_menu.addSeparator()
+        
+        budget_action = QAction("Scene Memory Budget...", self)
+        budget_action.triggered.connect(self.set_memory_budget)
+        view_menu.addAction(budget_action)
+        
+        view_menu.addSeparator()
+        
+        metrics_action = self.metrics_dock.toggleViewAction()
+        metrics_action.setText("Schema Metrics")
+        view_menu.addAction(metrics_action)
+        
+        minimap_action = self.minimap_dock.toggleViewAction()
+        minimap_action.setText("Minimap")
+        view_menu.addAction(minimap_action)
+        
+        # ===== TOOLS MENU =====
+        tools_menu = menubar.addMenu("Tools")
+        
+        test_drive_action = QAction("Test Drive Schema...", self)
+        test_drive_action.triggered.connect(self.test_drive_schema)
+        tools_menu.addAction(test_drive_action)
+        
+        clear_highlights_action = QAction("Clear Slow Join Highlights", self)
+        clear_highlights_action.triggered.connect(self.clear_workload_highlights)
+        tools_menu.addAction(clear_highlights_action)
+        
+        tools_menu.addSeparator()
+        
+        generate_models_action = QAction("Generate Models...", self)
+        generate_models_action.triggered.connect(self.generate_models)
+        tools_menu.addAction(generate_models_action)
+        
+        # ===== COLLABORATE MENU =====
+        collaborate_menu = menubar.addMenu("Collaborate")
+        
+        start_server_action = QAction("Share Schema (Start Server)...", self)
+        start_server_action.triggered.connect(self.start_collaboration_server)
+        collaborate_menu.addAction(start_server_action)
+        
+        connect_action = QAction("Join Shared Schema...", self)
+        connect_action.triggered.connect(self.join_collaboration)
+        collaborate_menu.addAction(connect_action)
+        
+        disconnect_action = QAction("Leave Shared Schema", self)
+        disconnect_action.triggered.connect(self.leave_collaboration)
+        collaborate_menu.addAction(disconnect_action)
+        
         # ===== HELP MENU =====
         help_menu = menubar.addMenu("Help")
         about_action = QAction("About", self)
@@ -179,120 +409,45 @@ class DatabaseSchemaDesigner(QMainWindow):
                 QMessageBox.warning(self, "Error", f"Table '{table_name}' already exists")
                 return
             
-            # Create table in model
-            table = Table(table_name)
-            self.schema.add_table(table)
-            
-            # Add to graphics scene
-            table_item = TableBlockItem(table)
-            self.scene.addItem(table_item)
-            self.table_items[table_name] = table_item
-            
-            self.update_tables_list()
-            self.update_sql_display()
+            # Create table in model (timed without the dialog)
+            with PROFILER.span("add_table"):
+                table = Table(table_name)
+                self.schema.add_table(table)
+                self.validator.table_changed(table_name)
+                self.share(add_table_op(table))
+                
+                self.refresh.mark_blocks([table_name])
+                self.refresh.mark_tables_list()
+                self.refresh.mark_model()
             self.statusBar().showMessage(f"Table '{table_name}' created")
     
     @Slot()
     def edit_selected_table(self):
-        """Edit selected table's attributes"""
+        """Edit the attributes of the selected tables in one grid"""
         selected_items = self.tables_list.selectedItems()
         if not selected_items:
             QMessageBox.warning(self, "Error", "No table selected")
             return
         
-        table_name = selected_items[0].text()
-        table = self.schema.tables[table_name]
-        
-        # Create attribute management dialog
-        attr_dialog = QDialog(self)
-        attr_dialog.setWindowTitle(f"Edit Table: {table_name}")
-        attr_dialog.setGeometry(100, 100, 500, 500)
-        
-        layout = QVBoxLayout()
-        
-        # Attributes table
-        attr_table = QTableWidget()
-        attr_table.setColumnCount(4)
-        attr_table.setHorizontalHeaderLabels(["Name", "Type", "PK", "Nullable"])
-        
-        for i, attr in enumerate(table.attributes):
-            attr_table.insertRow(i)
-            attr_table.setItem(i, 0, QTableWidgetItem(attr.name))
-            attr_table.setItem(i, 1, QTableWidgetItem(attr.data_type))
-            
-            pk_item = QTableWidgetItem("✓" if attr.is_primary_key else "")
-            attr_table.setItem(i, 2, pk_item)
-            
-            null_item = QTableWidgetItem("✓" if attr.is_nullable else "")
-            attr_table.setItem(i, 3, null_item)
-        
-        layout.addWidget(attr_table)
+        tables = [self.schema.tables[item.text()] for item in selected_items]
         
-        # Buttons
-        btn_layout = QHBoxLayout()
+        dialog = AttributeGridDialog(self, tables)
+        dialog.model.tables_changed.connect(self.on_attributes_changed)
+        dialog.exec()
         
-        add_attr_btn = QPushButton("+ Add Attribute")
-        add_attr_btn.clicked.connect(lambda: self.add_attribute(table, attr_table))
-        btn_layout.addWidget(add_attr_btn)
-        
-        remove_attr_btn = QPushButton("- Remove Selected")
-        remove_attr_btn.clicked.connect(lambda: self.remove_attribute(table, attr_table))
-        btn_layout.addWidget(remove_attr_btn)
-        
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(attr_dialog.accept)
-        btn_layout.addWidget(close_btn)
-        
-        layout.addLayout(btn_layout)
-        attr_dialog.setLayout(layout)
-        
-        attr_dialog.exec()
-        
-        # Update graphics
-        self.scene.removeItem(self.table_items[table_name])
-        table_item = TableBlockItem(table)
-        self.scene.addItem(table_item)
-        self.table_items[table_name] = table_item
-        
-        # Redraw relationships
-        self.redraw_relationships()
-        self.update_sql_display()
-        self.statusBar().showMessage(f"Table '{table_name}' updated")
+        names = ", ".join(t.name for t in tables)
+        self.statusBar().showMessage(f"Table(s) '{names}' updated")
     
-    def add_attribute(self, table: Table, attr_table: QTableWidget):
-        """Add attribute to table"""
-        dialog = AttributeDialog(self)
-        if dialog.exec() == QDialog.Accepted:
-            attr = dialog.get_attribute()
-            
-            if not attr.name:
-                QMessageBox.warning(self, "Error", "Attribute name cannot be empty")
-                return
-            
-            if any(a.name == attr.name for a in table.attributes):
-                QMessageBox.warning(self, "Error", f"Attribute '{attr.name}' already exists")
-                return
-            
-            table.add_attribute(attr)
-            
-            # Update table widget
-            row = attr_table.rowCount()
-            attr_table.insertRow(row)
-            attr_table.setItem(row, 0, QTableWidgetItem(attr.name))
-            attr_table.setItem(row, 1, QTableWidgetItem(attr.data_type))
-            attr_table.setItem(row, 2, QTableWidgetItem("✓" if attr.is_primary_key else ""))
-            attr_table.setItem(row, 3, QTableWidgetItem("✓" if attr.is_nullable else ""))
-    
-    def remove_attribute(self, table: Table, attr_table: QTableWidget):
-        """Remove attribute from table"""
-        current_row = attr_table.currentRow()
-        if current_row < 0:
-            QMessageBox.warning(self, "Error", "No attribute selected")
-            return
-        
-        attr_name = attr_table.item(current_row, 0).text()
-        table.remove_attribute(attr_name)
-        attr_table.removeRow(current_row)
+    @Slot(set)
+    @profiled("attributes_changed")
+    def on_attributes_changed(self, table_names):
+        """Revalidate and redraw the tables edited in the attribute grid"""
+        for table_name in table_names:
+            self.validator.table_changed(table_name)
+            self.share(set_attributes_op(self.schema.tables[table_name]))
+        # Rebuilding a block also re-attaches its relationship lines
+        self.refresh.mark_blocks(table_names)
+        self.refresh.mark_model()
     
     # =========================================================================
     # RELATIONSHIP MANAGEMENT SLOTS
@@ -315,16 +470,16 @@ class DatabaseSchemaDesigner(QMainWindow):
                 QMessageBox.warning(self, "Error", "Cannot create self-referencing relationship")
                 return
             
-            self.schema.add_relationship(rel)
+            if rel in self.schema.relationships:
+                QMessageBox.warning(self, "Error", "This relationship already exists")
+                return
             
-            # Add to graphics scene
-            from_item = self.table_items[rel.from_table]
-            to_item = self.table_items[rel.to_table]
-            rel_item = RelationshipLineItem(rel, from_item, to_item)
-            self.scene.addItem(rel_item)
-            self.relationship_items.append(rel_item)
+            self.schema.add_relationship(rel)
+            self.validator.relationship_added(rel)
+            self.share(add_relationship_op(rel))
             
-            self.update_sql_display()
+            self.show_new_relationship(rel)
+            self.refresh.mark_model()
             self.statusBar().showMessage(
                 f"Relationship created: {rel.from_table} ({rel.relationship_type.value}) -> {rel.to_table}"
             )
@@ -348,21 +503,33 @@ class DatabaseSchemaDesigner(QMainWindow):
         
         if reply == QMessageBox.Yes:
             self.schema.remove_table(table_name)
-            self.scene.removeItem(self.table_items[table_name])
-            del self.table_items[table_name]
-            
-            # Remove relationship items
-            self.relationship_items = [
-                r for r in self.relationship_items
-                if r.relationship.from_table != table_name and r.relationship.to_table != table_name
-            ]
-            
-            # Redraw relationships
-            self.redraw_relationships()
-            self.update_tables_list()
-            self.update_sql_display()
+            self.validator.table_removed(table_name)
+            self.share(remove_table_op(table_name))
+            self.remove_table_views([table_name])
             self.statusBar().showMessage(f"Table '{table_name}' deleted")
     
+    def remove_table_views(self, table_names):
+        """Drop the items of tables already removed from the model"""
+        # Group nodes and bundles show counts, rebuild them if any exist
+        if self.group_items:
+            self.refresh.mark_all()
+            return
+        
+        # Remove relationship items attached to the tables
+        remaining = []
+        for rel_item in self.relationship_items:
+            rel = rel_item.relationship
+            if rel.from_table in table_names or rel.to_table in table_names:
+                self.scene.removeItem(rel_item)
+            else:
+                remaining.append(rel_item)
+        self.relationship_items = remaining
+        
+        # The blocks are removed by the refresh since the tables are gone
+        self.refresh.mark_blocks(table_names)
+        self.refresh.mark_tables_list()
+        self.refresh.mark_model()
+    
     @Slot()
     def on_table_selected(self, item):
         """Handle table selection from list"""
@@ -370,61 +537,780 @@ class DatabaseSchemaDesigner(QMainWindow):
             table_item.setPen(QPen(QColor("#2E86AB"), 2))
         
         table_name = item.text()
+        if table_name in self.table_items:
+            self.table_items[table_name].setPen(QPen(QColor("#A23B72"), 3))
+        else:
+            area = self.schema.subject_area_of(table_name)
+            if area is not None and area.name in self.group_items:
+                self.view.centerOn(self.group_items[area.name])
+        self.sql_display.jump_to_table(table_name)
+    
+    @Slot()
+    def on_scene_selection_changed(self):
+        """Scroll the SQL panel to the table selected on the canvas"""
+        for item in self.scene.selectedItems():
+            if isinstance(item, TableBlockItem):
+                self.sql_display.jump_to_table(item.table.name)
+                return
+    
+    @Slot(str)
+    def on_sql_table_activated(self, table_name: str):
+        """Select on the canvas a table activated in the SQL or metrics panel"""
+        matches = self.tables_list.findItems(table_name, Qt.MatchExactly)
+        if not matches or table_name not in self.table_items:
+            return
+        self.tables_list.setCurrentItem(matches[0])
+        for table_item in self.table_items.values():
+            table_item.setPen(QPen(QColor("#2E86AB"), 2))
         self.table_items[table_name].setPen(QPen(QColor("#A23B72"), 3))
+        self.view.centerOn(self.table_items[table_name])
+    
+    @Slot(str)
+    def on_table_moved(self, table_name: str):
+        """Keep the lines of a dragged table or subject area attached to it"""
+        self.refresh.mark_lines([table_name])
+        if self.applying_remote or self.document is not self.collab_document:
+            return
+        table = self.schema.tables.get(table_name)
+        area = self.schema.subject_areas.get(table_name)
+        if table is not None:
+            self.collab_client.queue_move(table_name, table.x, table.y)
+        elif area is not None:
+            self.collab_client.queue_area_move(table_name, area.x, area.y)
+    
+    @Slot()
+    def on_issue_selected(self, item):
+        """Select the table an issue refers to"""
+        table_name = item.data(Qt.UserRole)
+        if not table_name or table_name not in self.table_items:
+            return
+        
+        matches = self.tables_list.findItems(table_name, Qt.MatchExactly)
+        if matches:
+            self.tables_list.setCurrentItem(matches[0])
+            self.on_table_selected(matches[0])
+        self.view.centerOn(self.table_items[table_name])
     
+    @profiled("redraw_relationships")
     def redraw_relationships(self):
-        """Redraw all relationship lines"""
+        """Redraw all relationship lines and subject area bundles"""
         for rel_item in self.relationship_items:
             self.scene.removeItem(rel_item)
+        for bundle_item in self.bundle_items:
+            self.scene.removeItem(bundle_item)
         
         self.relationship_items.clear()
+        self.bundle_items.clear()
+        
+        # Relationships touching a collapsed area are counted per pair of endpoints
+        collapsed = self.collapsed_tables()
+        bundles: Dict[Tuple[bool, str, bool, str], int] = {}
         
         for rel in self.schema.relationships:
-            from_item = self.table_items.get(rel.from_table)
-            to_item = self.table_items.get(rel.to_table)
+            from_area = collapsed.get(rel.from_table)
+            to_area = collapsed.get(rel.to_table)
+            
+            if from_area is None and to_area is None:
+                from_item = self.table_items.get(rel.from_table)
+                to_item = self.table_items.get(rel.to_table)
+                
+                if from_item and to_item:
+                    self.add_relationship_item(rel, from_item, to_item)
+                continue
             
+            if from_area is not None and from_area == to_area:
+                continue  # hidden inside one collapsed area
+            key = (
+                from_area is not None, from_area or rel.from_table,
+                to_area is not None, to_area or rel.to_table
+            )
+            bundles[key] = bundles.get(key, 0) + 1
+        
+        for (from_group, from_name, to_group, to_name), weight in bundles.items():
+            from_item = (self.group_items if from_group else self.table_items).get(from_name)
+            to_item = (self.group_items if to_group else self.table_items).get(to_name)
             if from_item and to_item:
-                rel_item = RelationshipLineItem(rel, from_item, to_item)
-                self.scene.addItem(rel_item)
-                self.relationship_items.append(rel_item)
+                bundle_item = BundleLineItem(from_name, to_name, from_item, to_item, weight)
+                self.scene.addItem(bundle_item)
+                self.bundle_items.append(bundle_item)
+    
+    def show_new_relationship(self, rel: Relationship):
+        """Add the line of a new relationship (bundles of collapsed areas are recounted)"""
+        from_item = self.table_items.get(rel.from_table)
+        to_item = self.table_items.get(rel.to_table)
+        if from_item and to_item:
+            self.add_relationship_item(rel, from_item, to_item)
+        else:
+            self.redraw_relationships()
+    
+    def add_relationship_item(self, rel: Relationship, from_item: TableBlockItem, to_item: TableBlockItem):
+        """Draw one relationship line, highlighted if the last test drive found it slow"""
+        rel_item = RelationshipLineItem(rel, from_item, to_item)
+        self.highlight_relationship(rel_item)
+        self.scene.addItem(rel_item)
+        self.relationship_items.append(rel_item)
+    
+    def collapsed_tables(self) -> Dict[str, str]:
+        """Map each table hidden in a collapsed subject area to the area name"""
+        return {
+            table_name: area.name
+            for area in self.schema.subject_areas.values() if area.collapsed
+            for table_name in area.tables
+        }
+    
+    # =========================================================================
+    # SUBJECT AREA SLOTS
+    # =========================================================================
+    
+    def selected_table_names(self) -> List[str]:
+        """Tables selected on the canvas or in the tables list"""
+        names = [
+            item.table.name for item in self.scene.selectedItems()
+            if isinstance(item, TableBlockItem)
+        ]
+        for item in self.tables_list.selectedItems():
+            if item.text() not in names:
+                names.append(item.text())
+        return names
+    
+    @Slot()
+    def assign_subject_area(self):
+        """Put the selected tables into a new or existing subject area"""
+        table_names = self.selected_table_names()
+        if not table_names:
+            QMessageBox.warning(self, "Error", "No table selected")
+            return
+        
+        area_name, ok = QInputDialog.getItem(
+            self,
+            "Assign Subject Area",
+            f"Subject area for {len(table_names)} table(s):",
+            sorted(self.schema.subject_areas.keys()),
+            0,
+            True
+        )
+        area_name = area_name.strip()
+        if not ok:
+            return
+        if not area_name:
+            QMessageBox.warning(self, "Error", "Subject area name cannot be empty")
+            return
+        
+        touched = {area_name}
+        for table_name in table_names:
+            previous = self.schema.subject_area_of(table_name)
+            if previous is not None:
+                touched.add(previous.name)
+            self.schema.assign_to_subject_area(table_name, area_name)
+        self.share(subject_areas_op(self.schema))
+        
+        if any(a.collapsed for name, a in self.schema.subject_areas.items() if name in touched):
+            self.refresh.mark_scene()
+        self.statusBar().showMessage(f"{len(table_names)} table(s) assigned to '{area_name}'")
+    
+    @Slot()
+    def remove_from_subject_area(self):
+        """Take the selected tables out of their subject areas"""
+        table_names = self.selected_table_names()
+        if not table_names:
+            QMessageBox.warning(self, "Error", "No table selected")
+            return
+        
+        rebuild = False
+        for table_name in table_names:
+            area = self.schema.subject_area_of(table_name)
+            rebuild = rebuild or (area is not None and area.collapsed)
+            self.schema.remove_from_subject_area(table_name)
+        self.share(subject_areas_op(self.schema))
+        
+        if rebuild:
+            self.refresh.mark_scene()
+        self.statusBar().showMessage(f"{len(table_names)} table(s) removed from their subject area")
+    
+    @Slot(str)
+    def toggle_subject_area(self, area_name: str = ""):
+        """Collapse a subject area into one node, or expand it back"""
+        if not self.schema.subject_areas:
+            QMessageBox.warning(self, "Error", "No subject areas defined")
+            return
+        
+        if not area_name:
+            area_name, ok = QInputDialog.getItem(
+                self,
+                "Collapse/Expand Area",
+                "Subject area:",
+                sorted(self.schema.subject_areas.keys()),
+                0,
+                False
+            )
+            if not ok:
+                return
+        
+        area = self.schema.subject_areas[area_name]
+        self.set_subject_area_collapsed(area, not area.collapsed)
+        self.share(subject_areas_op(self.schema))
+        self.refresh.mark_scene()
+        self.statusBar().showMessage(
+            f"Subject area '{area_name}' {'collapsed' if area.collapsed else 'expanded'}"
+        )
+    
+    def set_all_subject_areas_collapsed(self, collapsed: bool):
+        for area in self.schema.subject_areas.values():
+            self.set_subject_area_collapsed(area, collapsed)
+        self.share(subject_areas_op(self.schema))
+        self.refresh.mark_scene()
+    
+    def set_subject_area_collapsed(self, area, collapsed: bool):
+        """Change the state of an area, placing its node at the centre of its tables"""
+        if collapsed and not area.collapsed:
+            tables = [self.schema.tables[t] for t in area.tables if t in self.schema.tables]
+            if tables:
+                area.x = sum(t.x for t in tables) / len(tables)
+                area.y = sum(t.y for t in tables) / len(tables)
+        area.collapsed = collapsed
+    
+    @Slot()
+    def detect_subject_areas(self):
+        """Replace the subject areas with communities found in the relationships"""
+        if self.schema.subject_areas:
+            reply = QMessageBox.question(
+                self,
+                "Detect Subject Areas",
+                "Replace the existing subject areas with detected ones?",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+        
+        areas = detect_subject_areas(self.schema)
+        self.schema.clear_subject_areas()
+        for area_name, table_names in areas.items():
+            for table_name in table_names:
+                self.schema.assign_to_subject_area(table_name, area_name)
+        self.share(subject_areas_op(self.schema))
+        
+        self.refresh.mark_scene()
+        self.statusBar().showMessage(f"Detected {len(areas)} subject area(s)")
     
     # =========================================================================
     # UI UPDATE SLOTS
     # =========================================================================
     
+    @profiled("apply_refresh")
+    def apply_refresh(self, request: RefreshRequest):
+        """Apply a batch of view refreshes collected by the scheduler"""
+        # Tables whose block is rebuilt are the ones whose SQL may have changed
+        if request.scene:
+            self.document.sql_fragments.invalidate()
+        elif request.blocks:
+            self.document.sql_fragments.invalidate(request.blocks)
+        
+        if request.scene:
+            self.scene.clear()
+            self.table_items.clear()
+            self.relationship_items.clear()
+            self.group_items.clear()
+            self.bundle_items.clear()
+            
+            # Tables of collapsed subject areas get no items at all
+            collapsed = self.collapsed_tables()
+            for table in self.schema.tables.values():
+                if table.name in collapsed:
+                    continue
+                table_item = TableBlockItem(table)
+                table_item.set_heat(self.document.heat.get(table.name))
+                self.scene.addItem(table_item)
+                self.table_items[table.name] = table_item
+            for area in self.schema.subject_areas.values():
+                if area.collapsed:
+                    group_item = GroupNodeItem(area)
+                    self.scene.addItem(group_item)
+                    self.group_items[area.name] = group_item
+            self.redraw_relationships()
+        elif request.blocks or request.lines:
+            for table_name in request.blocks:
+                self.rebuild_table_item(table_name)
+            self.update_relationship_lines(request.blocks | request.lines)
+        
+        if request.tables_list:
+            self.update_tables_list()
+        if request.sql:
+            self.update_sql_display()
+        if request.issues:
+            self.update_issues_display()
+        if request.metrics:
+            self.update_metrics()
+        
+        if self.minimap_dock.isVisible():
+            if request.scene or request.blocks or request.sql:
+                self.minimap_dock.minimap.set_schema(self.schema)
+            elif request.lines:
+                self.minimap_dock.minimap.nodes_moved(request.lines)
+    
+    def rebuild_table_item(self, table_name: str):
+        """Create, replace or remove the block of one table"""
+        old_item = self.table_items.pop(table_name, None)
+        if old_item is not None:
+            self.scene.removeItem(old_item)
+        
+        table = self.schema.tables.get(table_name)
+        area = self.schema.subject_area_of(table_name)
+        if table is not None and not (area and area.collapsed):
+            table_item = TableBlockItem(table)
+            table_item.set_heat(self.document.heat.get(table_name))
+            self.scene.addItem(table_item)
+            self.table_items[table_name] = table_item
+    
+    def update_relationship_lines(self, names):
+        """Re-attach and reposition the lines touching the given tables or subject areas"""
+        for rel_item in self.relationship_items:
+            rel = rel_item.relationship
+            if rel.from_table not in names and rel.to_table not in names:
+                continue
+            rel_item.from_item = self.table_items.get(rel.from_table, rel_item.from_item)
+            rel_item.to_item = self.table_items.get(rel.to_table, rel_item.to_item)
+            rel_item.update_line()
+        
+        for bundle_item in self.bundle_items:
+            if bundle_item.from_name not in names and bundle_item.to_name not in names:
+                continue
+            if isinstance(bundle_item.from_item, TableBlockItem):
+                bundle_item.from_item = self.table_items.get(bundle_item.from_name, bundle_item.from_item)
+            if isinstance(bundle_item.to_item, TableBlockItem):
+                bundle_item.to_item = self.table_items.get(bundle_item.to_name, bundle_item.to_item)
+            bundle_item.update_line()
+    
     def update_tables_list(self):
         """Update tables list widget"""
         self.tables_list.clear()
         for table_name in self.schema.tables.keys():
             self.tables_list.addItem(table_name)
     
+    @profiled("update_sql_display")
     def update_sql_display(self):
-        """Update SQL code display"""
-        sql = SQLGenerator.generate_sql(self.schema)
-        self.sql_display.setText(sql)
+        """Update SQL code display, regenerating only the invalidated tables"""
+        sql = self.document.sql_fragments.generate_sql(self.schema)
+        self.sql_display.set_sql(sql)
+    
+    @profiled("update_issues_display")
+    def update_issues_display(self):
+        """Replace the list entries of the items the validator re-checked
+
+        The whole list is rebuilt only after validate_all() or when
+        another document became active.
+        """
+        changes = self.validator.take_changes()
+        if changes is None or self.issues_document is not self.document:
+            self.issues_document = self.document
+            self.issues_list.clear()
+            self.issue_items.clear()
+            self.issue_errors = 0
+            changes = self.validator.keys()
+        
+        for key in changes:
+            for item in self.issue_items.pop(key, []):
+                if item.data(Qt.UserRole + 1):
+                    self.issue_errors -= 1
+                self.issues_list.takeItem(self.issues_list.row(item))
+            
+            items = []
+            for issue in self.validator.issues_of(key):
+                is_error = issue.severity == Severity.ERROR
+                item = QListWidgetItem(str(issue))
+                item.setData(Qt.UserRole, issue.table)
+                item.setData(Qt.UserRole + 1, is_error)
+                if is_error:
+                    item.setForeground(QColor("#C73E1D"))
+                    self.issues_list.insertItem(self.issue_errors, item)
+                    self.issue_errors += 1
+                else:
+                    item.setForeground(QColor("#B8860B"))
+                    self.issues_list.addItem(item)
+                items.append(item)
+            if items:
+                self.issue_items[key] = items
+        
+        warnings = self.issues_list.count() - self.issue_errors
+        self.issues_label.setText(f"Issues: {self.issue_errors} error(s), {warnings} warning(s)")
+    
+    @profiled("update_metrics")
+    def update_metrics(self):
+        """Recompute schema metrics while the metrics dock is shown"""
+        if not self.metrics_dock.isVisible():
+            self.document.metrics = None
+        else:
+            self.document.metrics = compute_metrics(self.schema)
+        self.metrics_dock.set_metrics(self.document.metrics)
+        self.update_heatmap()
+    
+    @Slot()
+    def update_heatmap(self):
+        """Colour the table blocks by the metric chosen in the metrics dock"""
+        metric = self.metrics_dock.heatmap_metric()
+        metrics = self.document.metrics
+        if metric and metrics is not None:
+            self.document.heat = dict(zip(metrics.names, metrics.normalized(metric).tolist()))
+        else:
+            self.document.heat = {}
+        for table_name, table_item in self.table_items.items():
+            table_item.set_heat(self.document.heat.get(table_name))
+    
+    @Slot()
+    def update_minimap_viewport(self):
+        """Outline on the minimap the scene area shown by the main view"""
+        if self.minimap_dock.isVisible():
+            self.minimap_dock.minimap.set_viewport(
+                self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+            )
+    
+    @Slot(QPointF)
+    def on_minimap_navigate(self, pos: QPointF):
+        self.view.centerOn(pos)
+    
+    @Slot(bool)
+    def on_minimap_visibility_changed(self, visible: bool):
+        if visible:
+            self.refresh.flush()
+            self.minimap_dock.minimap.set_schema(self.schema)
+            self.update_minimap_viewport()
+    
+    @Slot(bool)
+    def on_metrics_visibility_changed(self, visible: bool):
+        if visible:
+            self.refresh.mark_metrics()
+        else:
+            self.update_heatmap()
     
     # =========================================================================
-    # FILE OPERATIONS SLOTS
+    # WORKLOAD SLOTS
     # =========================================================================
     
     @Slot()
-    def new_schema(self):
-        """Create new schema"""
-        reply = QMessageBox.question(
+    def test_drive_schema(self):
+        """Load synthetic data into SQLite and time the joins of every relationship"""
+        if not self.schema.tables:
+            QMessageBox.warning(self, "Error", "The schema has no tables")
+            return
+        
+        dialog = WorkloadDialog(self, self.document.workload_threshold_ms or DEFAULT_SLOW_THRESHOLD_MS)
+        if dialog.exec() != QDialog.Accepted:
+            return
+        
+        self.statusBar().showMessage("Running test drive...")
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            report = run_workload(self.schema, **dialog.get_options())
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Test drive failed: {str(e)}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        threshold = dialog.get_threshold()
+        self.document.workload_report = report
+        self.document.workload_threshold_ms = threshold
+        for rel_item in self.relationship_items:
+            self.highlight_relationship(rel_item)
+        
+        slow = report.slow_relationships(threshold)
+        self.statusBar().showMessage(f"Test drive finished: {len(slow)} slow relationship(s)")
+        WorkloadReportDialog(self, report, threshold).exec()
+    
+    @Slot()
+    def clear_workload_highlights(self):
+        """Forget the last test drive and restore every relationship line"""
+        self.document.workload_report = None
+        for rel_item in self.relationship_items:
+            self.highlight_relationship(rel_item)
+    
+    def highlight_relationship(self, rel_item: RelationshipLineItem):
+        """Apply the last test drive's result to a relationship line"""
+        report = self.document.workload_report
+        if report is None:
+            rel_item.set_highlight(False)
+            return
+        timing = report.timing_for(rel_item.relationship)
+        if timing is None:
+            rel_item.set_highlight(False)
+            return
+        rel_item.set_highlight(timing.is_slow(self.document.workload_threshold_ms), timing.summary())
+    
+    # =========================================================================
+    # COLLABORATION SLOTS
+    # =========================================================================
+    
+    def share(self, message: dict):
+        """Send a local edit of the shared document to the other designers"""
+        if self.collab_document is not None and self.document is self.collab_document:
+            self.collab_client.send(message)
+    
+    def ask_address(self, title: str) -> Tuple[str, int]:
+        """Ask for host:port; returns ("", 0) if cancelled or invalid"""
+        text, ok = QInputDialog.getText(self, title, "Address (host:port):", text=f"{DEFAULT_HOST}:{DEFAULT_PORT}")
+        if not ok:
+            return "", 0
+        host, _, port = text.strip().rpartition(":")
+        if not host or not port.isdigit() or not 0 < int(port) < 65536:
+            QMessageBox.warning(self, "Error", f"Invalid address '{text}'")
+            return "", 0
+        return host, int(port)
+    
+    @Slot()
+    def start_collaboration_server(self):
+        """Serve the active schema on a local server and edit it collaboratively"""
+        if self.collab_server is not None or self.collab_client.is_connected:
+            QMessageBox.warning(self, "Error", "Already collaborating, leave the shared schema first")
+            return
+        host, port = self.ask_address("Share Schema")
+        if not host:
+            return
+        
+        server = CollaborationServer(Schema.from_dict(self.schema.to_dict()), host, port)
+        try:
+            server.start_in_thread()
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to start the server: {str(e)}")
+            return
+        self.collab_server = server
+        self.collab_document = self.document
+        self.collab_client.connect_to("127.0.0.1" if host in ("0.0.0.0", "::") else host, server.port)
+        self.collab_client.session = ClientSession(self.document.schema)
+        self.statusBar().showMessage(f"Sharing '{self.document.title}' on {host}:{server.port}")
+    
+    @Slot()
+    def join_collaboration(self):
+        """Open the schema shared by a collaboration server in a new tab"""
+        if self.collab_server is not None or self.collab_client.is_connected:
+            QMessageBox.warning(self, "Error", "Already collaborating, leave the shared schema first")
+            return
+        host, port = self.ask_address("Join Shared Schema")
+        if not host:
+            return
+        
+        # The document is opened when the server's snapshot arrives
+        self.collab_document = None
+        self.collab_client.connect_to(host, port)
+        self.statusBar().showMessage(f"Connecting to {host}:{port}...")
+    
+    @Slot()
+    def leave_collaboration(self):
+        """Disconnect and stop the server if this window started it"""
+        self.collab_client.disconnect_from()
+        if self.collab_server is not None:
+            self.collab_server.stop()
+            self.collab_server = None
+        self.collab_client.session = None
+        self.collab_document = None
+    
+    @Slot()
+    def on_collaboration_connected(self):
+        self.statusBar().showMessage(
+            f"Connected to {self.collab_client.host}:{self.collab_client.port}"
+        )
+    
+    @Slot()
+    def on_collaboration_disconnected(self):
+        self.collab_document = None
+        self.statusBar().showMessage("Collaboration ended")
+    
+    @Slot(str)
+    def on_collaboration_error(self, message: str):
+        if self.collab_server is None and not self.collab_client.is_connected:
+            self.collab_document = None
+        QMessageBox.warning(self, "Collaboration", message)
+    
+    @Slot(dict)
+    def on_collaboration_message(self, message: dict):
+        """Apply an operation of another designer to the shared document"""
+        if message["op"] == "error":
+            self.statusBar().showMessage(f"Edit rejected by the server: {message.get('message', '')}")
+        
+        document = self.collab_document
+        session = self.collab_client.session
+        if document is None:
+            if message["op"] == "snapshot":
+                document = SchemaDocument()
+                session = ClientSession(document.schema)
+                session.receive(message)
+                document.validator.validate_all()
+                self.collab_document = document
+                self.collab_client.session = session
+                self.open_document(document)
+            return
+        if session is None:
+            return
+        
+        try:
+            change = session.receive(message)
+        except OperationError:
+            # Our copy diverged (e.g. the same table added concurrently): start over
+            self.collab_client.request_sync()
+            return
+        
+        validator = document.validator
+        if change.reset:
+            validator.validate_all(document.schema)
+        for table_name in change.removed:
+            validator.table_removed(table_name)
+        for table_name in change.tables:
+            validator.table_changed(table_name)
+        for rel in change.relationships:
+            validator.relationship_added(rel)
+        
+        if document is not self.document:
+            document.stale = True  # views are refreshed on activation
+            return
+        
+        if change.reset:
+            self.refresh.mark_all()
+            return
+        if change.areas:
+            self.refresh.mark_scene()  # collapsed areas hide their tables
+        if change.removed:
+            self.remove_table_views(change.removed)
+        if change.tables:
+            self.refresh.mark_blocks(change.tables)
+            self.refresh.mark_model()
+        if change.added:
+            self.refresh.mark_tables_list()
+        for rel in change.relationships:
+            self.show_new_relationship(rel)
+            self.refresh.mark_model()
+        
+        self.applying_remote = True
+        try:
+            for table_name, (x, y) in change.moved.items():
+                table_item = self.table_items.get(table_name)
+                if table_item is not None:
+                    table_item.setPos(x, y)
+            for area_name, (x, y) in change.moved_areas.items():
+                group_item = self.group_items.get(area_name)
+                if group_item is not None:
+                    group_item.setPos(x, y)
+        finally:
+            self.applying_remote = False
+        self.refresh.mark_lines(change.moved)
+        self.refresh.mark_lines(change.moved_areas)
+    
+    # =========================================================================
+    # DOCUMENT MANAGEMENT SLOTS
+    # =========================================================================
+    
+    def open_document(self, document: SchemaDocument):
+        """Add a document to the workspace and switch to its tab"""
+        self.workspace.add(document)
+        index = self.document_tabs.addTab(document.title)
+        self.document_tabs.setCurrentIndex(index)
+    
+    @Slot(int)
+    def on_document_tab_changed(self, index: int):
+        """Activate the document of the selected tab"""
+        if 0 <= index < len(self.workspace.documents):
+            self.activate_document(self.workspace.documents[index])
+    
+    def activate_document(self, document: SchemaDocument):
+        """Show a document, re-materialising its scene if it was evicted"""
+        if document is self.workspace.active and document.is_materialized:
+            return
+        
+        # Pending refreshes belong to the previously active document
+        if self.workspace.active is not None:
+            self.refresh.flush()
+        
+        self.workspace.activate(document)
+        if not document.is_materialized:
+            self.materialize_document(document)
+        elif document.stale:
+            self.refresh.mark_all()
+        document.stale = False
+        evicted = self.workspace.enforce_budget()
+        
+        self.view.setScene(document.scene)
+        self.refresh.mark_tables_list()
+        self.refresh.mark_model()
+        self.update_document_title()
+        
+        message = f"Schema '{document.title}' active"
+        if evicted:
+            message += f" - released {len(evicted)} inactive scene(s)"
+        self.statusBar().showMessage(message)
+    
+    def materialize_document(self, document: SchemaDocument):
+        """Create the scene of a document; its items are built by the next refresh"""
+        scene = SchemaScene(self)
+        scene.setSceneRect(0, 0, 1200, 800)
+        scene.setBackgroundBrush(QBrush(QColor("#F5F5F5")))
+        scene.table_moved.connect(self.on_table_moved)
+        scene.group_moved.connect(self.on_table_moved)
+        scene.group_activated.connect(self.toggle_subject_area)
+        scene.selectionChanged.connect(self.on_scene_selection_changed)
+        document.scene = scene
+        self.refresh.mark_all()
+    
+    @Slot(int)
+    def close_document(self, index: int):
+        """Close the document of a tab"""
+        if not 0 <= index < len(self.workspace.documents):
+            return
+        document = self.workspace.documents[index]
+        
+        if document.schema.tables:
+            reply = QMessageBox.question(
+                self,
+                "Close Schema",
+                f"Close '{document.title}'? Unsaved changes will be lost.",
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if reply != QMessageBox.Yes:
+                return
+        
+        if document is self.collab_document:
+            self.leave_collaboration()
+        if document is self.workspace.active:
+            self.refresh.flush()
+            self.view.setScene(None)
+        self.workspace.remove(document)
+        self.document_tabs.removeTab(index)
+        
+        if not self.workspace.documents:
+            self.open_document(SchemaDocument())
+    
+    def update_document_title(self):
+        """Refresh the tab text and window title of the active document"""
+        index = self.workspace.documents.index(self.document)
+        self.document_tabs.setTabText(index, self.document.title)
+        self.document_tabs.setTabToolTip(index, self.document.file_path or "")
+        self.setWindowTitle(f"{self.document.title} - Database Schema Designer - University of Jijel")
+    
+    @Slot()
+    def set_memory_budget(self):
+        """Change the memory budget for the scenes of open documents"""
+        budget, ok = QInputDialog.getInt(
             self,
-            "New Schema",
-            "Create new schema? Unsaved changes will be lost.",
-            QMessageBox.Yes | QMessageBox.No
+            "Scene Memory Budget",
+            f"Budget in MB (currently ~{self.workspace.scene_bytes() / (1024 * 1024):.1f} MB used):",
+            self.workspace.memory_budget_mb,
+            1,
+            65536
         )
         
-        if reply == QMessageBox.Yes:
-            self.schema = Schema()
-            self.scene.clear()
-            self.table_items.clear()
-            self.relationship_items.clear()
-            self.update_tables_list()
-            self.update_sql_display()
-            self.statusBar().showMessage("New schema created")
+        if ok:
+            self.workspace.memory_budget_mb = budget
+            evicted = self.workspace.enforce_budget()
+            self.statusBar().showMessage(
+                f"Scene memory budget set to {budget} MB, released {len(evicted)} scene(s)"
+            )
+    
+    # =========================================================================
+    # FILE OPERATIONS SLOTS
+    # =========================================================================
+    
+    @Slot()
+    def new_schema(self):
+        """Create new schema in a new tab"""
+        schema = Schema(f"Schema_{len(self.workspace.documents) + 1}")
+        self.open_document(SchemaDocument(schema))
+        self.statusBar().showMessage("New schema created")
     
     @Slot()
     def save_schema(self):
@@ -432,7 +1318,7 @@ class DatabaseSchemaDesigner(QMainWindow):
         file_path, _ = QFileDialog.getSaveFileName(
             self,
             "Save Schema",
-            "",
+            self.document.file_path or "",
             "JSON Files (*.json);;All Files (*)"
         )
         
@@ -440,6 +1326,8 @@ class DatabaseSchemaDesigner(QMainWindow):
             try:
                 with open(file_path, 'w') as f:
                     json.dump(self.schema.to_dict(), f, indent=2)
+                self.document.file_path = file_path
+                self.update_document_title()
                 self.statusBar().showMessage(f"Schema saved: {file_path}")
                 QMessageBox.information(self, "Success", "Schema saved successfully!")
             except Exception as e:
@@ -456,26 +1344,26 @@ class DatabaseSchemaDesigner(QMainWindow):
         )
         
         if file_path:
+            for index, document in enumerate(self.workspace.documents):
+                if document.file_path and os.path.abspath(document.file_path) == os.path.abspath(file_path):
+                    self.document_tabs.setCurrentIndex(index)
+                    return
+            
             try:
-                with open(file_path, 'r') as f:
-                    data = json.load(f)
-                    self.schema = Schema.from_dict(data)
-                
-                self.scene.clear()
-                self.table_items.clear()
-                self.relationship_items.clear()
-                
-                # Recreate table items
-                for table in self.schema.tables.values():
-                    table_item = TableBlockItem(table)
-                    self.scene.addItem(table_item)
-                    self.table_items[table.name] = table_item
-                
-                # Recreate relationship items
-                self.redraw_relationships()
-                
-                self.update_tables_list()
-                self.update_sql_display()
+                # Timed from the chosen file on, without the file dialog
+                with PROFILER.span("open_schema"):
+                    with open(file_path, 'r') as f:
+                        data = json.load(f)
+                        schema = Schema.from_dict(data)
+                    
+                    # Reuse an untouched tab, otherwise open a new one
+                    if self.document.is_empty():
+                        self.schema = schema
+                        self.document.file_path = file_path
+                        self.update_document_title()
+                        self.refresh.mark_all()
+                    else:
+                        self.open_document(SchemaDocument(schema, file_path))
                 self.statusBar().showMessage(f"Schema loaded: {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to open: {str(e)}")
@@ -492,7 +1380,8 @@ class DatabaseSchemaDesigner(QMainWindow):
         
         if file_path:
             try:
-                sql = SQLGenerator.generate_sql(self.schema)
+                self.refresh.flush()
+                sql = self.document.sql_fragments.generate_sql(self.schema)
                 with open(file_path, 'w') as f:
                     f.write(sql)
                 self.statusBar().showMessage(f"SQL exported: {file_path}")
@@ -500,6 +1389,75 @@ class DatabaseSchemaDesigner(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to export: {str(e)}")
     
+    @Slot(bool)
+    def export_diagram(self, selected_only: bool = False):
+        """Export the canvas (or the selected items) as PNG, SVG or PDF"""
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export Selection" if selected_only else "Export Diagram",
+            "",
+            "PNG Image (*.png);;SVG Image (*.svg);;PDF Document (*.pdf)"
+        )
+        
+        if file_path:
+            if not os.path.splitext(file_path)[1]:
+                file_path += "." + selected_filter.split("*.")[-1].rstrip(")")
+            
+            self.refresh.flush()
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            try:
+                export_scene(self.scene, file_path, selected_only)
+                self.statusBar().showMessage(f"Diagram exported: {file_path}")
+            except ExportError as e:
+                QMessageBox.warning(self, "Error", str(e))
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to export: {str(e)}")
+            finally:
+                QApplication.restoreOverrideCursor()
+    
+    @Slot()
+    def generate_models(self):
+        """Generate ORM/model modules, rewriting only the files that changed"""
+        backends = [f"{name} - {cls.description}" for name, cls in sorted(GENERATORS.items())]
+        choice, ok = QInputDialog.getItem(self, "Generate Models", "Backend:", backends, 0, False)
+        if not ok:
+            return
+        backend = choice.split(" - ")[0]
+        
+        output_dir = QFileDialog.getExistingDirectory(self, "Output Package Directory")
+        if not output_dir:
+            return
+        
+        try:
+            result = generate_code(self.schema, output_dir, backend)
+            self.statusBar().showMessage(f"Models generated ({backend}): {result.summary()}")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to generate models: {str(e)}")
+    
+    @Slot(bool)
+    def toggle_profiler(self, enabled: bool):
+        """Enable or disable hot-path instrumentation"""
+        PROFILER.enabled = enabled
+        self.profiler_dock.setVisible(enabled)
+        self.statusBar().showMessage(f"Profiler {'enabled' if enabled else 'disabled'}")
+    
+    @Slot()
+    def export_trace(self):
+        """Export profiler events as a Chrome trace file"""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Profiler Trace",
+            "",
+            "Trace Files (*.json);;All Files (*)"
+        )
+        
+        if file_path:
+            try:
+                PROFILER.export_trace(file_path)
+                self.statusBar().showMessage(f"Trace exported: {file_path}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to export trace: {str(e)}")
+    
     @Slot()
     def clear_all(self):
         """Clear entire schema"""
@@ -513,11 +1471,10 @@ class DatabaseSchemaDesigner(QMainWindow):
         if reply == QMessageBox.Yes:
             self.schema.tables.clear()
             self.schema.relationships.clear()
-            self.scene.clear()
-            self.table_items.clear()
-            self.relationship_items.clear()
-            self.update_tables_list()
-            self.update_sql_display()
+            self.schema.clear_subject_areas()
+            self.validator.validate_all(self.schema)
+            self.share({"op": "clear"})
+            self.refresh.mark_all()
             self.statusBar().showMessage("Schema cleared")
     
     @Slot()
@@ -0,0 +1,270 @@
+"""
+Database Schema Designer - Benchmark Suite
+University of Jijel - IHM Module
+
+Times the model and rendering hot paths on synthetic schemas and
+records peak memory. Runs headless with Qt's offscreen platform.
+
+Each scenario runs in its own subprocess so that its peak resident set
+size (which includes Qt's C++ allocations, unlike tracemalloc) is not
+inflated by the scenarios run before it.
+
+Usage:
+    python benchmark.py --tables 100 1000 --output results.json
+    python benchmark.py --tables 1000 --compare results.json
+"""
+
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import sys
+import json
+import time
+import platform
+import argparse
+import statistics
+import subprocess
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not reported
+    resource = None
+
+from PySide6 import __version__ as PYSIDE_VERSION
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QImage, QPainter, QColor
+
+from models import Schema
+from graphics import TableBlockItem, RelationshipLineItem, build_scene
+from sql_generator import SQLGenerator
+from synthetic import generate_schema
+
+
+SCENARIOS = ["sql_generation", "save", "load", "scene_build", "redraw_relationships",
+             "drag_update", "paint"]
+
+PAINT_WIDTH = 2048
+DRAG_SAMPLE = 50
+
+
+# =============================================================================
+# SCENARIOS
+# =============================================================================
+# Each factory does its setup outside the timed region and returns the
+# callable to time.
+
+def _sql_generation(schema: Schema) -> Callable[[], object]:
+    return lambda: SQLGenerator.generate_sql(schema)
+
+
+def _save(schema: Schema) -> Callable[[], object]:
+    return lambda: json.dumps(schema.to_dict(), indent=2)
+
+
+def _load(schema: Schema) -> Callable[[], object]:
+    text = json.dumps(schema.to_dict())
+    return lambda: Schema.from_dict(json.loads(text))
+
+
+def _scene_build(schema: Schema) -> Callable[[], object]:
+    return lambda: build_scene(schema)
+
+
+def _redraw_relationships(schema: Schema) -> Callable[[], object]:
+    from main import DatabaseSchemaDesigner
+    window = DatabaseSchemaDesigner()
+    window.schema = schema
+    for table in schema.tables.values():
+        item = TableBlockItem(table)
+        window.scene.addItem(item)
+        window.table_items[table.name] = item
+    return window.redraw_relationships
+
+
+def _drag_update(schema: Schema) -> Callable[[], object]:
+    scene, table_items, relationship_items = build_scene(schema)
+    lines_by_table: Dict[str, List[RelationshipLineItem]] = {}
+    for rel_item in relationship_items:
+        lines_by_table.setdefault(rel_item.relationship.from_table, []).append(rel_item)
+        lines_by_table.setdefault(rel_item.relationship.to_table, []).append(rel_item)
+    moved = list(table_items.values())[:DRAG_SAMPLE]
+    
+    def run():
+        for item in moved:
+            item.setPos(item.pos() + QPointF(5, 5))
+            item.table.x = item.pos().x()
+            item.table.y = item.pos().y()
+            for rel_item in lines_by_table.get(item.table.name, []):
+                rel_item.update_line()
+    run.scene = scene
+    return run
+
+
+def _paint(schema: Schema) -> Callable[[], object]:
+    scene, _, _ = build_scene(schema)
+    rect = scene.itemsBoundingRect()
+    height = max(1, int(PAINT_WIDTH * rect.height() / max(rect.width(), 1)))
+    image = QImage(PAINT_WIDTH, height, QImage.Format_ARGB32_Premultiplied)
+    
+    def run():
+        image.fill(QColor("#F5F5F5"))
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        scene.render(painter, source=rect)
+        painter.end()
+    run.scene = scene
+    return run
+
+
+SCENARIO_FACTORIES = {
+    "sql_generation": _sql_generation,
+    "save": _save,
+    "load": _load,
+    "scene_build": _scene_build,
+    "redraw_relationships": _redraw_relationships,
+    "drag_update": _drag_update,
+    "paint": _paint,
+}
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def peak_rss_kib() -> Optional[float]:
+    """Peak resident set size of this process so far"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == "darwin" else float(peak)  # bytes on macOS
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Time func repeat times
+
+    setup_rss_kib is the peak before the first timed run, peak_rss_kib
+    the peak after the last one.
+    """
+    setup_rss = peak_rss_kib()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    
+    return {
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.mean(timings),
+        "setup_rss_kib": setup_rss,
+        "peak_rss_kib": peak_rss_kib(),
+    }
+
+
+def run_scenario(name: str, table_count: int, attributes: int, density: float,
+                 repeat: int, seed: int) -> Dict:
+    """Set up and measure one scenario in the current process"""
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    schema = generate_schema(table_count, attributes, density, seed)
+    func = SCENARIO_FACTORIES[name](schema)
+    result = {
+        "scenario": name,
+        "tables": table_count,
+        "attributes_per_table": attributes,
+        "relationship_density": density,
+        "relationships": len(schema.relationships),
+    }
+    result.update(measure(func, repeat))
+    app.processEvents()
+    return result
+
+
+def run_benchmarks(table_counts: List[int], attributes: int, density: float,
+                   scenarios: List[str], repeat: int, seed: int = 0) -> Dict:
+    """Run every scenario for every schema size, each in a fresh subprocess"""
+    results = []
+    for table_count in table_counts:
+        for name in scenarios:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", name,
+                 "--tables", str(table_count), "--attributes", str(attributes),
+                 "--density", str(density), "--repeat", str(repeat), "--seed", str(seed)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results.append(result)
+            peak = result["peak_rss_kib"]
+            print(f"{name:<22} tables={table_count:<6} median={result['median_s'] * 1000:9.2f} ms"
+                  f"  peak RSS={peak if peak is not None else float('nan'):10.0f} KiB")
+    
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pyside": PYSIDE_VERSION,
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(report: Dict, baseline: Dict):
+    """Print median time and peak memory ratios against a previous run"""
+    def key(r):
+        return (r["scenario"], r["tables"], r["attributes_per_table"], r["relationship_density"])
+    
+    previous = {key(r): r for r in baseline.get("results", [])}
+    print("\nComparison with baseline (new / old):")
+    for result in report["results"]:
+        old = previous.get(key(result))
+        if old is None:
+            continue
+        time_ratio = result["median_s"] / old["median_s"] if old["median_s"] else float("inf")
+        new_peak, old_peak = result.get("peak_rss_kib"), old.get("peak_rss_kib")
+        mem_ratio = new_peak / old_peak if new_peak and old_peak else float("nan")
+        flag = "  <-- slower" if time_ratio > 1.1 else ""
+        print(f"{result['scenario']:<22} tables={result['tables']:<6} "
+              f"time x{time_ratio:5.2f}  memory x{mem_ratio:5.2f}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Database Schema Designer")
+    parser.add_argument("--tables", type=int, nargs="+", default=[100, 1000],
+                        help="table counts to benchmark")
+    parser.add_argument("--attributes", type=int, default=8, help="attributes per table")
+    parser.add_argument("--density", type=float, default=1.0,
+                        help="average relationships per table")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against a previous JSON results file")
+    parser.add_argument("--worker", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.worker:
+        result = run_scenario(args.worker, args.tables[0], args.attributes, args.density,
+                              args.repeat, args.seed)
+        print(json.dumps(result))
+        return 0
+    
+    report = run_benchmarks(args.tables, args.attributes, args.density,
+                            args.scenarios, args.repeat, args.seed)
+    
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results saved: {args.output}")
+    
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
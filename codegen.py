@@ -0,0 +1,536 @@
+"""
+Database Schema Designer - Model Code Generators
+University of Jijel - IHM Module
+
+This module generates ORM/model source code from the schema, next to
+the raw DDL of SQLGenerator. Backends (SQLAlchemy 2.0 declarative,
+Django, Pydantic) are plugins registered by name; each one emits one
+module per table plus a package __init__. A manifest of content hashes
+is kept in the output directory so regenerating only writes the files
+whose content changed and removes the ones of deleted tables.
+
+Usage:
+    python codegen.py schema.json models/ --backend sqlalchemy
+    python codegen.py --list
+"""
+
+import os
+import re
+import sys
+import json
+import keyword
+import hashlib
+import argparse
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Type
+
+from models import Schema, Table, Attribute, Relationship, RelationshipType
+from validation import base_type
+
+
+MANIFEST_NAME = ".codegen-manifest.json"
+
+_TYPE_ARGS = re.compile(r"\(\s*(\d+)\s*(?:,\s*(\d+)\s*)?\)")
+
+
+# =============================================================================
+# NAMING HELPERS
+# =============================================================================
+
+def python_identifier(name: str) -> str:
+    """Turn a table or column name into a valid snake_case identifier"""
+    identifier = re.sub(r"\W+", "_", name.strip()).strip("_").lower() or "unnamed"
+    if identifier[0].isdigit():
+        identifier = "_" + identifier
+    if keyword.iskeyword(identifier):
+        identifier += "_"
+    return identifier
+
+
+def unique_name(name: str, taken: set, separator: str = "_", fold_case: bool = False) -> str:
+    """name, or name with the first free numeric suffix; the result is added to taken
+
+    With fold_case, names differing only in case clash (module files on
+    case-insensitive file systems); taken then holds lower-case names.
+    """
+    candidate, number = name, 2
+    while (candidate.lower() if fold_case else candidate) in taken:
+        candidate = f"{name}{separator}{number}"
+        number += 1
+    taken.add(candidate.lower() if fold_case else candidate)
+    return candidate
+
+
+def class_name(table_name: str) -> str:
+    """CamelCase class name for a table, e.g. order_items -> OrderItems"""
+    words = re.split(r"[\W_]+", table_name.strip())
+    name = "".join(w[:1].upper() + w[1:] for w in words if w) or "Unnamed"
+    return "_" + name if name[0].isdigit() else name
+
+
+def type_args(data_type: str) -> Tuple[Optional[int], Optional[int]]:
+    """Length/precision and scale of a type, e.g. DECIMAL(10,2) -> (10, 2)"""
+    match = _TYPE_ARGS.search(data_type)
+    if not match:
+        return None, None
+    return int(match.group(1)), int(match.group(2)) if match.group(2) else None
+
+
+def foreign_keys(schema: Schema, table: Table) -> Dict[str, Relationship]:
+    """Columns of table that reference another table, keyed by column name"""
+    return {
+        rel.to_key: rel for rel in schema.relationships
+        if rel.to_table == table.name and rel.relationship_type == RelationshipType.ONE_TO_MANY
+        and rel.from_key and rel.to_key and rel.from_table in schema.tables
+    }
+
+
+# =============================================================================
+# PLUGIN INTERFACE
+# =============================================================================
+
+GENERATORS: Dict[str, Type["CodeGenerator"]] = {}
+
+
+class CodeGenerationError(ValueError):
+    """Raised when a schema cannot be turned into working model code"""
+
+
+def register_generator(cls: Type["CodeGenerator"]) -> Type["CodeGenerator"]:
+    """Class decorator adding a backend to the registry under cls.name"""
+    GENERATORS[cls.name] = cls
+    return cls
+
+
+def get_generator(name: str) -> "CodeGenerator":
+    try:
+        return GENERATORS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown code generator '{name}', use one of: {', '.join(GENERATORS)}")
+
+
+class CodeGenerator:
+    """Base class of model code generators
+
+    Subclasses set name/description, implement generate_table() and may
+    add shared files in package_files() and checks in check(). Bump
+    VERSION when the output of a backend changes so every file is
+    rewritten.
+    
+    Tables whose module or class names clash (e.g. "Order" and "order",
+    or a table named like a shared module) get a numeric suffix, in
+    schema order.
+    """
+    
+    name = ""
+    description = ""
+    VERSION = 1
+    RESERVED_MODULES: Tuple[str, ...] = ("__init__",)
+    RESERVED_CLASSES: Tuple[str, ...] = ()
+    
+    def __init__(self):
+        self.names: Dict[str, Tuple[str, str]] = {}  # table name -> (module, class)
+    
+    def assign_names(self, schema: Schema) -> Dict[str, Tuple[str, str]]:
+        modules = {m.lower() for m in self.RESERVED_MODULES}
+        classes = set(self.RESERVED_CLASSES)
+        return {
+            table_name: (unique_name(python_identifier(table_name), modules, fold_case=True),
+                         unique_name(class_name(table_name), classes, ""))
+            for table_name in schema.tables
+        }
+    
+    def module_name(self, table: Table) -> str:
+        names = self.names.get(table.name)
+        return names[0] if names else python_identifier(table.name)
+    
+    def class_for(self, table_name: str) -> str:
+        names = self.names.get(table_name)
+        return names[1] if names else class_name(table_name)
+    
+    def check(self, schema: Schema):
+        """Raise CodeGenerationError if the backend cannot map the schema"""
+    
+    def generate_table(self, table: Table, schema: Schema) -> str:
+        raise NotImplementedError
+    
+    def package_files(self, schema: Schema) -> Dict[str, str]:
+        """Shared modules; by default an __init__ importing every class"""
+        lines = [f'"""Models generated from schema {schema.name} by the Database Schema Designer"""', ""]
+        names = []
+        for table in schema.tables.values():
+            lines.append(f"from .{self.module_name(table)} import {self.class_for(table.name)}")
+            names.append(self.class_for(table.name))
+        lines += ["", "__all__ = ["] + [f'    "{n}",' for n in names] + ["]", ""]
+        return {"__init__.py": "\n".join(lines)}
+    
+    def generate(self, schema: Schema) -> Dict[str, str]:
+        """Every output file, keyed by path relative to the output directory"""
+        self.check(schema)
+        self.names = self.assign_names(schema)
+        files = {f"{self.module_name(t)}.py": self.generate_table(t, schema) for t in schema.tables.values()}
+        files.update(self.package_files(schema))
+        return files
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+@register_generator
+class SQLAlchemyGenerator(CodeGenerator):
+    """SQLAlchemy 2.0 declarative models (Mapped / mapped_column)"""
+    
+    name = "sqlalchemy"
+    description = "SQLAlchemy 2.0 declarative models"
+    RESERVED_MODULES = ("__init__", "base")
+    # Names imported by the generated modules
+    RESERVED_CLASSES = ("Base", "Mapped", "ForeignKey", "Integer", "BigInteger", "SmallInteger", "String",
+                        "Text", "Float", "Boolean", "Date", "DateTime", "Numeric", "Optional", "Decimal")
+    
+    TYPES = {
+        "INT": ("Integer", "int"), "INTEGER": ("Integer", "int"),
+        "BIGINT": ("BigInteger", "int"), "SMALLINT": ("SmallInteger", "int"),
+        "VARCHAR": ("String", "str"), "CHAR": ("String", "str"), "TEXT": ("Text", "str"),
+        "FLOAT": ("Float", "float"), "BOOLEAN": ("Boolean", "bool"),
+        "DATE": ("Date", "date"), "DATETIME": ("DateTime", "datetime"),
+        "DECIMAL": ("Numeric", "Decimal"), "NUMERIC": ("Numeric", "Decimal"),
+    }
+    
+    def column_type(self, attr: Attribute) -> Tuple[str, str]:
+        sa_type, py_type = self.TYPES.get(base_type(attr.data_type), ("String", "str"))
+        length, scale = type_args(attr.data_type)
+        if sa_type == "String" and length:
+            return f"String({length})", py_type
+        if sa_type == "Numeric" and length:
+            return f"Numeric({length}, {scale or 0})", py_type
+        return sa_type, py_type
+    
+    def check(self, schema: Schema):
+        missing = [t.name for t in schema.tables.values() if not any(a.is_primary_key for a in t.attributes)]
+        if missing:
+            raise CodeGenerationError(
+                f"SQLAlchemy needs a primary key in every table, missing in: {', '.join(missing)}"
+            )
+    
+    def generate_table(self, table: Table, schema: Schema) -> str:
+        fks = foreign_keys(schema, table)
+        sa_imports = {"ForeignKey"} if fks else set()
+        py_imports = set()
+        body = []
+        for attr in table.attributes:
+            sa_type, py_type = self.column_type(attr)
+            sa_imports.add(sa_type.split("(")[0])
+            if py_type in ("date", "datetime"):
+                py_imports.add(f"from datetime import {py_type}")
+            elif py_type == "Decimal":
+                py_imports.add("from decimal import Decimal")
+            
+            args = []
+            identifier = python_identifier(attr.name)
+            if identifier != attr.name:
+                args.append(f'"{attr.name}"')
+            args.append(sa_type)
+            if attr.name in fks:
+                rel = fks[attr.name]
+                args.append(f'ForeignKey("{rel.from_table}.{rel.from_key}")')
+            if attr.is_primary_key:
+                args.append("primary_key=True")
+            args.append(f"nullable={attr.is_nullable and not attr.is_primary_key}")
+            
+            annotation = f"Optional[{py_type}]" if attr.is_nullable and not attr.is_primary_key else py_type
+            body.append(f"    {identifier}: Mapped[{annotation}] = mapped_column({', '.join(args)})")
+        
+        if any(a.is_nullable and not a.is_primary_key for a in table.attributes):
+            py_imports.add("from typing import Optional")
+        lines = ['"""' + f"Table {table.name}" + '"""', ""]
+        lines += sorted(py_imports)
+        lines += [
+            "",
+            f"from sqlalchemy import {', '.join(sorted(sa_imports))}",
+            "from sqlalchemy.orm import Mapped, mapped_column",
+            "",
+            "from .base import Base",
+            "",
+            "",
+            f"class {self.class_for(table.name)}(Base):",
+            f'    __tablename__ = "{table.name}"',
+            "",
+        ]
+        return "\n".join(lines + (body or ["    pass"]) + [""])
+    
+    def package_files(self, schema: Schema) -> Dict[str, str]:
+        files = super().package_files(schema)
+        files["__init__.py"] = files["__init__.py"].replace(
+            "\n\n", "\n\nfrom .base import Base\n", 1
+        )
+        files["base.py"] = "\n".join([
+            '"""Declarative base shared by every model"""',
+            "",
+            "from sqlalchemy.orm import DeclarativeBase",
+            "",
+            "",
+            "class Base(DeclarativeBase):",
+            "    pass",
+            "",
+        ])
+        return files
+
+
+@register_generator
+class DjangoGenerator(CodeGenerator):
+    """Django models, one module per table inside a models package"""
+    
+    name = "django"
+    description = "Django models package"
+    RESERVED_CLASSES = ("Model",)
+    
+    TYPES = {
+        "INT": "IntegerField", "INTEGER": "IntegerField", "BIGINT": "BigIntegerField",
+        "SMALLINT": "SmallIntegerField", "VARCHAR": "CharField", "CHAR": "CharField",
+        "TEXT": "TextField", "FLOAT": "FloatField", "BOOLEAN": "BooleanField",
+        "DATE": "DateField", "DATETIME": "DateTimeField", "DECIMAL": "DecimalField",
+        "NUMERIC": "DecimalField",
+    }
+    
+    @staticmethod
+    def field_name(column: str, rel: Optional[Relationship]) -> str:
+        """Attribute name of a column; foreign keys drop their "_id" suffix"""
+        identifier = python_identifier(column)
+        if rel is not None and identifier.endswith("_id") and len(identifier) > 3:
+            identifier = identifier[:-3]
+        return identifier
+    
+    def field(self, attr: Attribute, rel: Optional[Relationship], primary: bool,
+              schema: Schema) -> Tuple[str, str]:
+        """(attribute name, field expression) of one column"""
+        identifier = self.field_name(attr.name, rel)
+        options = []
+        if rel is not None:
+            # to_field names the field of the referenced model, not its column
+            target = schema.tables[rel.from_table]
+            to_field = self.field_name(rel.from_key, foreign_keys(schema, target).get(rel.from_key))
+            options += [f'"{self.class_for(rel.from_table)}"', "on_delete=models.CASCADE",
+                        f'to_field="{to_field}"', 'related_name="+"']
+            kind = "ForeignKey"
+        else:
+            kind = self.TYPES.get(base_type(attr.data_type), "TextField")
+            length, scale = type_args(attr.data_type)
+            if kind == "CharField":
+                options.append(f"max_length={length or 255}")
+            elif kind == "DecimalField":
+                options += [f"max_digits={length or 10}", f"decimal_places={scale or 0}"]
+        if identifier != attr.name:
+            options.append(f'db_column="{attr.name}"')
+        if primary:
+            options.append("primary_key=True")
+        elif attr.is_nullable:
+            options += ["null=True", "blank=True"]
+        return identifier, f"models.{kind}({', '.join(options)})"
+    
+    def generate_table(self, table: Table, schema: Schema) -> str:
+        fks = foreign_keys(schema, table)
+        primary_keys = [a for a in table.attributes if a.is_primary_key]
+        body = []
+        for attr in table.attributes:
+            primary = bool(primary_keys) and attr is primary_keys[0]
+            identifier, expression = self.field(attr, fks.get(attr.name), primary, schema)
+            if attr.is_primary_key and not primary:
+                body.append("    # Part of a composite primary key, Django only supports one")
+            body.append(f"    {identifier} = {expression}")
+        
+        lines = [
+            '"""' + f"Table {table.name}" + '"""',
+            "",
+            "from django.db import models",
+            "",
+            "",
+            f"class {self.class_for(table.name)}(models.Model):",
+        ]
+        lines += body
+        lines += ["", "    class Meta:", f'        db_table = "{table.name}"']
+        if len(primary_keys) > 1:
+            names = ", ".join(f'"{python_identifier(a.name)}"' for a in primary_keys)
+            lines.append(f"        unique_together = (({names}),)")
+        return "\n".join(lines + [""])
+
+
+@register_generator
+class PydanticGenerator(CodeGenerator):
+    """Pydantic v2 models mirroring each table's columns"""
+    
+    name = "pydantic"
+    description = "Pydantic models"
+    RESERVED_CLASSES = ("BaseModel", "ConfigDict", "Field", "Optional", "Decimal")
+    
+    TYPES = {
+        "INT": "int", "INTEGER": "int", "BIGINT": "int", "SMALLINT": "int",
+        "VARCHAR": "str", "CHAR": "str", "TEXT": "str", "FLOAT": "float",
+        "BOOLEAN": "bool", "DATE": "date", "DATETIME": "datetime",
+        "DECIMAL": "Decimal", "NUMERIC": "Decimal",
+    }
+    
+    def generate_table(self, table: Table, schema: Schema) -> str:
+        fks = foreign_keys(schema, table)
+        imports = set()
+        uses_field = False
+        body = []
+        for attr in table.attributes:
+            py_type = self.TYPES.get(base_type(attr.data_type), "str")
+            if py_type in ("date", "datetime"):
+                imports.add(f"from datetime import {py_type}")
+            elif py_type == "Decimal":
+                imports.add("from decimal import Decimal")
+            
+            options = []
+            length, _ = type_args(attr.data_type)
+            if py_type == "str" and length:
+                options.append(f"max_length={length}")
+            identifier = python_identifier(attr.name)
+            if identifier != attr.name:
+                options.append(f'alias="{attr.name}"')
+            if attr.name in fks:
+                rel = fks[attr.name]
+                options.append(f'description="References {rel.from_table}.{rel.from_key}"')
+            
+            annotation = py_type
+            if attr.is_nullable and not attr.is_primary_key:
+                annotation = f"Optional[{py_type}]"
+                options.insert(0, "default=None")
+            if options:
+                uses_field = True
+                body.append(f"    {identifier}: {annotation} = Field({', '.join(options)})")
+            elif annotation.startswith("Optional"):
+                body.append(f"    {identifier}: {annotation} = None")
+            else:
+                body.append(f"    {identifier}: {annotation}")
+        
+        if any(a.is_nullable and not a.is_primary_key for a in table.attributes):
+            imports.add("from typing import Optional")
+        lines = ['"""' + f"Table {table.name}" + '"""', ""]
+        lines += sorted(imports)
+        lines += [
+            "",
+            "from pydantic import BaseModel, ConfigDict" + (", Field" if uses_field else ""),
+            "",
+            "",
+            f"class {self.class_for(table.name)}(BaseModel):",
+            "    model_config = ConfigDict(populate_by_name=True)",
+            "",
+        ]
+        return "\n".join(lines + body + [""])
+
+
+# =============================================================================
+# INCREMENTAL OUTPUT
+# =============================================================================
+
+@dataclass
+class GenerationResult:
+    """Files touched by one generation run, relative to the output directory"""
+    written: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    
+    def summary(self) -> str:
+        return (f"{len(self.written)} file(s) written, {len(self.unchanged)} unchanged, "
+                f"{len(self.removed)} removed")
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: str, content: str):
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".codegen-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def generate_code(schema: Schema, output_dir: str, backend: str) -> GenerationResult:
+    """Generate backend's models for schema into output_dir
+
+    A file is only written when its content hash differs from the one
+    recorded in the manifest (or it is missing on disk), so unchanged
+    modules keep their modification time. Files generated previously
+    for tables that no longer exist are deleted.
+    """
+    generator = get_generator(backend)
+    files = generator.generate(schema)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    previous: Dict[str, str] = {}
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        if manifest.get("generator") == generator.name and manifest.get("version") == generator.VERSION:
+            previous = manifest.get("files", {})
+    except (OSError, ValueError):
+        pass
+    
+    result = GenerationResult()
+    hashes = {}
+    for relative_path, content in sorted(files.items()):
+        digest = content_hash(content)
+        hashes[relative_path] = digest
+        path = os.path.join(output_dir, relative_path)
+        if previous.get(relative_path) == digest and os.path.exists(path):
+            result.unchanged.append(relative_path)
+            continue
+        _write_atomic(path, content)
+        result.written.append(relative_path)
+    
+    for relative_path in sorted(set(previous) - set(files)):
+        path = os.path.join(output_dir, relative_path)
+        if os.path.exists(path):
+            os.remove(path)
+            result.removed.append(relative_path)
+    
+    _write_atomic(manifest_path, json.dumps(
+        {"generator": generator.name, "version": generator.VERSION, "files": hashes},
+        indent=2, sort_keys=True
+    ))
+    return result
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate model code from a schema")
+    parser.add_argument("schema", nargs="?", help="schema JSON file saved by the designer")
+    parser.add_argument("output", nargs="?", help="output package directory")
+    parser.add_argument("--backend", choices=sorted(GENERATORS), default="sqlalchemy")
+    parser.add_argument("--list", action="store_true", help="list the available backends")
+    args = parser.parse_args(argv)
+    
+    if args.list:
+        for name, cls in sorted(GENERATORS.items()):
+            print(f"{name:12} {cls.description}")
+        return 0
+    if not args.schema or not args.output:
+        parser.error("schema and output are required")
+    
+    with open(args.schema, 'r') as f:
+        schema = Schema.from_dict(json.load(f))
+    try:
+        result = generate_code(schema, args.output, args.backend)
+    except CodeGenerationError as e:
+        print(f"Generation failed: {e}", file=sys.stderr)
+        return 1
+    print(f"{args.backend}: {result.summary()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
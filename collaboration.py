@@ -0,0 +1,414 @@
+"""
+Database Schema Designer - Collaboration Server
+University of Jijel - IHM Module
+
+This module lets several designers edit one schema at the same time.
+Clients exchange compact operation messages (one JSON object per line
+over TCP) instead of whole schemas: add/remove a table, replace the
+attributes of a table, add a relationship, move tables and subject area
+nodes, replace the subject areas (assigning, detecting, collapsing or
+expanding them), clear.
+
+The bundled asyncio server keeps the authoritative copy of the schema.
+It sends a snapshot to every client that joins, applies each operation
+it receives, acknowledges it to its sender and relays it to the other
+clients, all through the same ordered streams. An operation that does
+not apply (e.g. two users adding the same table at once) is answered
+with an error and a fresh snapshot so the sender resynchronises.
+
+Clients apply their own edits at once and keep them in a ClientSession
+until acknowledged. An operation of another client arriving meanwhile
+was ordered first by the server, so the session applies it and then
+replays the pending local ones on top: every copy ends up applying
+operations in the server's order, e.g. the last of two concurrent
+moves of a table wins everywhere.
+
+Usage:
+    python collaboration.py --port 8765 schema.json
+"""
+
+import sys
+import json
+import asyncio
+import argparse
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from models import Schema, Table, Attribute, Relationship, SubjectArea
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+MAX_PENDING_BYTES = 16 * 1024 * 1024  # clients that fall further behind are dropped
+
+# Operations changing the schema; "snapshot", "sync", "ack" and "error" are control messages
+OPERATIONS = ("add_table", "remove_table", "set_attributes", "add_relationship", "move",
+              "subject_areas", "clear")
+
+
+class OperationError(Exception):
+    """Raised when an operation does not apply to the schema"""
+
+
+# =============================================================================
+# PROTOCOL
+# =============================================================================
+
+def encode(message: dict) -> bytes:
+    """One message as a line of compact JSON"""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode(line: bytes) -> dict:
+    message = json.loads(line)
+    if not isinstance(message, dict) or "op" not in message:
+        raise OperationError("Malformed message")
+    return message
+
+
+def add_table_op(table: Table) -> dict:
+    return {"op": "add_table", "table": table.to_dict()}
+
+
+def remove_table_op(table_name: str) -> dict:
+    return {"op": "remove_table", "name": table_name}
+
+
+def set_attributes_op(table: Table) -> dict:
+    return {"op": "set_attributes", "name": table.name,
+            "attributes": [a.to_dict() for a in table.attributes]}
+
+
+def add_relationship_op(rel: Relationship) -> dict:
+    return {"op": "add_relationship", "relationship": rel.to_dict()}
+
+
+def move_op(positions: Dict[str, Tuple[float, float]],
+            areas: Optional[Dict[str, Tuple[float, float]]] = None) -> dict:
+    message = {"op": "move", "positions": {name: [x, y] for name, (x, y) in positions.items()}}
+    if areas:
+        message["areas"] = {name: [x, y] for name, (x, y) in areas.items()}
+    return message
+
+
+def subject_areas_op(schema: Schema) -> dict:
+    """All subject areas; small enough to resend whole after any area edit"""
+    return {"op": "subject_areas", "areas": [a.to_dict() for a in schema.subject_areas.values()]}
+
+
+def snapshot_op(schema: Schema) -> dict:
+    return {"op": "snapshot", "schema": schema.to_dict()}
+
+
+@dataclass
+class Change:
+    """What an operation changed, so views can refresh only that"""
+    reset: bool = False  # the whole schema was replaced or cleared
+    tables: Set[str] = field(default_factory=set)  # added or edited
+    added: Set[str] = field(default_factory=set)  # subset of tables that are new
+    removed: Set[str] = field(default_factory=set)
+    relationships: List[Relationship] = field(default_factory=list)
+    moved: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    areas: bool = False  # the subject areas were replaced
+    moved_areas: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    
+    def update(self, other: "Change"):
+        """Add the effects of a later operation"""
+        self.reset = self.reset or other.reset
+        self.tables |= other.tables
+        self.added |= other.added
+        self.removed = (self.removed - other.added) | other.removed
+        self.relationships.extend(other.relationships)
+        self.moved.update(other.moved)
+        self.areas = self.areas or other.areas
+        self.moved_areas.update(other.moved_areas)
+
+
+def apply_operation(schema: Schema, message: dict) -> Change:
+    """Apply one operation (or a snapshot) to schema in place
+
+    Removing a missing table, re-adding an existing relationship and
+    moving a missing table are no-ops; anything else that does not fit
+    the schema raises OperationError and leaves it unchanged.
+    """
+    op = message.get("op")
+    change = Change()
+    try:
+        if op == "snapshot":
+            loaded = Schema.from_dict(message["schema"])
+            schema.name = loaded.name
+            schema.tables = loaded.tables
+            schema.relationships = loaded.relationships
+            schema.clear_subject_areas()
+            for area in loaded.subject_areas.values():
+                schema.add_subject_area(area)
+            change.reset = True
+        
+        elif op == "clear":
+            schema.tables.clear()
+            schema.relationships.clear()
+            schema.clear_subject_areas()
+            change.reset = True
+        
+        elif op == "add_table":
+            table = Table.from_dict(message["table"])
+            if table.name in schema.tables:
+                raise OperationError(f"Table '{table.name}' already exists")
+            schema.add_table(table)
+            change.tables.add(table.name)
+            change.added.add(table.name)
+        
+        elif op == "remove_table":
+            if message["name"] in schema.tables:
+                schema.remove_table(message["name"])
+                change.removed.add(message["name"])
+        
+        elif op == "set_attributes":
+            table = schema.tables.get(message["name"])
+            if table is None:
+                raise OperationError(f"Table '{message['name']}' does not exist")
+            table.attributes = [Attribute.from_dict(a) for a in message["attributes"]]
+            change.tables.add(table.name)
+        
+        elif op == "add_relationship":
+            rel = Relationship.from_dict(message["relationship"])
+            for table_name in (rel.from_table, rel.to_table):
+                if table_name not in schema.tables:
+                    raise OperationError(f"Table '{table_name}' does not exist")
+            if rel not in schema.relationships:
+                schema.add_relationship(rel)
+                change.relationships.append(rel)
+        
+        elif op == "move":
+            positions, areas = message["positions"], message.get("areas", {})
+            if not isinstance(positions, dict) or not isinstance(areas, dict):
+                raise ValueError("positions must be an object")
+            moves = [(float(x), float(y)) for x, y in positions.values()]
+            area_moves = [(float(x), float(y)) for x, y in areas.values()]
+            for table_name, (x, y) in zip(positions, moves):
+                table = schema.tables.get(table_name)
+                if table is not None:
+                    table.x, table.y = x, y
+                    change.moved[table_name] = (x, y)
+            for area_name, (x, y) in zip(areas, area_moves):
+                area = schema.subject_areas.get(area_name)
+                if area is not None:
+                    area.x, area.y = x, y
+                    change.moved_areas[area_name] = (x, y)
+        
+        elif op == "subject_areas":
+            areas = [SubjectArea.from_dict(a) for a in message["areas"]]
+            for area in areas:
+                area.x, area.y, area.collapsed = float(area.x), float(area.y), bool(area.collapsed)
+            schema.clear_subject_areas()
+            for area in areas:
+                # Tables removed meanwhile by another client are dropped
+                area.tables = [t for t in dict.fromkeys(area.tables) if t in schema.tables]
+                if area.tables:
+                    schema.add_subject_area(area)
+            change.areas = True
+        
+        else:
+            raise OperationError(f"Unknown operation '{op}'")
+    except (KeyError, TypeError, ValueError, AttributeError) as e:
+        raise OperationError(f"Invalid '{op}' message: {e}") from e
+    return change
+
+
+class ClientSession:
+    """Client side of the ordering: local operations wait for their ack
+
+    The owner applies an edit to schema itself, then passes the message
+    to local() before sending it. Everything the server sends goes
+    through receive(), which returns what changed in schema.
+    """
+    
+    def __init__(self, schema: Schema):
+        self.schema = schema
+        self.pending: List[dict] = []
+        self.next_id = 1
+    
+    def local(self, message: dict) -> dict:
+        """Number a local operation and remember it until acknowledged"""
+        message = dict(message, id=self.next_id)
+        self.next_id += 1
+        self.pending.append(message)
+        return message
+    
+    def receive(self, message: dict) -> Change:
+        """Apply a message of the server; raises OperationError if our copy diverged"""
+        op = message["op"]
+        if op == "ack":
+            if self.pending and self.pending[0]["id"] == message.get("id"):
+                self.pending.pop(0)
+            return Change()
+        if op == "error":
+            # The rejected operation is undone by the snapshot that follows
+            self.pending = [m for m in self.pending if m["id"] != message.get("id")]
+            return Change()
+        
+        # A snapshot or another client's operation, ordered before our pending ones
+        change = apply_operation(self.schema, message)
+        for pending in self.pending:
+            try:
+                change.update(apply_operation(self.schema, pending))
+            except OperationError:
+                pass  # the server rejects it too and sends a snapshot
+        return change
+
+
+# =============================================================================
+# SERVER
+# =============================================================================
+
+class CollaborationServer:
+    """Holds the shared schema and relays operations between clients"""
+    
+    def __init__(self, schema: Optional[Schema] = None, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.schema = schema if schema is not None else Schema()
+        self.host = host
+        self.port = port
+        self.clients: Set[asyncio.StreamWriter] = set()
+        
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._serve_task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self.handle_client, self.host, self.port, limit=MAX_MESSAGE_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]  # resolves port 0
+    
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+    
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.clients.add(writer)
+        writer.write(encode(snapshot_op(self.schema)))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.handle_line(line, writer)
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass  # oversized line or lost connection: drop the client
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+    
+    def handle_line(self, line: bytes, sender: asyncio.StreamWriter):
+        """Apply a client's operation, acknowledge and relay it, or resynchronise the client"""
+        message = {}
+        try:
+            message = decode(line)
+            if message["op"] == "sync":
+                sender.write(encode(snapshot_op(self.schema)))
+                return
+            if message["op"] not in OPERATIONS:
+                raise OperationError(f"Unknown operation '{message['op']}'")
+            apply_operation(self.schema, message)
+        except (OperationError, json.JSONDecodeError, UnicodeDecodeError) as e:
+            sender.write(encode({"op": "error", "id": message.get("id"), "message": str(e)}))
+            sender.write(encode(snapshot_op(self.schema)))
+            return
+        sender.write(encode({"op": "ack", "id": message.get("id")}))
+        self.broadcast(line if line.endswith(b"\n") else line + b"\n", sender)
+    
+    def broadcast(self, data: bytes, sender: Optional[asyncio.StreamWriter] = None):
+        for writer in list(self.clients):
+            if writer is sender:
+                continue
+            if writer.transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+                self.clients.discard(writer)
+                writer.close()
+                continue
+            writer.write(data)
+    
+    # ----- Running next to the GUI -----
+    
+    def start_in_thread(self):
+        """Serve on a background thread; returns once listening or raises OSError"""
+        ready = threading.Event()
+        failure: List[BaseException] = []
+        
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.start())
+            except OSError as e:
+                failure.append(e)
+                ready.set()
+                self._loop.close()
+                return
+            ready.set()
+            self._serve_task = self._loop.create_task(self.serve_forever())
+            try:
+                self._loop.run_until_complete(self._serve_task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                self._loop.close()
+        
+        self._thread = threading.Thread(target=run, name="collaboration-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            raise failure[0]
+    
+    def stop(self):
+        """Stop a server started with start_in_thread()"""
+        if self._thread is None:
+            return
+        
+        def shutdown():
+            # Closed connections end their handlers with EOF
+            for writer in list(self.clients):
+                writer.close()
+            self._serve_task.cancel()
+        
+        self._loop.call_soon_threadsafe(shutdown)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a schema for collaborative editing")
+    parser.add_argument("schema", nargs="?", help="schema JSON file to start from")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+    
+    schema = Schema()
+    if args.schema:
+        with open(args.schema, 'r') as f:
+            schema = Schema.from_dict(json.load(f))
+    
+    server = CollaborationServer(schema, args.host, args.port)
+    
+    async def run():
+        await server.start()
+        print(f"Serving '{schema.name}' on {server.host}:{server.port}")
+        await server.serve_forever()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+"""
+Database Schema Designer - Collaboration Client
+University of Jijel - IHM Module
+
+This module connects the designer to a collaboration server with a
+QTcpSocket, so no thread is needed: operations are sent as they happen
+and received operations are emitted as signals on the GUI thread.
+
+Table and subject area moves are throttled: positions are collected
+while the user drags and sent as one "move" operation at most every
+MOVE_INTERVAL_MS, with only the latest position of each item.
+
+Once the shared schema is known, the owner sets session; operations
+sent from then on are numbered and kept there until acknowledged.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtNetwork import QAbstractSocket, QTcpSocket
+
+from collaboration import encode, decode, move_op, ClientSession, OperationError, MAX_MESSAGE_BYTES
+
+
+MOVE_INTERVAL_MS = 50
+
+
+class CollaborationClient(QObject):
+    """Line-based JSON connection to a CollaborationServer"""
+    
+    connected = Signal()
+    disconnected = Signal()
+    message_received = Signal(dict)
+    error = Signal(str)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.host = ""
+        self.port = 0
+        self._buffer = b""
+        self._pending_moves: Dict[str, Tuple[float, float]] = {}
+        self._pending_area_moves: Dict[str, Tuple[float, float]] = {}
+        self.session: Optional[ClientSession] = None
+        
+        self.socket = QTcpSocket(self)
+        self.socket.connected.connect(self.connected)
+        self.socket.disconnected.connect(self.on_disconnected)
+        self.socket.readyRead.connect(self.on_ready_read)
+        self.socket.errorOccurred.connect(self.on_error)
+        
+        self.move_timer = QTimer(self)
+        self.move_timer.setSingleShot(True)
+        self.move_timer.setInterval(MOVE_INTERVAL_MS)
+        self.move_timer.timeout.connect(self.flush_moves)
+    
+    @property
+    def is_connected(self) -> bool:
+        return self.socket.state() == QAbstractSocket.ConnectedState
+    
+    def connect_to(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._buffer = b""
+        self._pending_moves.clear()
+        self._pending_area_moves.clear()
+        self.session = None
+        self.socket.connectToHost(host, port)
+    
+    def disconnect_from(self):
+        self.flush_moves()
+        self.socket.disconnectFromHost()
+    
+    # ----- Sending -----
+    
+    def send(self, message: dict):
+        """Send an operation now; queued moves go first to keep the order"""
+        if not self.is_connected:
+            return
+        self.flush_moves()
+        self._write(message)
+    
+    def request_sync(self):
+        """Ask for a fresh snapshot, e.g. after a remote operation did not apply"""
+        if self.is_connected:
+            self.socket.write(encode({"op": "sync"}))
+    
+    def queue_move(self, table_name: str, x: float, y: float):
+        """Remember a table position, sent with the next batch of moves"""
+        if not self.is_connected:
+            return
+        self._pending_moves[table_name] = (x, y)
+        if not self.move_timer.isActive():
+            self.move_timer.start()
+    
+    def queue_area_move(self, area_name: str, x: float, y: float):
+        """Remember the position of a collapsed subject area node"""
+        if not self.is_connected:
+            return
+        self._pending_area_moves[area_name] = (x, y)
+        if not self.move_timer.isActive():
+            self.move_timer.start()
+    
+    def flush_moves(self):
+        self.move_timer.stop()
+        if (self._pending_moves or self._pending_area_moves) and self.is_connected:
+            self._write(move_op(self._pending_moves, self._pending_area_moves))
+        self._pending_moves = {}
+        self._pending_area_moves = {}
+    
+    def _write(self, message: dict):
+        if self.session is not None:
+            message = self.session.local(message)
+        self.socket.write(encode(message))
+    
+    # ----- Receiving -----
+    
+    def on_ready_read(self):
+        self._buffer += bytes(self.socket.readAll())
+        *lines, self._buffer = self._buffer.split(b"\n")
+        if len(self._buffer) > MAX_MESSAGE_BYTES:
+            self.error.emit("Message from server too large")
+            self.socket.abort()
+            return
+        for line in lines:
+            if not line:
+                continue
+            try:
+                message = decode(line)
+            except (OperationError, ValueError) as e:
+                self.error.emit(f"Invalid message from server: {e}")
+                continue
+            self.message_received.emit(message)
+    
+    def on_disconnected(self):
+        self.move_timer.stop()
+        self._pending_moves = {}
+        self._pending_area_moves = {}
+        self.session = None
+        self.disconnected.emit()
+    
+    def on_error(self, socket_error):
+        if socket_error != QAbstractSocket.RemoteHostClosedError:
+            self.error.emit(self.socket.errorString())
@@ -94,12 +94,49 @@ class Relationship:
         )
 
 
+@dataclass
+class SubjectArea:
+    """Represents a named group of tables that can be collapsed into one node"""
+    name: str
+    tables: List[str] = field(default_factory=list)
+    collapsed: bool = False
+    x: float = 100
+    y: float = 100
+    
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "tables": list(self.tables),
+            "collapsed": self.collapsed,
+            "x": self.x,
+            "y": self.y
+        }
+    
+    @staticmethod
+    def from_dict(data):
+        return SubjectArea(
+            data["name"],
+            list(data.get("tables", [])),
+            data.get("collapsed", False),
+            data.get("x", 100),
+            data.get("y", 100)
+        )
+
+
 @dataclass
 class Schema:
     """Represents the complete database schema"""
     name: str = "MySchema"
     tables: Dict[str, Table] = field(default_factory=dict)
     relationships: List[Relationship] = field(default_factory=list)
+    subject_areas: Dict[str, SubjectArea] = field(default_factory=dict)
+    # Table name -> subject area name; change areas through the methods below
+    _area_of: Dict[str, str] = field(default_factory=dict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        for area in self.subject_areas.values():
+            for table_name in area.tables:
+                self._area_of[table_name] = area.name
     
     def add_table(self, table: Table):
         self.tables[table.name] = table
@@ -112,6 +149,43 @@ class Schema:
                 r for r in self.relationships
                 if r.from_table != table_name and r.to_table != table_name
             ]
+            self.remove_from_subject_area(table_name)
+    
+    def subject_area_of(self, table_name: str) -> Optional[SubjectArea]:
+        area_name = self._area_of.get(table_name)
+        return self.subject_areas.get(area_name) if area_name is not None else None
+    
+    def add_subject_area(self, area: SubjectArea):
+        """Add a subject area with its tables, taking them out of their previous areas"""
+        for table_name in area.tables:
+            previous = self.subject_area_of(table_name)
+            if previous is not None and previous.name != area.name:
+                self.remove_from_subject_area(table_name)
+        self.subject_areas[area.name] = area
+        for table_name in area.tables:
+            self._area_of[table_name] = area.name
+    
+    def assign_to_subject_area(self, table_name: str, area_name: str):
+        """Move a table into a subject area, creating the area if needed"""
+        self.remove_from_subject_area(table_name)
+        area = self.subject_areas.get(area_name)
+        if area is None:
+            area = self.subject_areas[area_name] = SubjectArea(area_name)
+        area.tables.append(table_name)
+        self._area_of[table_name] = area_name
+    
+    def remove_from_subject_area(self, table_name: str):
+        """Remove a table from its subject area, dropping the area once empty"""
+        area = self.subject_area_of(table_name)
+        if area is not None:
+            area.tables.remove(table_name)
+            del self._area_of[table_name]
+            if not area.tables:
+                del self.subject_areas[area.name]
+    
+    def clear_subject_areas(self):
+        self.subject_areas.clear()
+        self._area_of.clear()
     
     def add_relationship(self, rel: Relationship):
         if rel not in self.relationships:
@@ -121,7 +195,8 @@ class Schema:
         return {
             "name": self.name,
             "tables": {k: v.to_dict() for k, v in self.tables.items()},
-            "relationships": [r.to_dict() for r in self.relationships]
+            "relationships": [r.to_dict() for r in self.relationships],
+            "subject_areas": {k: v.to_dict() for k, v in self.subject_areas.items()}
         }
     
     @staticmethod
@@ -129,4 +204,6 @@ class Schema:
         schema = Schema(data.get("name", "MySchema"))
         schema.tables = {k: Table.from_dict(v) for k, v in data.get("tables", {}).items()}
         schema.relationships = [Relationship.from_dict(r) for r in data.get("relationships", [])]
+        for area_data in data.get("subject_areas", {}).values():
+            schema.add_subject_area(SubjectArea.from_dict(area_data))
         return schema
@@ -0,0 +1,291 @@
+"""
+Database Schema Designer - Diagram Export
+University of Jijel - IHM Module
+
+This module exports the canvas (whole scene or the selected items) as
+PNG, SVG or PDF through QGraphicsScene.render. Large PNG images are
+rendered in horizontal bands whose height is chosen from a memory
+budget; each band is deflated on a thread pool and the compressed
+bands are streamed to the file in order, so memory stays bounded by
+the band size whatever the size of the image.
+
+Usage:
+    python export.py schema.json diagram.png --scale 2
+    python export.py schema.json diagram.svg
+"""
+
+import os
+import sys
+import json
+import zlib
+import struct
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import List, Optional
+
+from PySide6.QtWidgets import QGraphicsScene
+from PySide6.QtCore import Qt, QRectF, QSizeF, QMarginsF
+from PySide6.QtGui import QImage, QPainter, QColor, QPageSize, QPageLayout, QPdfWriter
+from PySide6.QtSvg import QSvgGenerator
+
+from models import Schema
+
+
+FORMATS = ("png", "svg", "pdf")
+
+DEFAULT_MARGIN = 20
+DEFAULT_TILE_BYTES = 16 * 1024 * 1024
+DEFAULT_COMPRESSION = 6
+BACKGROUND = QColor("#FFFFFF")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+ZLIB_HEADER = b"\x78\x9c"  # deflate, 32K window, default compression
+
+
+class ExportError(Exception):
+    """Raised when a diagram cannot be exported"""
+
+
+# =============================================================================
+# SOURCE AREA
+# =============================================================================
+
+def export_rect(scene: QGraphicsScene, selected_only: bool = False,
+                margin: float = DEFAULT_MARGIN) -> QRectF:
+    """Scene area to export: every item, or only the selected ones"""
+    if selected_only:
+        rect = QRectF()
+        for item in scene.selectedItems():
+            rect = rect.united(item.sceneBoundingRect())
+    else:
+        rect = scene.itemsBoundingRect()
+    if rect.isEmpty():
+        raise ExportError("Nothing to export")
+    return rect.adjusted(-margin, -margin, margin, margin)
+
+
+@contextmanager
+def rendering_state(scene: QGraphicsScene, selected_only: bool = False):
+    """Hide unselected items (if asked) and selection outlines while rendering
+
+    A line stays visible when both of its endpoints are selected.
+    """
+    selected = scene.selectedItems()
+    hidden = []
+    if selected_only:
+        chosen = set(selected)
+        for item in scene.items():
+            if item.parentItem() is not None or not item.isVisible() or item in chosen:
+                continue
+            from_item = getattr(item, "from_item", None)
+            to_item = getattr(item, "to_item", None)
+            if from_item in chosen and to_item in chosen:
+                continue
+            item.setVisible(False)
+            hidden.append(item)
+    scene.clearSelection()
+    try:
+        yield
+    finally:
+        for item in hidden:
+            item.setVisible(True)
+        for item in selected:
+            item.setSelected(True)
+
+
+def _render(scene: QGraphicsScene, painter: QPainter, target: QRectF, source: QRectF):
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+    scene.render(painter, target, source, Qt.IgnoreAspectRatio)
+
+
+# =============================================================================
+# VECTOR FORMATS
+# =============================================================================
+
+def export_svg(scene: QGraphicsScene, file_path: str, selected_only: bool = False,
+               margin: float = DEFAULT_MARGIN):
+    """Write the scene as an SVG document (one scene unit = one SVG unit)"""
+    source = export_rect(scene, selected_only, margin)
+    target = QRectF(0, 0, source.width(), source.height())
+    
+    generator = QSvgGenerator()
+    generator.setFileName(file_path)
+    generator.setSize(target.size().toSize())
+    generator.setViewBox(target)
+    generator.setTitle(os.path.splitext(os.path.basename(file_path))[0])
+    generator.setDescription("Database Schema Designer diagram")
+    
+    with rendering_state(scene, selected_only):
+        painter = QPainter()
+        if not painter.begin(generator):
+            raise ExportError(f"Cannot write {file_path}")
+        try:
+            _render(scene, painter, target, source)
+        finally:
+            painter.end()
+
+
+def export_pdf(scene: QGraphicsScene, file_path: str, selected_only: bool = False,
+               margin: float = DEFAULT_MARGIN):
+    """Write the scene as a one-page PDF sized to the diagram"""
+    source = export_rect(scene, selected_only, margin)
+    
+    writer = QPdfWriter(file_path)
+    writer.setTitle(os.path.splitext(os.path.basename(file_path))[0])
+    writer.setCreator("Database Schema Designer")
+    writer.setResolution(72)  # one scene unit = one point
+    writer.setPageLayout(QPageLayout(
+        QPageSize(QSizeF(source.width(), source.height()), QPageSize.Point),
+        QPageLayout.Portrait,
+        QMarginsF(0, 0, 0, 0)
+    ))
+    
+    with rendering_state(scene, selected_only):
+        painter = QPainter()
+        if not painter.begin(writer):
+            raise ExportError(f"Cannot write {file_path}")
+        try:
+            target = QRectF(0, 0, writer.width(), writer.height())
+            _render(scene, painter, target, source)
+        finally:
+            painter.end()
+
+
+# =============================================================================
+# TILED PNG
+# =============================================================================
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _deflate_band(raw: bytes, level: int, last: bool) -> bytes:
+    """Raw-deflate one band so that the bands can simply be concatenated
+
+    Every band but the last ends on a byte boundary (Z_SYNC_FLUSH); the
+    last one closes the stream. zlib releases the GIL, so bands are
+    compressed in parallel.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(raw) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def _scanlines(image: QImage, width: int, rows: int) -> bytes:
+    """PNG scanlines (filter type 0) of the first rows of an RGB888 image"""
+    stride = image.bytesPerLine()
+    row_bytes = width * 3
+    bits = memoryview(image.constBits())
+    filter_byte = b"\x00"
+    return b"".join(filter_byte + bits[y * stride:y * stride + row_bytes] for y in range(rows))
+
+
+def export_png(scene: QGraphicsScene, file_path: str, selected_only: bool = False,
+               margin: float = DEFAULT_MARGIN, scale: float = 1.0,
+               tile_bytes: int = DEFAULT_TILE_BYTES, workers: Optional[int] = None,
+               compression: int = DEFAULT_COMPRESSION):
+    """Write the scene as a PNG image, rendered and compressed band by band
+
+    Rendering stays on the calling thread (QGraphicsScene is not thread
+    safe); at most two bands per worker are in flight at any time.
+    """
+    source = export_rect(scene, selected_only, margin)
+    width = max(1, round(source.width() * scale))
+    height = max(1, round(source.height() * scale))
+    if width > 0x7FFFFFFF or height > 0x7FFFFFFF:
+        raise ExportError(f"Image too large: {width} x {height}")
+    band_height = max(1, min(height, tile_bytes // (width * 3)))
+    workers = workers or os.cpu_count() or 1
+    
+    image = QImage(width, band_height, QImage.Format_RGB888)
+    if image.isNull():
+        raise ExportError(f"Cannot allocate a {width} x {band_height} band")
+    
+    with open(file_path, "wb") as f, ThreadPoolExecutor(max_workers=workers) as pool, \
+            rendering_state(scene, selected_only):
+        f.write(PNG_SIGNATURE)
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(_png_chunk(b"IDAT", ZLIB_HEADER))
+        
+        adler = 1
+        pending = deque()
+        for top in range(0, height, band_height):
+            rows = min(band_height, height - top)
+            image.fill(BACKGROUND)
+            painter = QPainter(image)
+            try:
+                _render(
+                    scene, painter,
+                    QRectF(0, 0, width, rows),
+                    QRectF(source.x(), source.y() + top / scale, source.width(), rows / scale)
+                )
+            finally:
+                painter.end()
+            
+            raw = _scanlines(image, width, rows)
+            adler = zlib.adler32(raw, adler)
+            pending.append(pool.submit(_deflate_band, raw, compression, top + rows >= height))
+            del raw
+            
+            while len(pending) >= 2 * workers:
+                f.write(_png_chunk(b"IDAT", pending.popleft().result()))
+        
+        while pending:
+            f.write(_png_chunk(b"IDAT", pending.popleft().result()))
+        f.write(_png_chunk(b"IDAT", struct.pack(">I", adler)))
+        f.write(_png_chunk(b"IEND", b""))
+
+
+def export_scene(scene: QGraphicsScene, file_path: str, selected_only: bool = False, **options):
+    """Export in the format given by the file extension"""
+    extension = os.path.splitext(file_path)[1].lower().lstrip(".")
+    if extension == "png":
+        export_png(scene, file_path, selected_only, **options)
+    elif extension == "svg":
+        export_svg(scene, file_path, selected_only, options.get("margin", DEFAULT_MARGIN))
+    elif extension == "pdf":
+        export_pdf(scene, file_path, selected_only, options.get("margin", DEFAULT_MARGIN))
+    else:
+        raise ExportError(f"Unsupported format '{extension}', use one of: {', '.join(FORMATS)}")
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export a schema diagram without opening a window")
+    parser.add_argument("schema", help="schema JSON file saved by the designer")
+    parser.add_argument("output", help="output file (.png, .svg or .pdf)")
+    parser.add_argument("--scale", type=float, default=1.0, help="PNG pixels per scene unit")
+    parser.add_argument("--margin", type=float, default=DEFAULT_MARGIN)
+    parser.add_argument("--tile-mb", type=int, default=DEFAULT_TILE_BYTES // (1024 * 1024),
+                        help="PNG band size in MiB (bounds memory use)")
+    parser.add_argument("--workers", type=int, help="PNG compression threads")
+    args = parser.parse_args(argv)
+    
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from graphics import build_scene
+    QApplication.instance() or QApplication(sys.argv[:1])  # needed to render text
+    
+    with open(args.schema, 'r') as f:
+        schema = Schema.from_dict(json.load(f))
+    scene, _, _ = build_scene(schema)
+    
+    options = {"margin": args.margin}
+    if args.output.lower().endswith(".png"):
+        options.update(scale=args.scale, tile_bytes=args.tile_mb * 1024 * 1024, workers=args.workers)
+    try:
+        export_scene(scene, args.output, **options)
+    except (ExportError, OSError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    print(f"Diagram exported: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
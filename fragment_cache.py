@@ -0,0 +1,242 @@
+"""
+Database Schema Designer - SQL Fragment Cache
+University of Jijel - IHM Module
+
+This module is a persistent cache of generated SQL fragments, shared by
+every designer session and command line run of the same user. Keys are
+content digests (see sql_generator.table_fragment_key), so a fragment
+is valid wherever the same table appears again.
+
+All fragments live in one SQLite database rather than one file each:
+a whole schema is looked up and stored in a few batched statements.
+SQLite's locking makes the database safe to use from concurrent
+processes, and a process that cannot open or write it (read-only home,
+lock held too long) simply carries on without the cache. The database
+is kept under a size limit by deleting the least recently used
+fragments. Setting SCHEMA_DESIGNER_CACHE_DIR to an empty string turns
+the cache off for the designer.
+
+Usage:
+    python fragment_cache.py generate schema.json -o schema.sql
+    python fragment_cache.py stats
+    python fragment_cache.py prune --max-mb 32
+    python fragment_cache.py clear
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SCHEMA_DESIGNER_CACHE_DIR",
+    os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                 "schema-designer")
+)
+DATABASE_NAME = "sql-fragments.sqlite3"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+PRUNE_TARGET = 0.9  # prune down to this fraction of max_bytes
+BUSY_TIMEOUT_S = 2.0  # wait at most this long for another process' write
+BATCH_SIZE = 500  # keys per statement, below SQLite's parameter limit
+
+
+class FragmentCache:
+    """Size-bounded LRU store of text fragments in a shared SQLite database"""
+    
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = os.path.join(directory, DATABASE_NAME)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._written_bytes = 0  # since the last size check
+        self._connection: Optional[sqlite3.Connection] = None
+        self._disabled = False
+    
+    @property
+    def connection(self) -> Optional[sqlite3.Connection]:
+        """The open database, or None once it failed"""
+        if self._connection is None and not self._disabled:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                # IMMEDIATE: writers queue on the busy timeout instead of failing
+                # when another process wrote since they started reading
+                connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_S, isolation_level="IMMEDIATE")
+                connection.execute("PRAGMA journal_mode=WAL")  # readers do not block the writer
+                connection.execute("PRAGMA synchronous=NORMAL")  # a lost fragment is regenerated
+                with connection:
+                    connection.execute(
+                        "CREATE TABLE IF NOT EXISTS fragments ("
+                        "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                        "size INTEGER NOT NULL, used REAL NOT NULL)"
+                    )
+                    connection.execute("CREATE INDEX IF NOT EXISTS fragments_used ON fragments (used)")
+                self._connection = connection
+            except (OSError, sqlite3.Error):
+                self._disabled = True
+        return self._connection
+    
+    def _failed(self):
+        """Stop using the database after an error; callers fall back to generating"""
+        if self._connection is not None:
+            self._connection.close()
+        self._connection = None
+        self._disabled = True
+    
+    # ----- Lookup -----
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, str]:
+        """Fragments of the keys that are cached, marked as recently used"""
+        keys = list(dict.fromkeys(keys))
+        connection = self.connection
+        if connection is None or not keys:
+            return {}
+        
+        found: Dict[str, str] = {}
+        now = time.time()
+        try:
+            with connection:
+                for start in range(0, len(keys), BATCH_SIZE):
+                    batch = keys[start:start + BATCH_SIZE]
+                    marks = ",".join("?" * len(batch))
+                    found.update(connection.execute(
+                        f"SELECT key, value FROM fragments WHERE key IN ({marks})", batch
+                    ))
+                    connection.execute(f"UPDATE fragments SET used = ? WHERE key IN ({marks})",
+                                       [now] + batch)
+        except sqlite3.Error:
+            self._failed()
+            return {}
+        
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+    
+    def put_many(self, fragments: Dict[str, str]):
+        """Store fragments in one transaction, pruning once enough was written"""
+        connection = self.connection
+        if connection is None or not fragments:
+            return
+        now = time.time()
+        try:
+            with connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO fragments (key, value, size, used) VALUES (?, ?, ?, ?)",
+                    [(key, value, len(key) + len(value), now) for key, value in fragments.items()]
+                )
+        except sqlite3.Error:
+            self._failed()
+            return
+        
+        self._written_bytes += sum(len(key) + len(value) for key, value in fragments.items())
+        if self._written_bytes > self.max_bytes // 4:
+            self._written_bytes = 0
+            self.prune()
+    
+    # ----- Maintenance -----
+    
+    def size(self) -> Tuple[int, int]:
+        """(number of fragments, total bytes) in the database"""
+        connection = self.connection
+        if connection is None:
+            return 0, 0
+        try:
+            count, total = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM fragments").fetchone()
+        except sqlite3.Error:
+            self._failed()
+            return 0, 0
+        return count, total
+    
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """Delete least recently used fragments until the cache fits; returns fragments deleted"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        _, total = self.size()
+        if total <= max_bytes:
+            return 0
+        
+        # Keep the most recently used fragments that fit in the target, in
+        # one statement so that it runs in a single write transaction
+        try:
+            with self.connection as connection:
+                return connection.execute(
+                    "DELETE FROM fragments WHERE key IN ("
+                    " SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY used DESC, key) AS kept"
+                    " FROM fragments) WHERE kept > ?)",
+                    (int(max_bytes * PRUNE_TARGET),)
+                ).rowcount
+        except sqlite3.Error:
+            self._failed()
+            return 0
+    
+    def clear(self) -> int:
+        return self.prune(0)
+    
+    def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+    
+    def stats(self) -> str:
+        count, total = self.size()
+        return (f"{self.path}: {count} fragment(s), {total / (1024 * 1024):.1f} MiB "
+                f"of {self.max_bytes / (1024 * 1024):.0f} MiB - "
+                f"{self.hits} hit(s), {self.misses} miss(es)")
+
+
+_shared_cache: Optional[FragmentCache] = None
+
+
+def shared_cache() -> Optional[FragmentCache]:
+    """The cache used by every document of this process
+
+    None when SCHEMA_DESIGNER_CACHE_DIR is set to an empty string.
+    """
+    global _shared_cache
+    if _shared_cache is None and DEFAULT_CACHE_DIR:
+        _shared_cache = FragmentCache()
+    return _shared_cache
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate SQL through, inspect or trim the SQL fragment cache")
+    parser.add_argument("command", choices=["generate", "stats", "prune", "clear"])
+    parser.add_argument("schema", nargs="?", help="schema JSON file (generate)")
+    parser.add_argument("-o", "--output", help="SQL file to write (generate, default: stdout)")
+    parser.add_argument("--dir", default=DEFAULT_CACHE_DIR, help="cache directory")
+    parser.add_argument("--max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024))
+    args = parser.parse_args(argv)
+    
+    cache = FragmentCache(args.dir, args.max_mb * 1024 * 1024)
+    if args.command == "generate":
+        if not args.schema:
+            parser.error("generate needs a schema file")
+        from models import Schema
+        from sql_generator import SQLFragments
+        with open(args.schema, 'r') as f:
+            schema = Schema.from_dict(json.load(f))
+        sql = SQLFragments(cache).generate_sql(schema)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(sql)
+        else:
+            sys.stdout.write(sql)
+        print(cache.stats(), file=sys.stderr)
+        return 0
+    if args.command == "prune":
+        print(f"{cache.prune()} fragment(s) deleted")
+    elif args.command == "clear":
+        print(f"{cache.clear()} fragment(s) deleted")
+    print(cache.stats())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
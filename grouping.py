@@ -0,0 +1,61 @@
+"""
+Database Schema Designer - Subject Area Detection
+University of Jijel - IHM Module
+
+This module proposes subject areas by community detection over the
+relationship graph (label propagation: every table repeatedly adopts
+the most common area among its neighbours until nothing changes).
+"""
+
+import random
+from collections import Counter
+from typing import Dict, List, Optional
+
+from models import Schema
+
+
+def detect_subject_areas(schema: Schema, min_size: int = 2, max_iterations: int = 50,
+                         seed: Optional[int] = 0) -> Dict[str, List[str]]:
+    """Group tables into communities of densely related tables
+
+    Returns a mapping of area name to table names. Each area is named
+    after its most connected table. Tables whose community is smaller
+    than min_size (e.g. tables without relationships) are left out.
+    """
+    rng = random.Random(seed)
+    neighbours: Dict[str, Counter] = {name: Counter() for name in schema.tables}
+    for rel in schema.relationships:
+        if rel.from_table in neighbours and rel.to_table in neighbours and rel.from_table != rel.to_table:
+            neighbours[rel.from_table][rel.to_table] += 1
+            neighbours[rel.to_table][rel.from_table] += 1
+    
+    labels = {name: name for name in neighbours}
+    order = [name for name, adjacent in neighbours.items() if adjacent]
+    
+    for _ in range(max_iterations):
+        rng.shuffle(order)
+        changed = False
+        for name in order:
+            weights = Counter()
+            for neighbour, count in neighbours[name].items():
+                weights[labels[neighbour]] += count
+            best = max(weights.values())
+            candidates = sorted(label for label, weight in weights.items() if weight == best)
+            if labels[name] in candidates:
+                continue  # keep the current label on ties so the process settles
+            labels[name] = rng.choice(candidates)
+            changed = True
+        if not changed:
+            break
+    
+    communities: Dict[str, List[str]] = {}
+    for name, label in labels.items():
+        communities.setdefault(label, []).append(name)
+    
+    areas: Dict[str, List[str]] = {}
+    for members in communities.values():
+        if len(members) < min_size:
+            continue
+        hub = max(members, key=lambda t: (sum(neighbours[t].values()), t))
+        areas[f"{hub} area"] = sorted(members)
+    return areas
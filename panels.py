@@ -0,0 +1,806 @@
+"""
+Database Schema Designer - Dock Panels
+University of Jijel - IHM Module
+
+This module contains the side panels of the main window: the SQL code
+viewer and the dockable tool panels (profiler statistics, schema
+metrics, minimap, ...).
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
+    QTableWidgetItem, QPushButton, QAbstractItemView, QHeaderView,
+    QPlainTextEdit, QTextEdit, QLabel, QComboBox, QCheckBox
+)
+from PySide6.QtCore import Qt, QTimer, QRectF, QPointF, Signal, QRegularExpression
+from PySide6.QtGui import (
+    QColor, QPainter, QFont, QSyntaxHighlighter, QTextCharFormat, QTextCursor,
+    QTextFormat, QPixmap, QPen
+)
+
+from profiling import PROFILER, LatencyHistogram
+from metrics import METRICS, SchemaMetrics
+from models import Schema
+from graphics import TableBlockItem, GroupNodeItem
+
+
+# =============================================================================
+# SQL CODE VIEWER
+# =============================================================================
+
+SQL_KEYWORDS = [
+    "CREATE", "TABLE", "ALTER", "ADD", "CONSTRAINT", "FOREIGN", "KEY",
+    "REFERENCES", "PRIMARY", "NOT", "NULL", "UNIQUE", "INDEX", "ON"
+]
+SQL_TYPES = [
+    "INT", "INTEGER", "BIGINT", "SMALLINT", "VARCHAR", "TEXT", "FLOAT",
+    "BOOLEAN", "DATE", "DATETIME", "DECIMAL"
+]
+
+
+def _make_format(color: str, bold: bool = False, italic: bool = False) -> QTextCharFormat:
+    fmt = QTextCharFormat()
+    fmt.setForeground(QColor(color))
+    if bold:
+        fmt.setFontWeight(QFont.Bold)
+    fmt.setFontItalic(italic)
+    return fmt
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    """Length of the common prefix, using slice comparisons instead of a char loop"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[lo:mid] == b[lo:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def _common_suffix_length(a: str, b: str, limit: int) -> int:
+    """Length of the common suffix, at most limit characters"""
+    lo, hi = 0, min(len(a), len(b), limit)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[len(a) - mid:len(a) - lo] == b[len(b) - mid:len(b) - lo]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+class SQLHighlighter(QSyntaxHighlighter):
+    """SQL syntax highlighter that only formats blocks near the viewport
+
+    Blocks outside the visible range are skipped (and marked unformatted)
+    when Qt asks for them; the viewer re-highlights them once they scroll
+    into view. Formatted blocks carry the HIGHLIGHTED block state.
+    """
+    
+    HIGHLIGHTED = 1
+    UNFORMATTED = -1
+    
+    def __init__(self, document):
+        super().__init__(document)
+        self.first_block = 0
+        self.last_block = -1
+        self.rules = [
+            (QRegularExpression(r"\b(" + "|".join(SQL_KEYWORDS) + r")\b"),
+             _make_format("#2E86AB", bold=True)),
+            (QRegularExpression(r"\b(" + "|".join(SQL_TYPES) + r")\b(\([0-9, ]*\))?"),
+             _make_format("#6A994E")),
+            (QRegularExpression(r"--[^\n]*"), _make_format("#888888", italic=True)),
+        ]
+    
+    def set_visible_range(self, first_block: int, last_block: int):
+        self.first_block = first_block
+        self.last_block = last_block
+    
+    def highlightBlock(self, text: str):
+        number = self.currentBlock().blockNumber()
+        if number < self.first_block or number > self.last_block:
+            self.setCurrentBlockState(self.UNFORMATTED)
+            return
+        
+        for pattern, fmt in self.rules:
+            matches = pattern.globalMatch(text)
+            while matches.hasNext():
+                match = matches.next()
+                self.setFormat(match.capturedStart(), match.capturedLength(), fmt)
+        self.setCurrentBlockState(self.HIGHLIGHTED)
+
+
+class SQLCodeView(QPlainTextEdit):
+    """Read-only SQL viewer for very large generated scripts
+
+    set_sql() only replaces the part of the document that differs from
+    the previous script, so small schema edits keep the scroll position
+    and the highlighting of unchanged lines.
+    """
+    
+    # Extra blocks highlighted above and below the viewport, as a fraction of a page
+    HIGHLIGHT_MARGIN = 1.0
+    
+    table_activated = Signal(str)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.setFont(QFont("Courier", 9))
+        self._text = ""
+        
+        self.highlighter = SQLHighlighter(self.document())
+        
+        # Coalesce scroll/resize bursts into one highlighting pass
+        self.highlight_timer = QTimer(self)
+        self.highlight_timer.setSingleShot(True)
+        self.highlight_timer.setInterval(0)
+        self.highlight_timer.timeout.connect(self.highlight_visible_blocks)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_highlight)
+    
+    def set_sql(self, text: str):
+        """Show a new script, editing only the changed range of the document"""
+        old = self._text
+        if text == old:
+            return
+        self._text = text
+        
+        # QTextDocument positions count UTF-16 code units; the diff works in
+        # code points, so only take the fast path for ASCII scripts
+        if not old or not (text.isascii() and old.isascii()):
+            self.setPlainText(text)
+        else:
+            prefix = _common_prefix_length(old, text)
+            suffix = _common_suffix_length(old, text, min(len(old), len(text)) - prefix)
+            cursor = QTextCursor(self.document())
+            cursor.setPosition(prefix)
+            cursor.setPosition(len(old) - suffix, QTextCursor.KeepAnchor)
+            cursor.insertText(text[prefix:len(text) - suffix])
+        self.schedule_highlight()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_highlight()
+    
+    def schedule_highlight(self, *args):
+        """Highlight the visible blocks once control returns to the event loop"""
+        # No argument: start(msec) would take a scroll position as the interval
+        self.highlight_timer.start()
+    
+    def highlight_visible_blocks(self):
+        """Highlight the blocks in and around the viewport that are not formatted yet"""
+        block = self.firstVisibleBlock()
+        if not block.isValid():
+            return
+        first = block.blockNumber()
+        offset = self.contentOffset()
+        bottom = self.viewport().height()
+        last = first
+        while block.isValid() and self.blockBoundingGeometry(block).translated(offset).top() <= bottom:
+            last = block.blockNumber()
+            block = block.next()
+        
+        margin = int((last - first + 1) * self.HIGHLIGHT_MARGIN)
+        first = max(0, first - margin)
+        last = last + margin
+        self.highlighter.set_visible_range(first, last)
+        
+        block = self.document().findBlockByNumber(first)
+        while block.isValid() and block.blockNumber() <= last:
+            if block.userState() != SQLHighlighter.HIGHLIGHTED:
+                self.highlighter.rehighlightBlock(block)
+            block = block.next()
+    
+    def jump_to_table(self, table_name: str) -> bool:
+        """Scroll to the CREATE TABLE statement of a table and mark its line"""
+        name = QRegularExpression.escape(table_name)
+        pattern = QRegularExpression(f"^(CREATE TABLE {name} \\(|-- Table {name} has)")
+        cursor = self.document().find(pattern)
+        if cursor.isNull():
+            return False
+        
+        cursor.movePosition(QTextCursor.StartOfBlock)
+        self.setTextCursor(cursor)
+        self.centerCursor()
+        
+        selection = QTextEdit.ExtraSelection()
+        selection.format.setBackground(QColor("#FFF3C4"))
+        selection.format.setProperty(QTextFormat.FullWidthSelection, True)
+        selection.cursor = cursor
+        self.setExtraSelections([selection])
+        return True
+    
+    def table_at_cursor(self) -> Optional[str]:
+        """Name of the table whose statement contains the text cursor"""
+        block = self.textCursor().block()
+        while block.isValid():
+            words = block.text().split()
+            if len(words) >= 3 and words[0] in ("CREATE", "ALTER") and words[1] == "TABLE":
+                return words[2]
+            if len(words) >= 2 and words[0] == "--" and words[1] == "Table":
+                return words[2] if len(words) > 2 else None
+            if block.text().startswith(");"):
+                return None
+            block = block.previous()
+        return None
+    
+    def mouseDoubleClickEvent(self, event):
+        super().mouseDoubleClickEvent(event)
+        table_name = self.table_at_cursor()
+        if table_name:
+            self.table_activated.emit(table_name)
+
+
+# =============================================================================
+# DOCK PANELS
+# =============================================================================
+
+
+class HistogramWidget(QWidget):
+    """Bar chart of one latency histogram"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.histogram = None
+        self.setMinimumHeight(120)
+    
+    def set_histogram(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#FFFFFF"))
+        if not self.histogram or not self.histogram.count:
+            painter.drawText(self.rect(), Qt.AlignCenter, "No samples")
+            return
+        
+        buckets = self.histogram.buckets
+        used = [i for i, b in enumerate(buckets) if b]
+        first, last = used[0], used[-1]
+        peak = max(buckets)
+        label_height = 14
+        bar_width = self.width() / (last - first + 1)
+        painter.setFont(QFont("Arial", 7))
+        
+        for slot, index in enumerate(range(first, last + 1)):
+            height = (self.height() - label_height) * buckets[index] / peak
+            bar = QRectF(slot * bar_width + 1, self.height() - label_height - height,
+                         bar_width - 2, height)
+            painter.fillRect(bar, QColor("#2E86AB"))
+            painter.drawText(QRectF(slot * bar_width, self.height() - label_height,
+                                    bar_width, label_height),
+                             Qt.AlignCenter, LatencyHistogram.bucket_label(index))
+
+
+class ProfilerDock(QDockWidget):
+    """Dock showing per-slot latency statistics collected by the profiler"""
+    
+    COLUMNS = ["Region", "Calls", "Mean (ms)", "p50 (ms)", "p95 (ms)", "Max (ms)"]
+    REFRESH_INTERVAL_MS = 500
+    
+    export_requested = Signal()
+    
+    def __init__(self, parent=None):
+        super().__init__("Profiler", parent)
+        self.setObjectName("ProfilerDock")
+        
+        widget = QWidget()
+        layout = QVBoxLayout()
+        
+        self.stats_table = QTableWidget(0, len(self.COLUMNS))
+        self.stats_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.stats_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.stats_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.stats_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.stats_table.itemSelectionChanged.connect(self.show_selected_histogram)
+        layout.addWidget(self.stats_table)
+        
+        self.histogram_view = HistogramWidget()
+        layout.addWidget(self.histogram_view)
+        
+        btn_layout = QHBoxLayout()
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        btn_layout.addWidget(reset_btn)
+        
+        export_btn = QPushButton("Export Trace...")
+        export_btn.clicked.connect(self.export_requested.emit)
+        btn_layout.addWidget(export_btn)
+        layout.addLayout(btn_layout)
+        
+        widget.setLayout(layout)
+        self.setWidget(widget)
+        
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_INTERVAL_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self.on_visibility_changed)
+    
+    def on_visibility_changed(self, visible: bool):
+        if visible:
+            self.refresh()
+            self.timer.start()
+        else:
+            self.timer.stop()
+    
+    def reset(self):
+        PROFILER.reset()
+        self.refresh()
+    
+    def refresh(self):
+        """Reload statistics from the profiler"""
+        histograms = PROFILER.snapshot()
+        selected = self.selected_region()
+        self.stats_table.setRowCount(len(histograms))
+        
+        ordered = sorted(histograms.items(), key=lambda kv: kv[1].total, reverse=True)
+        for row, (name, histogram) in enumerate(ordered):
+            values = [
+                name,
+                str(histogram.count),
+                f"{histogram.mean * 1000:.3f}",
+                f"{histogram.percentile(0.5) * 1000:.3f}",
+                f"{histogram.percentile(0.95) * 1000:.3f}",
+                f"{histogram.max * 1000:.3f}",
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.stats_table.setItem(row, column, item)
+            if name == selected:
+                self.stats_table.selectRow(row)
+        
+        self.histogram_view.set_histogram(histograms.get(selected))
+    
+    def selected_region(self):
+        rows = self.stats_table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        item = self.stats_table.item(rows[0].row(), 0)
+        return item.text() if item else None
+    
+    def show_selected_histogram(self):
+        self.histogram_view.set_histogram(PROFILER.snapshot().get(self.selected_region()))
+
+
+class BarChartWidget(QWidget):
+    """Labelled bar chart of a few counts"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.labels = []
+        self.counts = []
+        self.setMinimumHeight(120)
+    
+    def set_bars(self, labels, counts):
+        self.labels = list(labels)
+        self.counts = [int(c) for c in counts]
+        self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#FFFFFF"))
+        if not self.counts or not max(self.counts):
+            painter.drawText(self.rect(), Qt.AlignCenter, "No data")
+            return
+        
+        peak = max(self.counts)
+        label_height = 14
+        bar_width = self.width() / len(self.counts)
+        painter.setFont(QFont("Arial", 7))
+        
+        for slot, (label, count) in enumerate(zip(self.labels, self.counts)):
+            height = (self.height() - 2 * label_height) * count / peak
+            bar = QRectF(slot * bar_width + 1, self.height() - label_height - height,
+                         bar_width - 2, height)
+            painter.fillRect(bar, QColor("#2E86AB"))
+            painter.drawText(QRectF(slot * bar_width, bar.top() - label_height, bar_width, label_height),
+                             Qt.AlignCenter, str(count))
+            painter.drawText(QRectF(slot * bar_width, self.height() - label_height,
+                                    bar_width, label_height),
+                             Qt.AlignCenter, label)
+
+
+class MetricsDock(QDockWidget):
+    """Dock showing schema complexity metrics and the worst tables per metric"""
+    
+    COLUMNS = ["Table", "Value"]
+    TOP_TABLES = 50
+    
+    heatmap_changed = Signal()
+    table_activated = Signal(str)
+    
+    def __init__(self, parent=None):
+        super().__init__("Schema Metrics", parent)
+        self.setObjectName("MetricsDock")
+        self.metrics: Optional[SchemaMetrics] = None
+        
+        widget = QWidget()
+        layout = QVBoxLayout()
+        
+        self.summary_label = QLabel("No schema")
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+        
+        metric_layout = QHBoxLayout()
+        metric_layout.addWidget(QLabel("Metric:"))
+        self.metric_combo = QComboBox()
+        self.metric_combo.addItems(list(METRICS))
+        self.metric_combo.currentTextChanged.connect(self.on_metric_changed)
+        metric_layout.addWidget(self.metric_combo, 1)
+        self.heatmap_check = QCheckBox("Heatmap on canvas")
+        self.heatmap_check.toggled.connect(self.heatmap_changed.emit)
+        metric_layout.addWidget(self.heatmap_check)
+        layout.addLayout(metric_layout)
+        
+        self.distribution_view = BarChartWidget()
+        layout.addWidget(self.distribution_view)
+        
+        self.top_table = QTableWidget(0, len(self.COLUMNS))
+        self.top_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.top_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.top_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.top_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.top_table.itemClicked.connect(self.on_top_table_clicked)
+        layout.addWidget(self.top_table)
+        
+        self.types_label = QLabel("")
+        self.types_label.setWordWrap(True)
+        layout.addWidget(self.types_label)
+        
+        widget.setLayout(layout)
+        self.setWidget(widget)
+    
+    def heatmap_metric(self) -> Optional[str]:
+        """Metric used to colour the canvas, None when the heatmap is off"""
+        if self.isVisible() and self.heatmap_check.isChecked():
+            return self.metric_combo.currentText()
+        return None
+    
+    def set_metrics(self, metrics: Optional[SchemaMetrics]):
+        self.metrics = metrics
+        if metrics is None or not metrics.table_count:
+            self.summary_label.setText("No tables")
+            self.types_label.setText("")
+        else:
+            self.summary_label.setText("   ".join(f"{k}: {v}" for k, v in metrics.summary().items()))
+            types = sorted(zip(metrics.type_names, metrics.type_counts), key=lambda tc: -tc[1])
+            self.types_label.setText("Types: " + ", ".join(f"{name} {count}" for name, count in types))
+        self.show_metric()
+    
+    def on_metric_changed(self, metric: str):
+        self.show_metric()
+        if self.heatmap_check.isChecked():
+            self.heatmap_changed.emit()
+    
+    def show_metric(self):
+        """Fill the distribution chart and the top tables of the chosen metric"""
+        if self.metrics is None or not self.metrics.table_count:
+            self.distribution_view.set_bars([], [])
+            self.top_table.setRowCount(0)
+            return
+        
+        metric = self.metric_combo.currentText()
+        self.distribution_view.set_bars(*self.metrics.distribution(metric))
+        
+        top = self.metrics.top(metric, self.TOP_TABLES)
+        self.top_table.setRowCount(len(top))
+        for row, (name, value) in enumerate(top):
+            self.top_table.setItem(row, 0, QTableWidgetItem(name))
+            value_item = QTableWidgetItem(str(value))
+            value_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self.top_table.setItem(row, 1, value_item)
+    
+    def on_top_table_clicked(self, item):
+        name_item = self.top_table.item(item.row(), 0)
+        if name_item:
+            self.table_activated.emit(name_item.text())
+
+
+# =============================================================================
+# MINIMAP
+# =============================================================================
+
+Rect = Tuple[float, float, float, float]  # x, y, width, height in scene coordinates
+
+
+def _intersects(a: Rect, b: Rect) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def _contains(outer: Rect, inner: Rect) -> bool:
+    return (outer[0] <= inner[0] and outer[1] <= inner[1]
+            and inner[0] + inner[2] <= outer[0] + outer[2]
+            and inner[1] + inner[3] <= outer[1] + outer[3])
+
+
+class MinimapWidget(QWidget):
+    """Overview of the whole schema drawn from the model, not from scene items
+
+    Blocks are plain rectangles at Table.x/y (or at the subject area
+    position while collapsed) and relationships are single segments,
+    drawn once into a cached low-resolution pixmap. When blocks move,
+    only the pixmap regions around their old and new positions are
+    repainted; a uniform grid finds the blocks and lines to redraw
+    there. Lines spanning many cells are kept in a separate list and
+    tested by bounding box instead.
+    """
+    
+    GRID_CELLS = 64  # grid resolution along the longest side of the world
+    LONG_LINE_CELLS = 16  # lines covering more cells are not indexed
+    WORLD_MARGIN = 200
+    
+    BACKGROUND = QColor("#F5F5F5")
+    TABLE_COLOR = QColor("#2E86AB")
+    GROUP_COLOR = QColor("#7FB7CF")
+    LINE_COLOR = QColor("#9A9A9A")
+    VIEWPORT_COLOR = QColor("#A23B72")
+    
+    navigate = Signal(QPointF)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(160, 120)
+        self.setCursor(Qt.PointingHandCursor)
+        
+        self.schema: Optional[Schema] = None
+        self.nodes: Dict[str, Rect] = {}  # table or collapsed subject area -> rect
+        self.groups: Set[str] = set()
+        self.lines: List[Tuple[str, str]] = []
+        self.lines_by_node: Dict[str, List[int]] = {}
+        self.line_boxes: List[Rect] = []
+        self.node_cells: Dict[Tuple[int, int], Set[str]] = {}
+        self.line_cells: Dict[Tuple[int, int], Set[int]] = {}
+        self.long_lines: Set[int] = set()
+        
+        self.world: Rect = (0.0, 0.0, 1.0, 1.0)
+        self.cell_size = 1.0
+        self.scale = 1.0
+        self.offset = QPointF()
+        self.pixmap: Optional[QPixmap] = None
+        self.viewport_rect: Optional[QRectF] = None
+    
+    # ----- Model -----
+    
+    def set_schema(self, schema: Optional[Schema]):
+        """Rebuild the index and the cached pixmap from scratch"""
+        self.schema = schema
+        self.nodes.clear()
+        self.groups.clear()
+        self.lines.clear()
+        self.lines_by_node.clear()
+        if schema is not None:
+            collapsed = {}
+            for area in schema.subject_areas.values():
+                if area.collapsed:
+                    self.groups.add(area.name)
+                    for table_name in area.tables:
+                        collapsed[table_name] = area.name
+            for name in self.groups:
+                self.nodes[name] = self.node_rect(name)
+            for name in schema.tables:
+                if name not in collapsed:
+                    self.nodes[name] = self.node_rect(name)
+            
+            seen = set()
+            for rel in schema.relationships:
+                ends = (collapsed.get(rel.from_table, rel.from_table), collapsed.get(rel.to_table, rel.to_table))
+                if ends[0] == ends[1] or ends in seen or ends[0] not in self.nodes or ends[1] not in self.nodes:
+                    continue
+                seen.add(ends)
+                for name in ends:
+                    self.lines_by_node.setdefault(name, []).append(len(self.lines))
+                self.lines.append(ends)
+        self.rebuild()
+    
+    def node_rect(self, name: str) -> Rect:
+        if name in self.groups:
+            area = self.schema.subject_areas[name]
+            return (area.x, area.y, GroupNodeItem.BLOCK_WIDTH, GroupNodeItem.BLOCK_HEIGHT)
+        table = self.schema.tables[name]
+        return (table.x, table.y, TableBlockItem.BLOCK_WIDTH, TableBlockItem.BLOCK_HEIGHT)
+    
+    def line_box(self, index: int) -> Rect:
+        """Bounding box of a line, from the right middle of one block to the left middle of the other"""
+        from_rect, to_rect = self.nodes[self.lines[index][0]], self.nodes[self.lines[index][1]]
+        x1, y1 = from_rect[0] + from_rect[2], from_rect[1] + from_rect[3] / 2
+        x2, y2 = to_rect[0], to_rect[1] + to_rect[3] / 2
+        return (min(x1, x2), min(y1, y2), abs(x2 - x1), abs(y2 - y1))
+    
+    # ----- Spatial grid -----
+    
+    def cells(self, rect: Rect) -> Iterable[Tuple[int, int]]:
+        size = self.cell_size
+        x0, y0 = int((rect[0] - self.world[0]) // size), int((rect[1] - self.world[1]) // size)
+        x1 = int((rect[0] + rect[2] - self.world[0]) // size)
+        y1 = int((rect[1] + rect[3] - self.world[1]) // size)
+        return ((cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1))
+    
+    def index_node(self, name: str, add: bool):
+        for cell in self.cells(self.nodes[name]):
+            if add:
+                self.node_cells.setdefault(cell, set()).add(name)
+            else:
+                self.node_cells.get(cell, set()).discard(name)
+    
+    def index_line(self, index: int, add: bool):
+        box = self.line_boxes[index]
+        span = (box[2] // self.cell_size + 1) * (box[3] // self.cell_size + 1)
+        if span > self.LONG_LINE_CELLS:
+            if add:
+                self.long_lines.add(index)
+            else:
+                self.long_lines.discard(index)
+            return
+        for cell in self.cells(box):
+            if add:
+                self.line_cells.setdefault(cell, set()).add(index)
+            else:
+                self.line_cells.get(cell, set()).discard(index)
+    
+    def query(self, rect: Rect) -> Tuple[Set[str], Set[int]]:
+        """Blocks and lines whose bounding boxes intersect rect"""
+        names, lines = set(), set()
+        for cell in self.cells(rect):
+            names.update(self.node_cells.get(cell, ()))
+            lines.update(self.line_cells.get(cell, ()))
+        lines.update(self.long_lines)
+        return (
+            {n for n in names if _intersects(self.nodes[n], rect)},
+            {i for i in lines if _intersects(self.line_boxes[i], rect)}
+        )
+    
+    # ----- Cached pixmap -----
+    
+    def rebuild(self):
+        """Recompute the world bounds, the grid and the whole pixmap"""
+        if self.nodes:
+            left = min(r[0] for r in self.nodes.values()) - self.WORLD_MARGIN
+            top = min(r[1] for r in self.nodes.values()) - self.WORLD_MARGIN
+            right = max(r[0] + r[2] for r in self.nodes.values()) + self.WORLD_MARGIN
+            bottom = max(r[1] + r[3] for r in self.nodes.values()) + self.WORLD_MARGIN
+            self.world = (left, top, right - left, bottom - top)
+        else:
+            self.world = (0.0, 0.0, 1.0, 1.0)
+        self.cell_size = max(self.world[2], self.world[3]) / self.GRID_CELLS
+        
+        self.node_cells.clear()
+        self.line_cells.clear()
+        self.long_lines.clear()
+        for name in self.nodes:
+            self.index_node(name, True)
+        self.line_boxes = [self.line_box(i) for i in range(len(self.lines))]
+        for index in range(len(self.lines)):
+            self.index_line(index, True)
+        
+        self.scale = min(self.width() / self.world[2], self.height() / self.world[3])
+        self.offset = QPointF(
+            (self.width() - self.world[2] * self.scale) / 2,
+            (self.height() - self.world[3] * self.scale) / 2
+        )
+        width = max(1, round(self.world[2] * self.scale))
+        height = max(1, round(self.world[3] * self.scale))
+        self.pixmap = QPixmap(width, height)
+        self.repaint_region(self.world, set(self.nodes), set(range(len(self.lines))))
+        self.update()
+    
+    def nodes_moved(self, names: Iterable[str]):
+        """Move blocks to their model positions, repainting only what they cover"""
+        if self.schema is None or self.pixmap is None:
+            return
+        moves = {name: self.node_rect(name) for name in names if name in self.nodes}
+        moves = {name: rect for name, rect in moves.items() if rect != self.nodes[name]}
+        if not all(_contains(self.world, rect) for rect in moves.values()):
+            self.nodes.update(moves)
+            self.rebuild()  # the world grows, everything is rescaled
+            return
+        
+        dirty: List[Rect] = []
+        moved_lines = set()
+        for name, new_rect in moves.items():
+            dirty.append(self.nodes[name])
+            self.index_node(name, False)
+            self.nodes[name] = new_rect
+            self.index_node(name, True)
+            dirty.append(new_rect)
+            moved_lines.update(self.lines_by_node.get(name, ()))
+        
+        for index in moved_lines:
+            dirty.append(self.line_boxes[index])
+            self.index_line(index, False)
+            self.line_boxes[index] = self.line_box(index)
+            self.index_line(index, True)
+            dirty.append(self.line_boxes[index])
+        
+        for rect in dirty:
+            # Pad by a pixmap pixel so antialiased edges are cleaned up too
+            pad = 2 / self.scale
+            rect = (rect[0] - pad, rect[1] - pad, rect[2] + 2 * pad, rect[3] + 2 * pad)
+            self.repaint_region(rect, *self.query(rect))
+        if dirty:
+            self.update()
+    
+    def to_pixmap(self, rect: Rect) -> QRectF:
+        return QRectF((rect[0] - self.world[0]) * self.scale, (rect[1] - self.world[1]) * self.scale,
+                      rect[2] * self.scale, rect[3] * self.scale)
+    
+    def repaint_region(self, region: Rect, names: Set[str], lines: Set[int]):
+        """Redraw one rectangle of the cached pixmap"""
+        painter = QPainter(self.pixmap)
+        clip = self.to_pixmap(region)
+        painter.setClipRect(clip)
+        painter.fillRect(clip, self.BACKGROUND)
+        
+        painter.setPen(QPen(self.LINE_COLOR, 1))
+        for index in lines:
+            from_rect, to_rect = self.nodes[self.lines[index][0]], self.nodes[self.lines[index][1]]
+            painter.drawLine(
+                QPointF((from_rect[0] + from_rect[2] - self.world[0]) * self.scale,
+                        (from_rect[1] + from_rect[3] / 2 - self.world[1]) * self.scale),
+                QPointF((to_rect[0] - self.world[0]) * self.scale,
+                        (to_rect[1] + to_rect[3] / 2 - self.world[1]) * self.scale)
+            )
+        
+        for name in names:
+            color = self.GROUP_COLOR if name in self.groups else self.TABLE_COLOR
+            painter.fillRect(self.to_pixmap(self.nodes[name]), color)
+        painter.end()
+    
+    # ----- Viewport and navigation -----
+    
+    def set_viewport(self, rect: QRectF):
+        """Scene area currently visible in the main view"""
+        self.viewport_rect = rect
+        self.update()
+    
+    def to_scene(self, pos: QPointF) -> QPointF:
+        return QPointF((pos.x() - self.offset.x()) / self.scale + self.world[0],
+                       (pos.y() - self.offset.y()) / self.scale + self.world[1])
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#FFFFFF"))
+        if self.pixmap is None or not self.nodes:
+            painter.drawText(self.rect(), Qt.AlignCenter, "No tables")
+            return
+        painter.drawPixmap(self.offset, self.pixmap)
+        if self.viewport_rect is not None:
+            r = self.viewport_rect
+            painter.setPen(QPen(self.VIEWPORT_COLOR, 2))
+            painter.drawRect(QRectF(
+                self.offset.x() + (r.x() - self.world[0]) * self.scale,
+                self.offset.y() + (r.y() - self.world[1]) * self.scale,
+                r.width() * self.scale,
+                r.height() * self.scale
+            ))
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.schema is not None:
+            self.rebuild()
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self.nodes:
+            self.navigate.emit(self.to_scene(event.position()))
+    
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton and self.nodes:
+            self.navigate.emit(self.to_scene(event.position()))
+
+
+class MinimapDock(QDockWidget):
+    """Dock holding the minimap navigator"""
+    
+    def __init__(self, parent=None):
+        super().__init__("Minimap", parent)
+        self.setObjectName("MinimapDock")
+        self.minimap = MinimapWidget()
+        self.setWidget(self.minimap)
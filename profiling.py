@@ -0,0 +1,168 @@
+"""
+Database Schema Designer - Profiling
+University of Jijel - IHM Module
+
+This module contains the optional hot-path profiler. Controller slots
+decorated with @profiled() record their latency into per-name
+histograms and a bounded event log that can be exported as a Chrome
+trace (chrome://tracing, Perfetto). When the profiler is disabled the
+decorator costs a single attribute check per call.
+
+Set SCHEMA_DESIGNER_PROFILE=1 to enable it at startup.
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+
+HISTOGRAM_BUCKETS = 24  # log2 buckets from 1 us up to ~8 s
+MAX_TRACE_EVENTS = 100_000
+
+
+class LatencyHistogram:
+    """Latency histogram with power-of-two microsecond buckets"""
+    
+    def __init__(self):
+        self.buckets: List[int] = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+    
+    def record(self, seconds: float):
+        micros = int(seconds * 1_000_000)
+        index = min(micros.bit_length(), HISTOGRAM_BUCKETS - 1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+    
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+    
+    def percentile(self, fraction: float) -> float:
+        """Approximate percentile in seconds (upper edge of the matching bucket)"""
+        if not self.count:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= threshold:
+                return min((1 << index) / 1_000_000, self.max)
+        return self.max
+    
+    @staticmethod
+    def bucket_label(index: int) -> str:
+        upper = 1 << index
+        if upper < 1000:
+            return f"<{upper}us"
+        if upper < 1_000_000:
+            return f"<{upper / 1000:g}ms"
+        return f"<{upper / 1_000_000:g}s"
+
+
+class Profiler:
+    """Collects latency histograms and trace events for named code regions"""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        # (name, start_us, duration_us, thread_id)
+        self.events: Deque[Tuple[str, float, float, int]] = deque(maxlen=MAX_TRACE_EVENTS)
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+    
+    def record(self, name: str, start: float, duration: float):
+        """Record one call that started at perf_counter() time start"""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.record(duration)
+            self.events.append((
+                name,
+                (start - self._origin) * 1_000_000,
+                duration * 1_000_000,
+                threading.get_ident()
+            ))
+    
+    @contextmanager
+    def measure(self, name: str):
+        """Context manager timing the enclosed block (always records)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, time.perf_counter() - start)
+    
+    @contextmanager
+    def span(self, name: str):
+        """Context manager timing the enclosed block while enabled"""
+        if not self.enabled:
+            yield
+            return
+        with self.measure(name):
+            yield
+    
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.events.clear()
+            self._origin = time.perf_counter()
+    
+    def snapshot(self) -> Dict[str, LatencyHistogram]:
+        with self._lock:
+            return dict(self.histograms)
+    
+    def export_trace(self, file_path: str):
+        """Write recorded events in Chrome trace event format"""
+        with self._lock:
+            events = list(self.events)
+        pid = os.getpid()
+        trace = {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": "designer",
+                    "ph": "X",
+                    "ts": round(start, 3),
+                    "dur": round(duration, 3),
+                    "pid": pid,
+                    "tid": tid,
+                }
+                for name, start, duration, tid in events
+            ],
+            "displayTimeUnit": "ms",
+        }
+        with open(file_path, 'w') as f:
+            json.dump(trace, f)
+
+
+PROFILER = Profiler(enabled=os.environ.get("SCHEMA_DESIGNER_PROFILE") == "1")
+
+
+def profiled(name: Optional[str] = None) -> Callable:
+    """Decorator recording the latency of each call while PROFILER is enabled"""
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__qualname__
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(label, start, time.perf_counter() - start)
+        return wrapper
+    return decorator
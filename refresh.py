@@ -0,0 +1,101 @@
+"""
+Database Schema Designer - Refresh Scheduler
+University of Jijel - IHM Module
+
+Controller slots no longer update the view synchronously. They mark
+what became stale (SQL panel, tables list, issues, specific table
+blocks, lines attached to specific tables) and the scheduler flushes
+everything once when the event loop becomes idle, so several edits in
+one event cost one refresh.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Set
+
+from PySide6.QtCore import QObject, QTimer
+
+
+@dataclass
+class RefreshRequest:
+    """Set of stale view regions collected between two flushes"""
+    sql: bool = False
+    tables_list: bool = False
+    issues: bool = False
+    metrics: bool = False
+    scene: bool = False  # rebuild every block and line
+    blocks: Set[str] = field(default_factory=set)  # tables whose block must be rebuilt
+    lines: Set[str] = field(default_factory=set)  # tables/subject areas whose lines must be repositioned
+    
+    def is_empty(self) -> bool:
+        return not (self.sql or self.tables_list or self.issues or self.metrics
+                    or self.scene or self.blocks or self.lines)
+
+
+class RefreshScheduler(QObject):
+    """Coalesces view refreshes and flushes them on the next idle tick
+
+    The flush callback receives a RefreshRequest describing everything
+    marked since the previous flush.
+    """
+    
+    def __init__(self, flush_callback: Callable[[RefreshRequest], None], parent=None):
+        super().__init__(parent)
+        self.flush_callback = flush_callback
+        self.pending = RefreshRequest()
+        
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.flush)
+    
+    def mark_sql(self):
+        self.pending.sql = True
+        self._schedule()
+    
+    def mark_tables_list(self):
+        self.pending.tables_list = True
+        self._schedule()
+    
+    def mark_issues(self):
+        self.pending.issues = True
+        self._schedule()
+    
+    def mark_model(self):
+        """The model changed: SQL, validation issues and metrics are stale"""
+        self.mark_sql()
+        self.mark_issues()
+        self.mark_metrics()
+    
+    def mark_metrics(self):
+        self.pending.metrics = True
+        self._schedule()
+    
+    def mark_blocks(self, table_names: Iterable[str]):
+        self.pending.blocks.update(table_names)
+        self._schedule()
+    
+    def mark_lines(self, table_names: Iterable[str]):
+        self.pending.lines.update(table_names)
+        self._schedule()
+    
+    def mark_scene(self):
+        """Every block and line must be rebuilt, e.g. after collapsing a subject area"""
+        self.pending.scene = True
+        self._schedule()
+    
+    def mark_all(self):
+        """Everything is stale, e.g. after loading or clearing a schema"""
+        self.pending.scene = True
+        self.pending.tables_list = True
+        self.mark_model()
+    
+    def flush(self):
+        """Apply pending refreshes now (also called by the timer)"""
+        self.timer.stop()
+        request, self.pending = self.pending, RefreshRequest()
+        if not request.is_empty():
+            self.flush_callback(request)
+    
+    def _schedule(self):
+        if not self.timer.isActive():
+            self.timer.start()
@@ -0,0 +1,63 @@
+"""
+Database Schema Designer - Synthetic Schema Generator
+University of Jijel - IHM Module
+
+This module builds random but valid schemas of any size, used by the
+benchmark suite and for trying out the designer on large diagrams.
+"""
+
+import random
+from typing import Optional
+
+from models import Schema, Table, Attribute, Relationship, RelationshipType
+
+
+ATTRIBUTE_TYPES = [
+    "INT", "VARCHAR(255)", "TEXT", "FLOAT", "BOOLEAN",
+    "DATE", "DATETIME", "DECIMAL(10,2)", "BIGINT", "SMALLINT"
+]
+
+GRID_SPACING_X = 260
+GRID_SPACING_Y = 200
+
+
+def generate_schema(table_count: int, attributes_per_table: int = 6,
+                    relationship_density: float = 1.0,
+                    seed: Optional[int] = 0) -> Schema:
+    """Generate a synthetic schema
+
+    Every table gets an INT primary key plus attributes_per_table - 1
+    random columns. relationship_density is the average number of 1-N
+    relationships per table; each one adds an INT foreign key column to
+    the child table so the generated SQL contains real constraints.
+    Tables are laid out on a square grid.
+    """
+    rng = random.Random(seed)
+    schema = Schema(f"Synthetic_{table_count}")
+    columns = max(1, int(table_count ** 0.5))
+    
+    names = [f"table_{i:05d}" for i in range(table_count)]
+    for i, name in enumerate(names):
+        table = Table(name, (i % columns) * GRID_SPACING_X, (i // columns) * GRID_SPACING_Y)
+        table.add_attribute(Attribute("id", "INT", is_primary_key=True, is_nullable=False))
+        for j in range(1, attributes_per_table):
+            table.add_attribute(Attribute(f"col_{j}", rng.choice(ATTRIBUTE_TYPES),
+                                          is_nullable=rng.random() < 0.7))
+        schema.add_table(table)
+    
+    if table_count < 2:
+        return schema
+    
+    relationship_count = int(table_count * relationship_density)
+    for _ in range(relationship_count):
+        parent, child = rng.sample(names, 2)
+        fk_name = f"{parent}_id"
+        child_table = schema.tables[child]
+        if any(a.name == fk_name for a in child_table.attributes):
+            continue
+        child_table.add_attribute(Attribute(fk_name, "INT", is_nullable=rng.random() < 0.3))
+        schema.relationships.append(
+            Relationship(parent, child, RelationshipType.ONE_TO_MANY, "id", fk_name)
+        )
+    
+    return schema
@@ -0,0 +1,73 @@
+"""
+Database Schema Designer - Collaboration Tests
+University of Jijel - IHM Module
+"""
+
+import asyncio
+
+from models import Schema, Table, Attribute
+from collaboration import (
+    CollaborationServer, OperationError, apply_operation, decode, encode, move_op, subject_areas_op
+)
+
+
+def sample_schema() -> Schema:
+    schema = Schema()
+    for name in ("customers", "orders"):
+        schema.add_table(Table(name, attributes=[Attribute("id", "INTEGER", is_primary_key=True)]))
+    return schema
+
+
+def test_malformed_move_is_rejected():
+    schema = sample_schema()
+    for positions in ([1, 2], "orders", {"orders": 3}, {"orders": ["x", 0]}):
+        try:
+            apply_operation(schema, {"op": "move", "positions": positions})
+        except OperationError:
+            continue
+        raise AssertionError(f"accepted positions {positions!r}")
+    assert (schema.tables["orders"].x, schema.tables["orders"].y) == (100, 100)
+
+
+def test_server_answers_malformed_op_with_error_and_snapshot():
+    async def run():
+        server = CollaborationServer(sample_schema(), port=0)
+        await server.start()
+        serving = asyncio.create_task(server.serve_forever())
+        reader, writer = await asyncio.open_connection(server.host, server.port)
+        try:
+            assert decode(await reader.readline())["op"] == "snapshot"
+            
+            writer.write(encode({"op": "move", "positions": [1, 2], "id": 1}))
+            error = decode(await reader.readline())
+            assert error["op"] == "error" and error["id"] == 1
+            snapshot = decode(await reader.readline())
+            assert snapshot["op"] == "snapshot"
+            assert set(snapshot["schema"]["tables"]) == {"customers", "orders"}
+            
+            # The client stays connected and its next operation applies
+            writer.write(encode(dict(move_op({"orders": (5, 6)}), id=2)))
+            assert decode(await reader.readline()) == {"op": "ack", "id": 2}
+            assert (server.schema.tables["orders"].x, server.schema.tables["orders"].y) == (5, 6)
+        finally:
+            writer.close()
+            serving.cancel()
+    
+    asyncio.run(run())
+
+
+def test_subject_areas_drop_missing_tables():
+    source = sample_schema()
+    source.assign_to_subject_area("customers", "sales")
+    source.assign_to_subject_area("orders", "sales")
+    source.subject_areas["sales"].collapsed = True
+    message = subject_areas_op(source)
+    
+    target = sample_schema()
+    target.remove_table("orders")
+    change = apply_operation(target, message)
+    
+    assert change.areas
+    assert target.subject_areas["sales"].tables == ["customers"]
+    assert target.subject_areas["sales"].collapsed
+    assert target.subject_area_of("customers").name == "sales"
@@ -0,0 +1,341 @@
+"""
+Database Schema Designer - Schema Validation
+University of Jijel - IHM Module
+
+This module contains the rule-based schema validator. Rules inspect
+one table or one relationship at a time, which lets the validator
+re-check only what an edit touched instead of the whole schema.
+"""
+
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from models import Schema, Table, Relationship, RelationshipType
+
+
+class Severity(Enum):
+    """Enum for issue severities"""
+    ERROR = "error"
+    WARNING = "warning"
+
+
+@dataclass
+class Issue:
+    """A single problem reported by a validation rule"""
+    severity: Severity
+    rule: str
+    message: str
+    table: Optional[str] = None
+    
+    def __str__(self):
+        return f"[{self.severity.value.upper()}] {self.message}"
+
+
+SQL_RESERVED_WORDS = frozenset({
+    "ADD", "ALL", "ALTER", "AND", "ANY", "AS", "ASC", "BETWEEN", "BY",
+    "CASE", "CHECK", "COLUMN", "CONSTRAINT", "CREATE", "CROSS", "DATABASE",
+    "DEFAULT", "DELETE", "DESC", "DISTINCT", "DROP", "ELSE", "END", "EXISTS",
+    "FOREIGN", "FROM", "FULL", "GROUP", "HAVING", "IN", "INDEX", "INNER",
+    "INSERT", "INTO", "IS", "JOIN", "KEY", "LEFT", "LIKE", "LIMIT", "NOT",
+    "NULL", "ON", "OR", "ORDER", "OUTER", "PRIMARY", "REFERENCES", "RIGHT",
+    "SELECT", "SET", "TABLE", "THEN", "TO", "UNION", "UNIQUE", "UPDATE",
+    "USER", "VALUES", "VIEW", "WHEN", "WHERE", "WITH"
+})
+
+# Integer types can reference each other, but only with a warning
+INTEGER_TYPES = frozenset({"INT", "INTEGER", "BIGINT", "SMALLINT", "TINYINT"})
+
+_TYPE_PARAMS = re.compile(r"\s*\(.*\)\s*$")
+
+
+def base_type(data_type: str) -> str:
+    """Return the type name without its length/precision, e.g. VARCHAR(255) -> VARCHAR"""
+    return _TYPE_PARAMS.sub("", data_type).strip().upper()
+
+
+def describe_relationship(rel: Relationship) -> str:
+    """Short human-readable label for a relationship"""
+    from_side = f"{rel.from_table}.{rel.from_key}" if rel.from_key else rel.from_table
+    to_side = f"{rel.to_table}.{rel.to_key}" if rel.to_key else rel.to_table
+    return f"{from_side} ({rel.relationship_type.value}) -> {to_side}"
+
+
+# =============================================================================
+# RULES
+# =============================================================================
+
+class ValidationRule:
+    """Base class for validation rules
+
+    A rule overrides check_table, check_relationship or both. Each check
+    only looks at the item it is given (plus the tables a relationship
+    refers to), so results can be cached per item.
+    """
+    
+    name = "rule"
+    
+    def check_table(self, schema: Schema, table: Table) -> List[Issue]:
+        return []
+    
+    def check_relationship(self, schema: Schema, rel: Relationship) -> List[Issue]:
+        return []
+
+
+class MissingPrimaryKeyRule(ValidationRule):
+    """Every table with attributes should have a primary key"""
+    
+    name = "missing-primary-key"
+    
+    def check_table(self, schema: Schema, table: Table) -> List[Issue]:
+        if not table.attributes:
+            return [Issue(Severity.WARNING, self.name,
+                          f"Table '{table.name}' has no attributes", table.name)]
+        if not any(a.is_primary_key for a in table.attributes):
+            return [Issue(Severity.WARNING, self.name,
+                          f"Table '{table.name}' has no primary key", table.name)]
+        return []
+
+
+class DuplicateAttributeRule(ValidationRule):
+    """Attribute names must be unique within a table"""
+    
+    name = "duplicate-attribute"
+    
+    def check_table(self, schema: Schema, table: Table) -> List[Issue]:
+        seen = set()
+        issues = []
+        for attr in table.attributes:
+            key = attr.name.lower()
+            if key in seen:
+                issues.append(Issue(Severity.ERROR, self.name,
+                                    f"Table '{table.name}' has duplicate attribute '{attr.name}'",
+                                    table.name))
+            seen.add(key)
+        return issues
+
+
+class ReservedWordRule(ValidationRule):
+    """Table and attribute names should not be SQL reserved words"""
+    
+    name = "reserved-word"
+    
+    def check_table(self, schema: Schema, table: Table) -> List[Issue]:
+        issues = []
+        if table.name.upper() in SQL_RESERVED_WORDS:
+            issues.append(Issue(Severity.ERROR, self.name,
+                                f"Table name '{table.name}' is a reserved word", table.name))
+        for attr in table.attributes:
+            if attr.name.upper() in SQL_RESERVED_WORDS:
+                issues.append(Issue(Severity.ERROR, self.name,
+                                    f"Attribute '{table.name}.{attr.name}' is a reserved word",
+                                    table.name))
+        return issues
+
+
+class RelationshipEndpointsRule(ValidationRule):
+    """Relationships must join two existing, different tables"""
+    
+    name = "relationship-endpoints"
+    
+    def check_relationship(self, schema: Schema, rel: Relationship) -> List[Issue]:
+        label = describe_relationship(rel)
+        issues = []
+        for table_name in (rel.from_table, rel.to_table):
+            if table_name not in schema.tables:
+                issues.append(Issue(Severity.ERROR, self.name,
+                                    f"{label}: table '{table_name}' does not exist"))
+        if rel.from_table == rel.to_table:
+            issues.append(Issue(Severity.ERROR, self.name,
+                                f"{label}: self-referencing relationship", rel.from_table))
+        return issues
+
+
+class RelationshipKeysRule(ValidationRule):
+    """Relationship keys must exist and have compatible types"""
+    
+    name = "relationship-keys"
+    
+    def check_relationship(self, schema: Schema, rel: Relationship) -> List[Issue]:
+        from_table = schema.tables.get(rel.from_table)
+        to_table = schema.tables.get(rel.to_table)
+        if from_table is None or to_table is None:
+            return []  # reported by RelationshipEndpointsRule
+        
+        label = describe_relationship(rel)
+        if not rel.from_key or not rel.to_key:
+            if rel.relationship_type == RelationshipType.ONE_TO_MANY:
+                return [Issue(Severity.WARNING, self.name,
+                              f"{label}: no keys given, no foreign key will be generated",
+                              rel.to_table)]
+            return []
+        
+        issues = []
+        from_attr = next((a for a in from_table.attributes if a.name == rel.from_key), None)
+        to_attr = next((a for a in to_table.attributes if a.name == rel.to_key), None)
+        if from_attr is None:
+            issues.append(Issue(Severity.ERROR, self.name,
+                                f"{label}: column '{rel.from_key}' not found in '{rel.from_table}'",
+                                rel.from_table))
+        if to_attr is None:
+            issues.append(Issue(Severity.ERROR, self.name,
+                                f"{label}: column '{rel.to_key}' not found in '{rel.to_table}'",
+                                rel.to_table))
+        if from_attr is None or to_attr is None:
+            return issues
+        
+        from_type = base_type(from_attr.data_type)
+        to_type = base_type(to_attr.data_type)
+        if from_type != to_type:
+            if from_type in INTEGER_TYPES and to_type in INTEGER_TYPES:
+                issues.append(Issue(Severity.WARNING, self.name,
+                                    f"{label}: integer types differ ({from_attr.data_type} vs {to_attr.data_type})",
+                                    rel.to_table))
+            else:
+                issues.append(Issue(Severity.ERROR, self.name,
+                                    f"{label}: type mismatch ({from_attr.data_type} vs {to_attr.data_type})",
+                                    rel.to_table))
+        if not from_attr.is_primary_key:
+            issues.append(Issue(Severity.WARNING, self.name,
+                                f"{label}: '{rel.from_key}' is not a primary key of '{rel.from_table}'",
+                                rel.from_table))
+        return issues
+
+
+DEFAULT_RULES = (
+    MissingPrimaryKeyRule(),
+    DuplicateAttributeRule(),
+    ReservedWordRule(),
+    RelationshipEndpointsRule(),
+    RelationshipKeysRule(),
+)
+
+
+# =============================================================================
+# VALIDATOR
+# =============================================================================
+
+class SchemaValidator:
+    """Runs validation rules and caches their results per table and relationship
+
+    Call validate_all() after loading a schema, then table_changed(),
+    table_removed() and relationship_added() after each edit. Only the
+    edited item and the relationships attached to it are re-checked.
+    
+    Views call take_changes() to learn which items were re-checked since
+    their last update, so they can refresh only those entries.
+    """
+    
+    def __init__(self, schema: Schema, rules: Iterable[ValidationRule] = DEFAULT_RULES):
+        self.schema = schema
+        self.rules = list(rules)
+        self.table_issues: Dict[str, List[Issue]] = {}
+        # Relationships are mutable dataclasses, so they are keyed by id()
+        self.relationship_issues: Dict[int, List[Issue]] = {}
+        self._relationships: Dict[int, Relationship] = {}
+        self._relationships_by_table: Dict[str, Dict[int, Relationship]] = {}
+        
+        # Keys ("table", name) / ("relationship", id) re-checked or forgotten since take_changes()
+        self._changed: Set[Tuple[str, object]] = set()
+        self._reset = True
+    
+    def validate_all(self, schema: Optional[Schema] = None) -> List[Issue]:
+        """Re-check the whole schema from scratch"""
+        if schema is not None:
+            self.schema = schema
+        self.table_issues.clear()
+        self.relationship_issues.clear()
+        self._relationships.clear()
+        self._relationships_by_table.clear()
+        self._changed.clear()
+        self._reset = True
+        
+        for table in self.schema.tables.values():
+            self._check_table(table)
+        for rel in self.schema.relationships:
+            self._index_relationship(rel)
+            self._check_relationship(rel)
+        return self.issues()
+    
+    def table_changed(self, table_name: str):
+        """Re-check a table that was added or edited, and its relationships"""
+        table = self.schema.tables.get(table_name)
+        if table is None:
+            self.table_removed(table_name)
+            return
+        self._check_table(table)
+        for rel in list(self._relationships_by_table.get(table_name, {}).values()):
+            self._check_relationship(rel)
+    
+    def table_removed(self, table_name: str):
+        """Forget a removed table and the relationships that referenced it"""
+        self.table_issues.pop(table_name, None)
+        self._changed.add(("table", table_name))
+        for key, rel in list(self._relationships_by_table.pop(table_name, {}).items()):
+            self._forget_relationship(key, rel)
+    
+    def relationship_added(self, rel: Relationship):
+        """Check a newly added relationship"""
+        self._index_relationship(rel)
+        self._check_relationship(rel)
+    
+    def relationship_removed(self, rel: Relationship):
+        """Forget a removed relationship"""
+        self._forget_relationship(id(rel), rel)
+    
+    def issues(self) -> List[Issue]:
+        """Return all current issues, errors first"""
+        result = [i for issues in self.table_issues.values() for i in issues]
+        result.extend(i for issues in self.relationship_issues.values() for i in issues)
+        result.sort(key=lambda i: i.severity != Severity.ERROR)
+        return result
+    
+    def issues_of(self, key: Tuple[str, object]) -> List[Issue]:
+        """Current issues of one ("table", name) or ("relationship", id) key"""
+        kind, item = key
+        if kind == "table":
+            return self.table_issues.get(item, [])
+        return self.relationship_issues.get(item, [])
+    
+    def keys(self) -> List[Tuple[str, object]]:
+        """Keys of every checked table and relationship"""
+        return ([("table", name) for name in self.table_issues]
+                + [("relationship", key) for key in self.relationship_issues])
+    
+    def take_changes(self) -> Optional[Set[Tuple[str, object]]]:
+        """Keys changed since the last call, or None after validate_all()"""
+        changes = None if self._reset else self._changed
+        self._changed = set()
+        self._reset = False
+        return changes
+    
+    def has_errors(self) -> bool:
+        return any(i.severity == Severity.ERROR for i in self.issues())
+    
+    def _check_table(self, table: Table):
+        issues = []
+        for rule in self.rules:
+            issues.extend(rule.check_table(self.schema, table))
+        self.table_issues[table.name] = issues
+        self._changed.add(("table", table.name))
+    
+    def _check_relationship(self, rel: Relationship):
+        issues = []
+        for rule in self.rules:
+            issues.extend(rule.check_relationship(self.schema, rel))
+        self.relationship_issues[id(rel)] = issues
+        self._changed.add(("relationship", id(rel)))
+    
+    def _index_relationship(self, rel: Relationship):
+        key = id(rel)
+        self._relationships[key] = rel
+        self._relationships_by_table.setdefault(rel.from_table, {})[key] = rel
+        self._relationships_by_table.setdefault(rel.to_table, {})[key] = rel
+    
+    def _forget_relationship(self, key: int, rel: Relationship):
+        self._relationships.pop(key, None)
+        self.relationship_issues.pop(key, None)
+        self._changed.add(("relationship", key))
+        for table_name in (rel.from_table, rel.to_table):
+            self._relationships_by_table.get(table_name, {}).pop(key, None)
@@ -0,0 +1,360 @@
+"""
+Database Schema Designer - Workload Simulator
+University of Jijel - IHM Module
+
+This module "test drives" a schema: it creates the generated DDL in a
+SQLite database, fills every table with synthetic rows that respect
+primary keys, foreign keys and nullability, then times join queries
+along each relationship so slow joins show up while designing instead
+of after deployment.
+"""
+
+import random
+import sqlite3
+import statistics
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+from models import Schema, Table, Attribute, Relationship, RelationshipType
+from sql_generator import SQLGenerator
+from validation import INTEGER_TYPES, base_type, describe_relationship
+
+
+DEFAULT_ROWS_PER_TABLE = 1000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_SLOW_THRESHOLD_MS = 5.0
+
+NULL_FRACTION = 0.1  # share of NULLs written to nullable columns
+LOOKUP_SAMPLES = 20  # keyed lookups timed per relationship
+
+_EPOCH = date(2020, 1, 1)
+
+
+@dataclass
+class RelationshipTiming:
+    """Join timings measured for one relationship"""
+    relationship: Relationship
+    join_ms: float = 0.0  # full join, median of the repeats
+    lookup_ms: float = 0.0  # parent -> children lookup, mean per key
+    rows: int = 0  # rows produced by the full join
+    full_scan: bool = False  # SQLite scans the child table for the lookup
+    error: Optional[str] = None
+    
+    @property
+    def label(self) -> str:
+        return describe_relationship(self.relationship)
+    
+    def is_slow(self, threshold_ms: float = DEFAULT_SLOW_THRESHOLD_MS) -> bool:
+        return self.error is None and (self.join_ms >= threshold_ms or self.lookup_ms >= threshold_ms)
+    
+    def summary(self) -> str:
+        if self.error:
+            return f"{self.label}: {self.error}"
+        text = (f"{self.label}: join {self.join_ms:.2f} ms ({self.rows} rows), "
+                f"lookup {self.lookup_ms:.3f} ms")
+        if self.full_scan:
+            text += f" - full scan of {self.relationship.to_table}, index {self.relationship.to_key}"
+        return text
+
+
+@dataclass
+class WorkloadReport:
+    """Result of one test drive"""
+    row_counts: Dict[str, int] = field(default_factory=dict)
+    create_seconds: float = 0.0
+    load_seconds: float = 0.0
+    timings: List[RelationshipTiming] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)  # DDL or insert failures
+    skipped: List[str] = field(default_factory=list)  # statements SQLite cannot run
+    _by_relationship: Dict[int, RelationshipTiming] = field(default_factory=dict, repr=False)
+    
+    def timing_for(self, rel: Relationship) -> Optional[RelationshipTiming]:
+        """Timing measured for this very relationship object, if any"""
+        if len(self._by_relationship) != len(self.timings):
+            self._by_relationship = {id(t.relationship): t for t in self.timings}
+        return self._by_relationship.get(id(rel))
+    
+    def slow_relationships(self, threshold_ms: float = DEFAULT_SLOW_THRESHOLD_MS) -> List[RelationshipTiming]:
+        slow = [t for t in self.timings if t.is_slow(threshold_ms)]
+        return sorted(slow, key=lambda t: max(t.join_ms, t.lookup_ms), reverse=True)
+
+
+def quote(identifier: str) -> str:
+    """Quote an identifier for SQLite"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+# =============================================================================
+# DATA GENERATION
+# =============================================================================
+
+def value_factory(attr: Attribute, rng: random.Random) -> Callable[[int], object]:
+    """Return a function producing the value of attr for row number i
+
+    Primary key values are derived from the row number, so they are
+    unique; other values are random.
+    """
+    kind = base_type(attr.data_type)
+    if kind in INTEGER_TYPES:
+        if attr.is_primary_key:
+            return lambda i: i + 1
+        return lambda i: rng.randint(0, 1_000_000)
+    if kind in ("FLOAT", "REAL", "DOUBLE", "DECIMAL", "NUMERIC"):
+        if attr.is_primary_key:
+            return lambda i: float(i + 1)
+        return lambda i: round(rng.uniform(0, 10_000), 2)
+    if kind in ("BOOLEAN", "BOOL"):
+        return lambda i: i % 2 if attr.is_primary_key else rng.randint(0, 1)
+    if kind == "DATE":
+        if attr.is_primary_key:
+            return lambda i: (_EPOCH + timedelta(days=i)).isoformat()
+        return lambda i: (_EPOCH + timedelta(days=rng.randint(0, 3650))).isoformat()
+    if kind in ("DATETIME", "TIMESTAMP"):
+        start = datetime(_EPOCH.year, _EPOCH.month, _EPOCH.day)
+        if attr.is_primary_key:
+            return lambda i: (start + timedelta(seconds=i)).isoformat(sep=" ")
+        return lambda i: (start + timedelta(seconds=rng.randint(0, 315_360_000))).isoformat(sep=" ")
+    if attr.is_primary_key:
+        return lambda i: f"{attr.name}_{i + 1}"
+    return lambda i: f"{attr.name}_{rng.randint(0, 1_000_000)}"
+
+
+def insertion_order(schema: Schema) -> List[str]:
+    """Order tables so that every 1-N parent is filled before its children
+
+    Tables caught in a reference cycle are appended in schema order; their
+    foreign keys then point at whatever parent rows exist already.
+    """
+    parents: Dict[str, set] = {name: set() for name in schema.tables}
+    for rel in schema.relationships:
+        if (rel.relationship_type == RelationshipType.ONE_TO_MANY and rel.from_key and rel.to_key
+                and rel.from_table in parents and rel.to_table in parents
+                and rel.from_table != rel.to_table):
+            parents[rel.to_table].add(rel.from_table)
+    
+    order = []
+    placed = set()
+    remaining = list(schema.tables)
+    while remaining:
+        ready = [name for name in remaining if parents[name] <= placed]
+        if not ready:
+            ready = remaining[:1]  # break a cycle
+        for name in ready:
+            order.append(name)
+            placed.add(name)
+        remaining = [name for name in remaining if name not in placed]
+    return order
+
+
+def generate_rows(table: Table, count: int, references: Dict[str, List], unique_columns: set,
+                  rng: random.Random) -> Iterator[tuple]:
+    """Yield count rows for table
+
+    references maps a column to the parent key values it must take;
+    columns in unique_columns (one-to-one keys) never repeat a parent value.
+    """
+    factories = [value_factory(attr, rng) for attr in table.attributes]
+    pools = {}
+    for column, values in references.items():
+        if column in unique_columns:
+            pool = list(values)
+            rng.shuffle(pool)
+            pools[column] = pool
+    
+    for i in range(count):
+        row = []
+        for attr, factory in zip(table.attributes, factories):
+            parent_values = references.get(attr.name)
+            if attr.is_nullable and not attr.is_primary_key and rng.random() < NULL_FRACTION:
+                row.append(None)
+            elif parent_values is not None and not attr.is_primary_key:
+                pool = pools.get(attr.name)
+                if pool is not None and (i < len(pool) or attr.is_nullable):
+                    row.append(pool[i] if i < len(pool) else None)
+                elif parent_values:
+                    row.append(rng.choice(parent_values))
+                else:
+                    row.append(None if attr.is_nullable else factory(i))
+            else:
+                row.append(factory(i))
+        yield tuple(row)
+
+
+def batched(rows: Iterator[tuple], size: int) -> Iterator[List[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# =============================================================================
+# WORKLOAD
+# =============================================================================
+
+class WorkloadSimulator:
+    """Creates, fills and queries a SQLite copy of a schema"""
+    
+    def __init__(self, schema: Schema, database: str = ":memory:",
+                 rows_per_table: int = DEFAULT_ROWS_PER_TABLE,
+                 batch_size: int = DEFAULT_BATCH_SIZE, repeat: int = 3,
+                 seed: Optional[int] = 0):
+        self.schema = schema
+        self.database = database
+        self.rows_per_table = rows_per_table
+        self.batch_size = batch_size
+        self.repeat = max(1, repeat)
+        self.rng = random.Random(seed)
+        self.report = WorkloadReport()
+        self.connection: Optional[sqlite3.Connection] = None
+    
+    def run(self) -> WorkloadReport:
+        """Create the schema, load the data and time every relationship"""
+        self.connection = sqlite3.connect(self.database)
+        try:
+            self.create_tables()
+            self.load_data()
+            for rel in self.schema.relationships:
+                self.report.timings.append(self.time_relationship(rel))
+        finally:
+            self.connection.close()
+            self.connection = None
+        return self.report
+    
+    def create_tables(self):
+        """Run the generated DDL
+
+        SQLite has no ALTER TABLE ... ADD CONSTRAINT, so foreign key
+        statements are skipped; the data generator enforces them instead.
+        """
+        started = time.perf_counter()
+        cursor = self.connection.cursor()
+        for name in self.schema.tables:
+            cursor.execute(f"DROP TABLE IF EXISTS {quote(name)}")
+        
+        for statement in SQLGenerator.generate_sql(self.schema).split("\n\n"):
+            statement = statement.strip()
+            if not statement or statement.startswith("--"):
+                continue
+            if statement.upper().startswith("ALTER TABLE"):
+                self.report.skipped.append(statement)
+                continue
+            try:
+                cursor.execute(statement)
+            except sqlite3.Error as e:
+                self.report.errors.append(f"{statement.splitlines()[0]} failed: {e}")
+        self.connection.commit()
+        self.report.create_seconds = time.perf_counter() - started
+    
+    def existing_tables(self) -> set:
+        rows = self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        return {row[0] for row in rows}
+    
+    def load_data(self):
+        """Insert rows_per_table rows in every table, parents first"""
+        started = time.perf_counter()
+        existing = self.existing_tables()
+        key_values: Dict[tuple, List] = {}
+        
+        needed_keys = {(rel.from_table, rel.from_key) for rel in self.schema.relationships
+                       if rel.from_key and rel.to_key}
+        
+        # Primary key values only depend on the row number, so they are
+        # known up front and children in a reference cycle can use them
+        for table_name, column in needed_keys:
+            table = self.schema.tables.get(table_name)
+            attr = next((a for a in table.attributes if a.name == column), None) if table else None
+            if attr is not None and attr.is_primary_key:
+                factory = value_factory(attr, self.rng)
+                key_values[(table_name, column)] = [factory(i) for i in range(self.rows_per_table)]
+        
+        for table_name in insertion_order(self.schema):
+            table = self.schema.tables[table_name]
+            if table_name not in existing:
+                continue
+            
+            references: Dict[str, List] = {}
+            unique_columns = set()
+            for rel in self.schema.relationships:
+                if rel.to_table != table_name or not rel.from_key or not rel.to_key:
+                    continue
+                references[rel.to_key] = key_values.get((rel.from_table, rel.from_key), [])
+                if rel.relationship_type == RelationshipType.ONE_TO_ONE:
+                    unique_columns.add(rel.to_key)
+            
+            columns = [attr.name for attr in table.attributes]
+            statement = (f"INSERT INTO {quote(table_name)} ({', '.join(quote(c) for c in columns)}) "
+                         f"VALUES ({', '.join('?' for _ in columns)})")
+            kept = {column: columns.index(column) for column in columns
+                    if (table_name, column) in needed_keys}
+            collected = {column: [] for column in kept}
+            
+            rows = generate_rows(table, self.rows_per_table, references, unique_columns, self.rng)
+            inserted = 0
+            try:
+                for batch in batched(rows, self.batch_size):
+                    self.connection.executemany(statement, batch)
+                    inserted += len(batch)
+                    for column, index in kept.items():
+                        collected[column].extend(row[index] for row in batch if row[index] is not None)
+                self.connection.commit()
+            except sqlite3.Error as e:
+                self.connection.rollback()
+                self.report.errors.append(f"Loading {table_name} failed: {e}")
+                inserted = 0
+                collected = {column: [] for column in kept}
+            
+            self.report.row_counts[table_name] = inserted
+            for column, values in collected.items():
+                key_values[(table_name, column)] = values
+        
+        self.connection.execute("ANALYZE")
+        self.report.load_seconds = time.perf_counter() - started
+    
+    def time_relationship(self, rel: Relationship) -> RelationshipTiming:
+        """Time a full join and keyed parent -> child lookups along rel"""
+        timing = RelationshipTiming(rel)
+        if not rel.from_key or not rel.to_key:
+            timing.error = "no join keys"
+            return timing
+        
+        parent, child = quote(rel.from_table), quote(rel.to_table)
+        condition = f"c.{quote(rel.to_key)} = p.{quote(rel.from_key)}"
+        join_sql = f"SELECT COUNT(*) FROM {parent} p JOIN {child} c ON {condition}"
+        lookup_sql = f"SELECT c.* FROM {parent} p JOIN {child} c ON {condition} WHERE p.{quote(rel.from_key)} = ?"
+        
+        try:
+            durations = []
+            for _ in range(self.repeat):
+                started = time.perf_counter()
+                timing.rows = self.connection.execute(join_sql).fetchone()[0]
+                durations.append(time.perf_counter() - started)
+            timing.join_ms = statistics.median(durations) * 1000
+            
+            keys = [row[0] for row in self.connection.execute(
+                f"SELECT {quote(rel.from_key)} FROM {parent} ORDER BY RANDOM() LIMIT {LOOKUP_SAMPLES}"
+            )]
+            if keys:
+                started = time.perf_counter()
+                for key in keys:
+                    self.connection.execute(lookup_sql, (key,)).fetchall()
+                timing.lookup_ms = (time.perf_counter() - started) * 1000 / len(keys)
+            
+            plan = self.connection.execute(f"EXPLAIN QUERY PLAN {lookup_sql}", (None,)).fetchall()
+            timing.full_scan = any(
+                words[:1] == ["SCAN"] and ("c" in words or rel.to_table in words)
+                for words in (row[-1].split() for row in plan)
+            )
+        except sqlite3.Error as e:
+            timing.error = str(e)
+        return timing
+
+
+def run_workload(schema: Schema, **options) -> WorkloadReport:
+    """Test drive schema; options are passed to WorkloadSimulator"""
+    return WorkloadSimulator(schema, **options).run()
@@ -0,0 +1,151 @@
+"""
+Database Schema Designer - Workspace
+University of Jijel - IHM Module
+
+This module manages several open schemas in one process. Each document
+always keeps its model in memory; its graphics scene only exists while
+it is "materialised". Inactive documents lose their scene, least
+recently used first, when the estimated size of all scenes exceeds the
+memory budget, and are rebuilt from the model when activated again.
+"""
+
+import os
+from typing import Dict, List, Optional
+
+from models import Schema
+from validation import SchemaValidator
+from sql_generator import SQLFragments
+from fragment_cache import shared_cache
+
+
+# Rough per-item costs of the graphics scene (C++ item, text layout, Python wrapper)
+TABLE_ITEM_BYTES = 6 * 1024
+ATTRIBUTE_ITEM_BYTES = 1536
+RELATIONSHIP_ITEM_BYTES = 1024
+
+DEFAULT_MEMORY_BUDGET_MB = int(os.environ.get("SCHEMA_DESIGNER_SCENE_BUDGET_MB", "256"))
+
+
+class SchemaDocument:
+    """One open schema with its (optional) scene and view items"""
+    
+    def __init__(self, schema: Optional[Schema] = None, file_path: Optional[str] = None):
+        self.schema = schema if schema is not None else Schema()
+        self.file_path = file_path
+        self.validator = SchemaValidator(self.schema)
+        self.validator.validate_all()
+        
+        # Generated SQL per table, invalidated by the refreshes of edited tables
+        # and looked up in the persistent cache shared with other sessions
+        self.sql_fragments = SQLFragments(shared_cache())
+        
+        # View state, only present while materialised
+        self.scene = None
+        self.table_items: Dict = {}
+        self.relationship_items: List = []
+        self.group_items: Dict = {}
+        self.bundle_items: List = []
+        
+        # Schema metrics and the heatmap value (0..1) of each table
+        self.metrics = None
+        self.heat: Dict[str, float] = {}
+        
+        # Last workload test drive, used to highlight slow relationships
+        self.workload_report = None
+        self.workload_threshold_ms = 0.0
+        
+        # Set when the model changed (e.g. by a collaborator) while inactive
+        self.stale = False
+        self.last_used = 0
+    
+    @property
+    def title(self) -> str:
+        if self.file_path:
+            return os.path.basename(self.file_path)
+        return self.schema.name
+    
+    @property
+    def is_materialized(self) -> bool:
+        return self.scene is not None
+    
+    def is_empty(self) -> bool:
+        """True for an untouched, unsaved document"""
+        return not self.file_path and not self.schema.tables
+    
+    def estimated_scene_bytes(self) -> int:
+        """Estimate the memory held by this document's scene items
+
+        Tables inside collapsed subject areas have no items of their own.
+        """
+        if not self.is_materialized:
+            return 0
+        collapsed = {t for a in self.schema.subject_areas.values() if a.collapsed for t in a.tables}
+        tables = [t for name, t in self.schema.tables.items() if name not in collapsed]
+        attributes = sum(len(t.attributes) for t in tables)
+        return (len(tables) * TABLE_ITEM_BYTES
+                + attributes * ATTRIBUTE_ITEM_BYTES
+                + len(self.schema.relationships) * RELATIONSHIP_ITEM_BYTES)
+    
+    def release_scene(self):
+        """Drop every graphics item, keeping only the model"""
+        if self.scene is None:
+            return
+        self.scene.clear()
+        self.scene.deleteLater()
+        self.scene = None
+        self.table_items.clear()
+        self.relationship_items.clear()
+        self.group_items.clear()
+        self.bundle_items.clear()
+
+
+class Workspace:
+    """Open documents with LRU eviction of inactive scenes"""
+    
+    def __init__(self, memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB):
+        self.documents: List[SchemaDocument] = []
+        self.active: Optional[SchemaDocument] = None
+        self.memory_budget_mb = memory_budget_mb
+        self._clock = 0
+    
+    @property
+    def memory_budget_bytes(self) -> int:
+        return self.memory_budget_mb * 1024 * 1024
+    
+    def add(self, document: SchemaDocument) -> SchemaDocument:
+        self.documents.append(document)
+        return document
+    
+    def remove(self, document: SchemaDocument):
+        document.release_scene()
+        self.documents.remove(document)
+        if self.active is document:
+            self.active = None
+    
+    def activate(self, document: SchemaDocument):
+        """Make a document active and most recently used
+
+        The caller materialises it, then calls enforce_budget().
+        """
+        self._clock += 1
+        document.last_used = self._clock
+        self.active = document
+    
+    def scene_bytes(self) -> int:
+        return sum(d.estimated_scene_bytes() for d in self.documents)
+    
+    def enforce_budget(self) -> List[SchemaDocument]:
+        """Release least recently used inactive scenes until under budget"""
+        evicted = []
+        candidates = sorted(
+            (d for d in self.documents if d.is_materialized and d is not self.active),
+            key=lambda d: d.last_used
+        )
+        total = self.scene_bytes()
+        for document in candidates:
+            if total <= self.memory_budget_bytes:
+                break
+            total -= document.estimated_scene_bytes()
+            document.release_scene()
+            evicted.append(document)
+        return evicted